@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+End-to-end scaling harness: fixture size vs. userscript time-to-ready
+
+Generates mock data over a grid of goal counts and horizons, serves each
+fixture with the demo server and drives /dashboard/ in headless Chromium:
+
+    ready     navigation start until the page's gpv:e2e-ready signal
+    summary   clicking the Portfolio Viewer button until the summary renders
+    buckets   selecting each bucket until its view renders (render) and its
+              /v1/performance requests have finished (settled)
+
+Results are written as JSON so runs can be compared between releases:
+
+    python3 demo/benchmark-e2e-scaling.py --output before.json
+    python3 demo/benchmark-e2e-scaling.py --compare before.json
+
+Cells that time out or fail are recorded with their error instead of
+stopping the run, so the table shows where the userscript breaks.
+
+Requires Playwright for Python (pip install playwright && playwright install chromium).
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+
+try:
+    from playwright.sync_api import Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError, sync_playwright
+except ImportError:  # Checked in main() so --help works without it
+    sync_playwright = None
+
+from mock_tools import DEMO_DIR, git_revision, grid_buckets, load_generator, parse_int_list
+
+SERVERS = {
+    'python': os.path.join(DEMO_DIR, 'mock-api-server.py'),
+    'node': os.path.join(DEMO_DIR, 'mock-server.js')
+}
+# mock-server.js always listens on its default port
+NODE_SERVER_PORT = 8765
+
+DEFAULT_GOALS = [10, 100, 1000]
+DEFAULT_YEARS = [1, 5]
+AS_OF = datetime(2026, 1, 1)
+SERVER_START_TIMEOUT = 60
+# Timings faster than this are too noisy to flag as regressions
+MIN_COMPARE_MS = 50
+# Timings compared by --compare
+COMPARE_FIELDS = ['readyMs', 'summaryMs', 'bucketMaxMs']
+
+# Runs before any page script: records when the ready signal fires and counts
+# in-flight /v1/performance fetches (the dashboard rewrites Endowus URLs to
+# local ones and then calls this wrapper)
+INIT_SCRIPT = """
+(() => {
+    const metrics = { readyAt: null, inflight: 0, requests: 0 };
+    window.__GPV_SCALING__ = metrics;
+    window.addEventListener('gpv:e2e-ready', () => {
+        metrics.readyAt = performance.now();
+    });
+    const originalFetch = window.fetch.bind(window);
+    window.fetch = function(resource, options) {
+        const url = typeof resource === 'string' ? resource : resource?.url;
+        if (!url || !url.includes('/v1/performance')) {
+            return originalFetch(resource, options);
+        }
+        metrics.inflight += 1;
+        metrics.requests += 1;
+        return originalFetch(resource, options).finally(() => {
+            metrics.inflight -= 1;
+        });
+    };
+})();
+"""
+
+def write_fixture(generator, goals, days, engine, seed, output_file):
+    """
+    Generate a grid cell's mock data into output_file (compact JSON)
+
+    Returns:
+        Seconds spent generating and writing
+    """
+    started = time.perf_counter()
+    mock_data = generator.generate_mock_data(engine=engine, seed=seed, as_of=AS_OF, buckets=grid_buckets(generator, goals, days))
+    generator.write_mock_data(mock_data, output_file, indent=None)
+    return time.perf_counter() - started
+
+def free_port():
+    """An unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(server, data_path):
+    """
+    Start the demo server on a fixture and wait until it answers
+
+    Returns:
+        Tuple of (process, base URL)
+
+    Raises:
+        RuntimeError: The server exited or did not answer in time
+    """
+    if server == 'node':
+        port = NODE_SERVER_PORT
+        command = ['node', SERVERS['node']]
+    else:
+        port = free_port()
+        command = [sys.executable, SERVERS['python'], '--data', data_path, '--port', str(port)]
+    env = dict(os.environ, GPV_MOCK_DATA=data_path)
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    base_url = f'http://localhost:{port}'
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{server} server exited with status {process.returncode}: {process.stderr.read().strip()}')
+        try:
+            with urllib.request.urlopen(f'{base_url}/v1/goals', timeout=1):
+                return process, base_url
+        except OSError:
+            time.sleep(0.1)
+    stop_server(process)
+    raise RuntimeError(f'{server} server did not answer within {SERVER_START_TIMEOUT}s')
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def measure_dashboard(browser, base_url, timeout_ms):
+    """
+    Time the dashboard flow on a running server
+
+    Returns:
+        Dict with readyMs, summaryMs, per-bucket timings, performance request
+        count and JS heap size
+    """
+    context = browser.new_context(viewport={'width': 1280, 'height': 800})
+    context.set_default_timeout(timeout_ms)
+    context.add_init_script(INIT_SCRIPT)
+    page = context.new_page()
+    try:
+        page.goto(f'{base_url}/dashboard/')
+        page.wait_for_function('() => window.__GPV_E2E_READY__ === true')
+        ready_ms = page.evaluate('() => window.__GPV_SCALING__.readyAt')
+
+        started = time.perf_counter()
+        page.click('.gpv-trigger-btn')
+        page.wait_for_selector('.gpv-overlay .gpv-content > *')
+        summary_ms = (time.perf_counter() - started) * 1000
+
+        bucket_names = page.eval_on_selector_all(
+            'select.gpv-select option', 'options => options.map(option => option.value).filter(value => value !== "SUMMARY")'
+        )
+        buckets = []
+        for bucket_name in bucket_names:
+            started = time.perf_counter()
+            page.select_option('select.gpv-select', bucket_name)
+            page.wait_for_function(
+                'name => document.querySelector(".gpv-detail-title")?.textContent.includes(name)', arg=bucket_name
+            )
+            render_ms = (time.perf_counter() - started) * 1000
+            page.wait_for_function('() => window.__GPV_SCALING__.inflight === 0')
+            buckets.append({'bucket': bucket_name, 'renderMs': render_ms, 'settledMs': (time.perf_counter() - started) * 1000})
+
+        heap_bytes = page.evaluate('() => performance.memory ? performance.memory.usedJSHeapSize : null')
+        requests = page.evaluate('() => window.__GPV_SCALING__.requests')
+    finally:
+        context.close()
+
+    settled = [bucket['settledMs'] for bucket in buckets]
+    return {
+        'readyMs': round(ready_ms, 1) if ready_ms is not None else None,
+        'summaryMs': round(summary_ms, 1),
+        'bucketCount': len(buckets),
+        'bucketMedianMs': round(statistics.median(settled), 1) if settled else None,
+        'bucketMaxMs': round(max(settled), 1) if settled else None,
+        'performanceRequests': requests,
+        'heapBytes': heap_bytes,
+        'buckets': [{key: round(value, 1) if key != 'bucket' else value for key, value in bucket.items()} for bucket in buckets]
+    }
+
+def run_cell(generator, browser, goals, days, args, fixture_dir):
+    """
+    Generate, serve and measure one grid cell
+
+    Returns:
+        Result dict; status is 'ok', 'timeout' or 'error' (with an error message)
+    """
+    fixture = os.path.join(fixture_dir, f'mock-data-{goals}x{days}.json')
+    generate_seconds = write_fixture(generator, goals, days, args.engine, args.seed, fixture)
+    result = {
+        'goals': goals,
+        'days': days,
+        'server': args.server,
+        'points': goals * days,
+        'fixtureBytes': os.path.getsize(fixture),
+        'generateSeconds': round(generate_seconds, 3),
+        'status': 'ok'
+    }
+    try:
+        process, base_url = start_server(args.server, fixture)
+    except RuntimeError as e:
+        return dict(result, status='error', error=str(e))
+    try:
+        result.update(measure_dashboard(browser, base_url, args.timeout * 1000))
+    except PlaywrightTimeoutError as e:
+        result.update(status='timeout', error=str(e).splitlines()[0])
+    except PlaywrightError as e:
+        result.update(status='error', error=str(e).splitlines()[0])
+    finally:
+        stop_server(process)
+        if not args.keep_fixtures:
+            os.remove(fixture)
+    return result
+
+def format_ms(value):
+    return f'{value:,.0f}' if value is not None else '-'
+
+def format_row(result):
+    """One table row for a cell result"""
+    heap = result.get('heapBytes')
+    heap_display = f"{heap / 1024 / 1024:,.1f}" if heap is not None else '-'
+    return (f"{result['goals']:>7,} {result['days']:>6,} {result['fixtureBytes'] / 1024 / 1024:>10,.2f} "
+            f"{format_ms(result.get('readyMs')):>9} {format_ms(result.get('summaryMs')):>10} "
+            f"{format_ms(result.get('bucketMedianMs')):>11} {format_ms(result.get('bucketMaxMs')):>10} "
+            f"{heap_display:>8}  {result['status']}")
+
+def result_key(result):
+    """Identity of a result across runs"""
+    return (result['goals'], result['days'], result['server'])
+
+def compare_results(baseline, results, threshold, results_engine=None):
+    """
+    Print per-cell deltas against a baseline run
+
+    Returns:
+        List of (key, field) pairs that regressed by more than threshold
+        (fraction), including cells that passed before and fail now
+    """
+    previous = {result_key(result): result for result in baseline['results']}
+    regressions = []
+    print(f"\nComparison with {baseline['meta'].get('revision') or 'baseline'} (threshold {threshold:.0%}):")
+    if baseline['meta'].get('engine') not in (None, results_engine):
+        print(f"Note: the baseline fixtures were generated with the {baseline['meta']['engine']} engine")
+    print(f"{'goals':>7} {'days':>6} {'timing':<12} {'before ms':>10} {'after ms':>10} {'delta':>8}")
+    for result in results:
+        before = previous.get(result_key(result))
+        if not before:
+            continue
+        if before['status'] == 'ok' and result['status'] != 'ok':
+            regressions.append((result_key(result), 'status'))
+            print(f"{result['goals']:>7,} {result['days']:>6,} {'status':<12} {'ok':>10} {result['status']:>10}  REGRESSION")
+            continue
+        for field in COMPARE_FIELDS:
+            if not before.get(field) or result.get(field) is None:
+                continue
+            delta = result[field] / before[field] - 1
+            flag = ''
+            if delta > threshold and before[field] >= MIN_COMPARE_MS:
+                regressions.append((result_key(result), field))
+                flag = '  REGRESSION'
+            print(f"{result['goals']:>7,} {result['days']:>6,} {field:<12} "
+                  f"{before[field]:>10,.0f} {result[field]:>10,.0f} {delta:>+8.1%}{flag}")
+    return regressions
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Measure userscript time-to-ready and view times as fixtures grow')
+    parser.add_argument('--goals', type=parse_int_list, default=DEFAULT_GOALS,
+                        help=f"Comma separated goal counts (default: {','.join(map(str, DEFAULT_GOALS))})")
+    parser.add_argument('--years', type=parse_int_list, default=DEFAULT_YEARS,
+                        help=f"Comma separated horizons in years (default: {','.join(map(str, DEFAULT_YEARS))})")
+    parser.add_argument('--server', choices=list(SERVERS), default='python',
+                        help="Demo server: 'python' (mock-api-server.py) or 'node' (mock-server.js on port 8765) (default: python)")
+    parser.add_argument('--engine', choices=['numpy', 'loop'], default='numpy',
+                        help="Generator time-series engine; fixtures for a seed differ per engine (default: numpy)")
+    parser.add_argument('--seed', type=int, default=1,
+                        help='Base seed so every run generates the same fixtures (default: 1)')
+    parser.add_argument('--timeout', type=float, default=120,
+                        help='Seconds to wait for each step before recording the cell as timed out (default: 120)')
+    parser.add_argument('--keep-fixtures', default=None, metavar='DIR',
+                        help='Keep the generated fixtures in DIR instead of a temporary directory')
+    parser.add_argument('--output', default=os.path.join(DEMO_DIR, 'e2e-scaling-results.json'),
+                        help='Results JSON path (default: demo/e2e-scaling-results.json)')
+    parser.add_argument('--compare', default=None, metavar='BASELINE',
+                        help='Compare with a previous results file and exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help=f'Time increase treated as a regression by --compare (default: 0.25; timings under {MIN_COMPARE_MS}ms are not flagged)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the scaling grid and write results"""
+    args = parse_args(argv)
+    if sync_playwright is None:
+        print("Error: Playwright for Python is required (pip install playwright && playwright install chromium)", file=sys.stderr)
+        sys.exit(1)
+
+    generator = load_generator()
+    try:
+        generator.resolve_engine_name(args.engine)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"E2E scaling with the {args.server} demo server ({args.engine} engine fixtures)")
+    print(f"{'goals':>7} {'days':>6} {'fixture MB':>10} {'ready ms':>9} {'summary ms':>10} "
+          f"{'bucket p50':>11} {'bucket max':>10} {'heap MB':>8}  status")
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir, sync_playwright() as playwright:
+        fixture_dir = args.keep_fixtures or tmp_dir
+        os.makedirs(fixture_dir, exist_ok=True)
+        try:
+            browser = playwright.chromium.launch(headless=True)
+        except PlaywrightError as e:
+            print(f"Error: failed to launch Chromium (run 'playwright install chromium'): {str(e).splitlines()[0]}", file=sys.stderr)
+            sys.exit(1)
+        try:
+            for goals in args.goals:
+                for years in args.years:
+                    result = run_cell(generator, browser, goals, years * 365, args, fixture_dir)
+                    print(format_row(result))
+                    if result['status'] != 'ok':
+                        print(f"    {result['error']}")
+                    results.append(result)
+        finally:
+            browser.close()
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'server': args.server,
+            'engine': args.engine,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold, results_engine=args.engine)
+        if regressions:
+            print(f"\n{len(regressions)} timing(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+HTTP load generator for the mock Endowus API
+
+Replays the userscript's request pattern against a running demo server
+(mock-api-server.py or mock-server.js). Each session is one page load:
+
+    1. the three goal lists, fetched concurrently (as dashboard/index.html does)
+    2. /v1/performance?goalId=ID for every goal, one after another (as the
+       userscript's sequential request queue does, optionally with its delay)
+
+Untimed warm-up sessions first fill the server's response cache (use
+--warmup 0 to measure cold responses). Sessions run concurrently over
+keep-alive connections. Throughput and p50/p95/p99 latency are reported
+per endpoint, and --concurrency takes a list so one run can find the
+level where response time degrades:
+
+    python3 demo/mock-api-server.py --data demo/mock-data-large.json &
+    python3 demo/benchmark-mock-api.py --data demo/mock-data-large.json --concurrency 1,4,16,64
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+from urllib.parse import quote, urlsplit
+
+from mock_tools import DEMO_DIR, parse_int_list, percentile
+
+DEFAULT_URL = 'http://127.0.0.1:8765'
+LIST_ENDPOINTS = ['/v1/goals/performance', '/v2/goals/investible', '/v1/goals']
+PERFORMANCE_ENDPOINT = '/v1/performance'
+# The userscript waits this long between performance requests
+USERSCRIPT_DELAY_MS = 500
+DEFAULT_CONCURRENCY = [1, 4, 16]
+# A level whose p95 exceeds the first level's by this factor is reported as degraded
+DEFAULT_DEGRADE_FACTOR = 2.0
+
+class HttpConnection:
+    """Minimal HTTP/1.1 keep-alive client connection on asyncio streams"""
+
+    def __init__(self, host, port, headers):
+        self.host = host
+        self.port = port
+        self.headers = headers
+        self.reader = None
+        self.writer = None
+
+    async def request(self, path):
+        """
+        GET a path, reconnecting if the server closed the connection
+
+        Returns:
+            Tuple of (status, body bytes received)
+        """
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f'GET {path} HTTP/1.1', f'Host: {self.host}:{self.port}']
+        lines.extend(f'{name}: {value}' for name, value in self.headers.items())
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError('connection closed by server')
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+
+        received = 0
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).split(b';')[0], 16)
+                await self.reader.readexactly(size + 2)
+                received += size
+                if size == 0:
+                    break
+        elif 'content-length' in response_headers:
+            received = int(response_headers['content-length'])
+            await self.reader.readexactly(received)
+        else:
+            received = len(await self.reader.read())
+            self.close()
+        if response_headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status, received
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            self.reader = None
+
+class EndpointStats:
+    """Latencies, errors and bytes for one endpoint"""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = 0
+        self.bytes = 0
+
+    def percentile(self, fraction):
+        """Nearest-rank percentile of the latencies in milliseconds (None when empty)"""
+        value = percentile(self.latencies, fraction)
+        return value * 1000 if value is not None else None
+
+    def to_dict(self, elapsed):
+        return {
+            'requests': len(self.latencies),
+            'errors': self.errors,
+            'requestsPerSecond': round(len(self.latencies) / elapsed, 1) if elapsed > 0 else None,
+            'p50Ms': _round(self.percentile(0.50)),
+            'p95Ms': _round(self.percentile(0.95)),
+            'p99Ms': _round(self.percentile(0.99)),
+            'bytes': self.bytes
+        }
+
+def _round(value):
+    return round(value, 2) if value is not None else None
+
+def load_goal_ids(data_path):
+    """goalIds in the order the userscript sees them (generator JSON, sharded manifest or lazy output)"""
+    with open(data_path) as f:
+        mock_data = json.load(f)
+    return [goal['goalId'] for goal in mock_data['performance']]
+
+async def timed_request(connection, path, stats):
+    """Issue one request and record it under its endpoint"""
+    started = time.perf_counter()
+    try:
+        status, received = await connection.request(path)
+    except (OSError, ValueError, asyncio.IncompleteReadError):
+        connection.close()
+        stats.errors += 1
+        return
+    stats.latencies.append(time.perf_counter() - started)
+    stats.bytes += received
+    if status not in (200, 304):
+        stats.errors += 1
+
+async def run_session(host, port, headers, goal_ids, delay, stats):
+    """One page load: the goal lists concurrently, then each goal's performance in turn"""
+    connections = [HttpConnection(host, port, headers) for _ in LIST_ENDPOINTS]
+    try:
+        await asyncio.gather(*(
+            timed_request(connection, endpoint, stats[endpoint])
+            for connection, endpoint in zip(connections, LIST_ENDPOINTS)
+        ))
+        connection = connections[0]
+        for index, goal_id in enumerate(goal_ids):
+            await timed_request(connection, f'{PERFORMANCE_ENDPOINT}?displayCcy=SGD&goalId={quote(goal_id)}',
+                                stats[PERFORMANCE_ENDPOINT])
+            if delay and index < len(goal_ids) - 1:
+                await asyncio.sleep(delay)
+    finally:
+        for connection in connections:
+            connection.close()
+
+async def run_level(base_url, goal_ids, concurrency, sessions, delay, headers):
+    """
+    Run `sessions` sessions with up to `concurrency` in flight
+
+    Returns:
+        Tuple of (endpoint -> EndpointStats, elapsed seconds)
+    """
+    parsed = urlsplit(base_url)
+    host, port = parsed.hostname, parsed.port or 80
+    stats = {endpoint: EndpointStats() for endpoint in LIST_ENDPOINTS + [PERFORMANCE_ENDPOINT]}
+    pending = iter(range(sessions))
+
+    async def worker():
+        for _ in pending:
+            await run_session(host, port, headers, goal_ids, delay, stats)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, sessions))))
+    return stats, time.perf_counter() - started
+
+def format_ms(value):
+    return f'{value:,.1f}' if value is not None else '-'
+
+def print_level(concurrency, sessions, stats, elapsed):
+    """Per-endpoint table for one concurrency level"""
+    total = sum(len(endpoint.latencies) for endpoint in stats.values())
+    print(f"\nConcurrency {concurrency}: {sessions:,} session(s), {total:,} requests in {elapsed:.2f}s "
+          f"({total / elapsed if elapsed > 0 else 0:,.1f} req/s)")
+    print(f"  {'endpoint':<22} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'MB':>9}")
+    for endpoint, endpoint_stats in stats.items():
+        result = endpoint_stats.to_dict(elapsed)
+        print(f"  {endpoint:<22} {result['requests']:>9,} {result['errors']:>7,} "
+              f"{result['requestsPerSecond'] or 0:>9,.1f} {format_ms(result['p50Ms']):>9} "
+              f"{format_ms(result['p95Ms']):>9} {format_ms(result['p99Ms']):>9} {result['bytes'] / 1024 / 1024:>9,.2f}")
+
+def find_degradation(levels, factor):
+    """First level whose /v1/performance p95 exceeds the first level's by factor, or None"""
+    baseline = levels[0]['endpoints'][PERFORMANCE_ENDPOINT]['p95Ms']
+    if not baseline:
+        return None
+    for level in levels[1:]:
+        p95 = level['endpoints'][PERFORMANCE_ENDPOINT]['p95Ms']
+        if p95 is not None and p95 > baseline * factor:
+            return level
+    return None
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Replay the userscript's request fan-out against a mock API server")
+    parser.add_argument('--data', default=os.environ.get('GPV_MOCK_DATA') or os.path.join(DEMO_DIR, 'mock-data.json'),
+                        help='Fixture the server is serving, read for its goalIds (default: $GPV_MOCK_DATA or demo/mock-data.json)')
+    parser.add_argument('--url', default=DEFAULT_URL, help=f'Server base URL (default: {DEFAULT_URL})')
+    parser.add_argument('--concurrency', type=parse_int_list, default=DEFAULT_CONCURRENCY,
+                        help=f"Comma separated numbers of concurrent sessions to run in turn (default: {','.join(map(str, DEFAULT_CONCURRENCY))})")
+    parser.add_argument('--sessions', type=int, default=None,
+                        help='Sessions per concurrency level (default: twice the concurrency)')
+    parser.add_argument('--warmup', type=int, default=1,
+                        help='Untimed sessions run first so server-side caches are warm (default: 1)')
+    parser.add_argument('--goals', type=int, default=None,
+                        help='Request only the first N goals per session (default: all)')
+    parser.add_argument('--delay-ms', type=float, default=0,
+                        help=f'Pause between a session\'s performance requests (the userscript uses {USERSCRIPT_DELAY_MS}; default: 0)')
+    parser.add_argument('--gzip', action='store_true',
+                        help='Send Accept-Encoding: gzip, as browsers do')
+    parser.add_argument('--degrade-factor', type=float, default=DEFAULT_DEGRADE_FACTOR,
+                        help=f'Report the first level whose /v1/performance p95 exceeds the first level\'s by this factor (default: {DEFAULT_DEGRADE_FACTOR})')
+    parser.add_argument('--output', default=None, metavar='PATH',
+                        help='Also write results as JSON to PATH')
+    args = parser.parse_args(argv)
+    if args.sessions is not None and args.sessions < 1:
+        parser.error('--sessions must be at least 1')
+    if args.warmup < 0:
+        parser.error('--warmup must not be negative')
+    if args.goals is not None and args.goals < 0:
+        parser.error('--goals must not be negative')
+    return args
+
+def main(argv=None):
+    """Run the load test at each concurrency level"""
+    args = parse_args(argv)
+    try:
+        goal_ids = load_goal_ids(args.data)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: failed to read goals from {args.data}: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.goals is not None:
+        goal_ids = goal_ids[:args.goals]
+    headers = {'Accept': 'application/json'}
+    if args.gzip:
+        headers['Accept-Encoding'] = 'gzip'
+
+    print(f"Replaying {len(LIST_ENDPOINTS)} list + {len(goal_ids):,} performance requests per session against {args.url}")
+    if args.warmup:
+        stats, elapsed = asyncio.run(run_level(args.url, goal_ids, 1, args.warmup, 0, headers))
+        print(f"Warm-up: {args.warmup:,} session(s) in {elapsed:.2f}s")
+    levels = []
+    for concurrency in args.concurrency:
+        sessions = args.sessions or concurrency * 2
+        try:
+            stats, elapsed = asyncio.run(run_level(args.url, goal_ids, concurrency, sessions, args.delay_ms / 1000, headers))
+        except KeyboardInterrupt:
+            break
+        print_level(concurrency, sessions, stats, elapsed)
+        levels.append({
+            'concurrency': concurrency,
+            'sessions': sessions,
+            'elapsedSeconds': round(elapsed, 3),
+            'requestsPerSecond': round(sum(len(s.latencies) for s in stats.values()) / elapsed, 1) if elapsed > 0 else None,
+            'endpoints': {endpoint: endpoint_stats.to_dict(elapsed) for endpoint, endpoint_stats in stats.items()}
+        })
+        if all(not endpoint_stats.latencies for endpoint_stats in stats.values()):
+            print(f"Error: no request to {args.url} succeeded (is the mock server running?)", file=sys.stderr)
+            sys.exit(1)
+
+    if len(levels) > 1:
+        print(f"\n{'concurrency':>11} {'req/s':>10} {'perf p50 ms':>12} {'perf p95 ms':>12} {'perf p99 ms':>12}")
+        for level in levels:
+            performance = level['endpoints'][PERFORMANCE_ENDPOINT]
+            print(f"{level['concurrency']:>11,} {level['requestsPerSecond'] or 0:>10,.1f} {format_ms(performance['p50Ms']):>12} "
+                  f"{format_ms(performance['p95Ms']):>12} {format_ms(performance['p99Ms']):>12}")
+        degraded = find_degradation(levels, args.degrade_factor)
+        if degraded:
+            print(f"\n/v1/performance p95 degrades beyond {args.degrade_factor:g}x at concurrency {degraded['concurrency']}")
+        else:
+            print(f"\n/v1/performance p95 stays within {args.degrade_factor:g}x across the levels tested")
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'url': args.url,
+                'data': args.data,
+                'goals': len(goal_ids),
+                'delayMs': args.delay_ms,
+                'warmupSessions': args.warmup,
+                'gzip': args.gzip
+            },
+            'levels': levels
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the mock data generator
+
+Runs generate-mock-data.py stages over a grid of goal counts and horizons and
+records wall time, peak memory and output bytes per stage. Results are written
+as JSON so runs can be compared between revisions:
+
+    python3 demo/benchmark-mock-data.py --output before.json
+    python3 demo/benchmark-mock-data.py --compare before.json
+    python3 demo/benchmark-mock-data.py --full    # 10k goals and 20 years too
+
+Each grid cell runs in a fresh subprocess, so its peak RSS is not polluted by
+earlier cells. Peak RSS only covers the whole cell, so each stage's own peak
+comes from a second, traced pass (tracemalloc): the most the stage allocated
+on top of what was live when it started. Timings come from the untraced pass.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: peak RSS is not reported
+    resource = None
+
+from mock_tools import DEMO_DIR, git_revision, grid_buckets, load_generator, parse_int_list
+
+DEFAULT_GOALS = [10, 100, 1000]
+DEFAULT_YEARS = [1, 5, 10]
+# --full: the whole requested range (the 10k x 20y cell needs several GB and minutes)
+FULL_GOALS = [10, 100, 1000, 10000]
+FULL_YEARS = [1, 5, 10, 20]
+# Stages faster than this are too noisy to flag as regressions
+MIN_COMPARE_SECONDS = 0.05
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far (None when unavailable; never reset)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def run_cell(goals, days, engine, seed, trace=False):
+    """
+    Run every stage for one grid cell in this process
+
+    Args:
+        trace: Measure each stage's peak allocation with tracemalloc
+            (peakAllocBytes) instead of trusting its wall time
+
+    Returns:
+        List of result dicts, one per stage
+    """
+    generator = load_generator()
+    buckets = grid_buckets(generator, goals, days)
+    series_engine = generator.resolve_series_engine(engine)
+    as_of = datetime(2026, 1, 1)
+    points = goals * days
+    results = []
+    if trace:
+        tracemalloc.start()
+
+    def begin():
+        if not trace:
+            return time.perf_counter(), 0
+        tracemalloc.reset_peak()
+        return time.perf_counter(), tracemalloc.get_traced_memory()[0]
+
+    def record(stage, begun, output_bytes=None):
+        started, live_bytes = begun
+        elapsed = time.perf_counter() - started
+        results.append({
+            'stage': stage,
+            'goals': goals,
+            'days': days,
+            'engine': engine,
+            'points': points,
+            'wallSeconds': round(elapsed, 6),
+            'pointsPerSecond': round(points / elapsed) if elapsed > 0 and stage in ('series', 'generate') else None,
+            'peakAllocBytes': tracemalloc.get_traced_memory()[1] - live_bytes if trace else None,
+            'outputBytes': output_bytes
+        })
+
+    # Stage 1: raw time-series generation (no response assembly)
+    started = begin()
+    for bucket_name, index, goal_type, horizon in generator.iter_goal_specs(buckets):
+        series_engine(
+            initial_investment=goal_type['targetAmount'] * 0.65,
+            target_final_amount=goal_type['targetAmount'],
+            annual_return_rate=0.08,
+            days=horizon,
+            goal_name=bucket_name,
+            rng=generator.goal_rng(seed, generator.make_goal_id(bucket_name, index)),
+            as_of=as_of
+        )
+    record('series', started)
+
+    # Stage 2: full generate_mock_data (series + API response assembly)
+    started = begin()
+    mock_data = generator.generate_mock_data(engine=engine, seed=seed, as_of=as_of, buckets=buckets)
+    record('generate', started)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Stage 3: JSON serialization
+        json_file = os.path.join(tmp_dir, 'mock-data.json')
+        started = begin()
+        generator.write_mock_data(mock_data, json_file)
+        record('json', started, os.path.getsize(json_file))
+
+        # Stage 4: bucket configuration markdown
+        doc_file = os.path.join(tmp_dir, 'BUCKET_CONFIGURATION.md')
+        started = begin()
+        generator.generate_bucket_config_doc(mock_data, doc_file)
+        record('doc', started, os.path.getsize(doc_file))
+
+    if trace:
+        tracemalloc.stop()
+    return results
+
+def measure_cell(goals, days, engine, seed, memory=True):
+    """
+    Time one grid cell, then (with memory) repeat it traced for per-stage peaks
+
+    Every stage result gets the cell's peakRssBytes, taken after the untraced
+    pass: it is the peak of the whole cell, not of the stage.
+    """
+    results = run_cell(goals, days, engine, seed)
+    cell_rss = peak_rss_bytes()
+    traced = {result['stage']: result['peakAllocBytes'] for result in run_cell(goals, days, engine, seed, trace=True)} if memory else {}
+    for result in results:
+        result['peakAllocBytes'] = traced.get(result['stage'])
+        result['peakRssBytes'] = cell_rss
+    return results
+
+def run_cell_subprocess(goals, days, engine, seed, memory=True):
+    """Run a grid cell in a fresh interpreter so its peak RSS is isolated"""
+    command = [sys.executable, os.path.abspath(__file__), '--cell', str(goals), str(days),
+               '--engine', engine, '--seed', str(seed)] + ([] if memory else ['--no-memory'])
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f'Benchmark cell {goals} goals x {days} days failed:\n{result.stderr}')
+    return json.loads(result.stdout)
+
+def format_row(result):
+    """One table row for a stage result"""
+    alloc = result['peakAllocBytes']
+    alloc_display = f"{alloc / 1024 / 1024:,.1f}" if alloc is not None else '-'
+    rss = result['peakRssBytes']
+    rss_display = f"{rss / 1024 / 1024:,.1f}" if rss is not None else '-'
+    output = result['outputBytes']
+    output_display = f"{output / 1024 / 1024:,.2f}" if output is not None else '-'
+    rate = result['pointsPerSecond']
+    rate_display = f"{rate:,}" if rate is not None else '-'
+    return (f"{result['stage']:<9} {result['goals']:>7,} {result['days']:>6,} "
+            f"{result['wallSeconds']:>10.3f} {rate_display:>13} {alloc_display:>10} {rss_display:>12} {output_display:>11}")
+
+def result_key(result):
+    """Identity of a result across runs"""
+    return (result['stage'], result['goals'], result['days'], result['engine'])
+
+def compare_results(baseline, results, threshold):
+    """
+    Print per-stage deltas against a baseline run
+
+    Returns:
+        List of keys whose wall time regressed by more than threshold (fraction)
+    """
+    previous = {result_key(result): result for result in baseline['results']}
+    regressions = []
+    print(f"\nComparison with {baseline['meta'].get('revision') or 'baseline'} (threshold {threshold:.0%}):")
+    print(f"{'stage':<9} {'goals':>7} {'days':>6} {'before s':>10} {'after s':>10} {'delta':>8}")
+    for result in results:
+        before = previous.get(result_key(result))
+        if not before or not before['wallSeconds']:
+            continue
+        delta = result['wallSeconds'] / before['wallSeconds'] - 1
+        flag = ''
+        if delta > threshold and before['wallSeconds'] >= MIN_COMPARE_SECONDS:
+            regressions.append(result_key(result))
+            flag = '  REGRESSION'
+        print(f"{result['stage']:<9} {result['goals']:>7,} {result['days']:>6,} "
+              f"{before['wallSeconds']:>10.3f} {result['wallSeconds']:>10.3f} {delta:>+8.1%}{flag}")
+    return regressions
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Benchmark the mock data generator')
+    parser.add_argument('--goals', type=parse_int_list, default=None,
+                        help=f"Comma separated goal counts (default: {','.join(map(str, DEFAULT_GOALS))})")
+    parser.add_argument('--years', type=parse_int_list, default=None,
+                        help=f"Comma separated horizons in years (default: {','.join(map(str, DEFAULT_YEARS))})")
+    parser.add_argument('--full', action='store_true',
+                        help=f"Default to the full grid: {','.join(map(str, FULL_GOALS))} goals x "
+                             f"{','.join(map(str, FULL_YEARS))} years (needs several GB and minutes)")
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the traced pass that measures each stage\'s peak allocation (halves the run time)')
+    parser.add_argument('--engine', default='auto',
+                        help="Time-series engine passed to the generator (default: auto)")
+    parser.add_argument('--seed', type=int, default=1,
+                        help='Base seed so every run generates the same data (default: 1)')
+    parser.add_argument('--output', default=os.path.join(DEMO_DIR, 'benchmark-results.json'),
+                        help='Results JSON path (default: demo/benchmark-results.json)')
+    parser.add_argument('--compare', default=None, metavar='BASELINE',
+                        help='Compare with a previous results file and exit 1 on regressions')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help=f'Wall time increase treated as a regression by --compare (default: 0.25; stages under {MIN_COMPARE_SECONDS}s are not flagged)')
+    parser.add_argument('--cell', type=int, nargs=2, metavar=('GOALS', 'DAYS'),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    args.goals = args.goals or (FULL_GOALS if args.full else DEFAULT_GOALS)
+    args.years = args.years or (FULL_YEARS if args.full else DEFAULT_YEARS)
+    return args
+
+def main(argv=None):
+    """Run the benchmark grid and write results"""
+    args = parse_args(argv)
+
+    if args.cell:
+        # Internal: run one cell and report to the parent process
+        print(json.dumps(measure_cell(args.cell[0], args.cell[1], args.engine, args.seed, memory=not args.no_memory)))
+        return
+
+    engine = args.engine
+    if engine == 'auto':
+        # Record the concrete engine so results stay comparable across machines
+        engine = 'numpy' if load_generator().np is not None else 'loop'
+
+    print(f"Benchmarking generate-mock-data.py ({engine} engine)")
+    print(f"{'stage':<9} {'goals':>7} {'days':>6} {'wall s':>10} {'points/s':>13} {'stage MB':>10} {'cell RSS MB':>12} {'output MB':>11}")
+    results = []
+    for goals in args.goals:
+        for years in args.years:
+            try:
+                cell_results = run_cell_subprocess(goals, years * 365, engine, args.seed, memory=not args.no_memory)
+            except RuntimeError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            for result in cell_results:
+                print(format_row(result))
+            results.extend(cell_results)
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'engine': engine,
+            'seed': args.seed
+        },
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Bulk sync traffic generator and replay driver for the sync worker
+
+Generates POST /sync bodies shaped like the userscript's uploads. Each user's
+config (goalTargets/goalFixed, as collectConfigData builds it) is sized from
+the goals of a generator scale profile, capped at the goals one real user
+tracks (--max-goals). It is then stood in for by a random
+blob of the exact length SyncEncryption.encryptWithMasterKey produces:
+base64 of salt + IV + AES-GCM ciphertext and tag.
+
+Every user has several devices that sync on overlapping schedules. Uploads
+are replayed in arrival order, which is not timestamp order, so devices race
+on `timestamp` the way they do in the field.
+
+The replay runs in-process against a stand-in for workers/src (the body size
+check of index.js, then handleSync) over an in-memory KV. The KV reads and
+writes JSON strings and can add latency per call (--kv-latency-ms). With
+latency, concurrent uploads for one user interleave between the conflict
+check and the write. Accepted writes that replace a newer timestamp are
+reported as stale overwrites. Rate limiting and auth are not modelled.
+
+    python3 demo/benchmark-sync.py --profile realistic --users 500 --devices 3 --concurrency 1,16,64
+    python3 demo/benchmark-sync.py --profile large --users 100 --devices 4 --race-window-ms 5000 --write demo/sync-payloads.jsonl
+    python3 demo/benchmark-sync.py --payloads demo/sync-payloads.jsonl --kv-latency-ms 5
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime
+
+from mock_tools import load_generator, parse_int_list, percentile
+
+# Mirrors workers/src (index.js CONFIG, storage.js, handlers.js)
+MAX_PAYLOAD_SIZE = 10 * 1024
+KV_KEY_PREFIX = 'sync_user:'
+MAX_CLOCK_SKEW_MS = 5 * 60 * 1000
+# Mirrors SyncEncryption in the userscript: salt + IV + ciphertext + GCM tag
+SALT_LENGTH = 16
+IV_LENGTH = 12
+GCM_TAG_LENGTH = 16
+DEFAULT_CONCURRENCY = [1, 16]
+DEFAULT_SYNC_INTERVAL_MS = 60 * 1000
+DEFAULT_RACE_WINDOW_MS = 2000
+# Goals one user's config covers at most: a large real portfolio. Each goal adds
+# about 70 bytes to the upload, so uncapped large profiles would all hit 413
+DEFAULT_MAX_GOALS = 50
+
+def profile_goals(generator, profile):
+    """(goalId, targetAllocation) for every goal of a scale profile, in output order"""
+    buckets = generator.expand_profile(profile)
+    return [
+        (generator.make_goal_id(bucket_name, index), goal_type['targetAllocation'])
+        for bucket_name, index, goal_type, _ in generator.iter_goal_specs(buckets)
+    ]
+
+def build_config(goals, rng, timestamp, fixed_rate):
+    """
+    One user's sync config, as collectConfigData builds it
+
+    Fixed goals keep a goalFixed entry and drop their target; some unfixed
+    goals keep goalFixed false from an earlier toggle.
+    """
+    config = {'version': 1, 'goalTargets': {}, 'goalFixed': {}, 'timestamp': timestamp}
+    for goal_id, allocation in goals:
+        if rng.random() < fixed_rate:
+            config['goalFixed'][goal_id] = True
+            continue
+        config['goalTargets'][goal_id] = round(min(max(allocation + rng.uniform(-5, 5), 0), 100), 2)
+        if rng.random() < 0.5:
+            config['goalFixed'][goal_id] = False
+    return config
+
+def encrypted_blob(plaintext, rng):
+    """Random stand-in for encryptWithMasterKey(plaintext): same length, same alphabet"""
+    size = SALT_LENGTH + IV_LENGTH + len(plaintext.encode('utf-8')) + GCM_TAG_LENGTH
+    return base64.b64encode(rng.randbytes(size)).decode('ascii')
+
+def generate_payloads(goals, users, devices, syncs, seed=None, fixed_rate=0.1,
+                      interval_ms=DEFAULT_SYNC_INTERVAL_MS, race_window_ms=DEFAULT_RACE_WINDOW_MS, now_ms=None,
+                      max_goals=DEFAULT_MAX_GOALS):
+    """
+    POST /sync bodies for every user and device, in arrival order
+
+    Each user tracks between a quarter and all of the profile's goals, up to
+    `max_goals` of them (None for no cap). Each
+    device syncs `syncs` times, `interval_ms` apart, from a random offset
+    within one interval. Its timestamp is when the config was collected. It
+    arrives up to `race_window_ms` later (exponentially distributed), so
+    uploads from different devices close together can arrive out of order.
+    The last upload is collected at `now_ms` (default: now).
+
+    Returns:
+        List of request bodies (dicts)
+    """
+    rng = random.Random(seed)
+    if now_ms is None:
+        now_ms = int(time.time() * 1000)
+    start_ms = now_ms - syncs * interval_ms
+    scheduled = []
+    for user_index in range(users):
+        user_id = f'sync-user-{user_index + 1}'
+        trackable = min(len(goals), max_goals) if max_goals else len(goals)
+        user_goals = rng.sample(goals, max(1, round(trackable * rng.uniform(0.25, 1))))
+        for device_index in range(devices):
+            device_id = f'{user_id}-device-{device_index + 1}'
+            offset = rng.uniform(0, interval_ms)
+            for sync_index in range(syncs):
+                timestamp = int(start_ms + offset + sync_index * interval_ms)
+                arrival = timestamp + rng.expovariate(1 / race_window_ms) if race_window_ms > 0 else timestamp
+                plaintext = json.dumps(build_config(user_goals, rng, timestamp, fixed_rate), separators=(',', ':'))
+                scheduled.append((arrival, {
+                    'encryptedData': encrypted_blob(plaintext, rng),
+                    'deviceId': device_id,
+                    'timestamp': timestamp,
+                    'version': 1,
+                    'userId': user_id
+                }))
+    scheduled.sort(key=lambda item: item[0])
+    return [body for _, body in scheduled]
+
+def write_payloads(payloads, path):
+    """Save request bodies as JSON lines, one POST /sync body per line"""
+    with open(path, 'w') as f:
+        for body in payloads:
+            f.write(json.dumps(body, separators=(',', ':')))
+            f.write('\n')
+
+def load_payloads(path):
+    """Request bodies saved by write_payloads (as raw JSON, so invalid bodies replay as sent)"""
+    with open(path, 'rb') as f:
+        return [line.rstrip(b'\n') for line in f if line.strip()]
+
+class InMemoryKV:
+    """
+    Dict-backed stand-in for a KV namespace binding
+
+    Values are stored as JSON strings, as Cloudflare KV stores them. Each
+    call waits `latency` seconds first; with latency, concurrent get/put
+    pairs interleave as they can on the real binding.
+    """
+
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.values = {}
+        self.reads = 0
+        self.writes = 0
+        self.stale_overwrites = 0
+
+    async def get(self, key):
+        self.reads += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        value = self.values.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def put(self, key, value):
+        self.writes += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        current = self.values.get(key)
+        if current is not None and json.loads(current)['timestamp'] > json.loads(value)['timestamp']:
+            self.stale_overwrites += 1
+        self.values[key] = value
+
+    def stored_bytes(self):
+        return sum(len(key) + len(value) for key, value in self.values.items())
+
+def validate_sync_request(body):
+    """validateSyncRequest from handlers.js: None when valid, else the error message"""
+    if not isinstance(body, dict):
+        return 'Request body must be JSON object'
+    for field in ('userId', 'deviceId', 'encryptedData'):
+        if not body.get(field) or not isinstance(body[field], str):
+            return f'{field} must be a non-empty string'
+    timestamp = body.get('timestamp')
+    if not timestamp or isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)) or timestamp <= 0:
+        return 'timestamp must be a positive number'
+    version = body.get('version')
+    if not version or isinstance(version, bool) or not isinstance(version, (int, float)) or version < 1:
+        return 'version must be a number >= 1'
+    if timestamp > time.time() * 1000 + MAX_CLOCK_SKEW_MS:
+        return 'timestamp too far in the future'
+    return None
+
+class SyncWorkerStandIn:
+    """POST /sync as workers/src handles it: handleSyncUpload, then handleSync"""
+
+    def __init__(self, kv):
+        self.kv = kv
+
+    async def post_sync(self, raw_body):
+        """
+        Handle one upload
+
+        Returns:
+            Tuple of (status, response body dict)
+        """
+        if len(raw_body) > MAX_PAYLOAD_SIZE:
+            return 413, {'success': False, 'error': 'PAYLOAD_TOO_LARGE', 'maxSize': MAX_PAYLOAD_SIZE}
+        try:
+            body = json.loads(raw_body)
+        except ValueError:
+            return 400, {'success': False, 'error': 'BAD_REQUEST', 'message': 'Invalid JSON in request body'}
+        error = validate_sync_request(body)
+        if error:
+            return 400, {'success': False, 'error': 'BAD_REQUEST', 'message': error}
+
+        key = KV_KEY_PREFIX + body['userId']
+        existing = await self.kv.get(key)
+        if existing and existing['timestamp'] > body['timestamp']:
+            return 409, {'success': False, 'error': 'CONFLICT', 'message': 'Server has newer data', 'serverData': existing}
+
+        data = {
+            'encryptedData': body['encryptedData'],
+            'deviceId': body['deviceId'],
+            'timestamp': body['timestamp'],
+            'version': body['version'],
+            'serverTimestamp': int(time.time() * 1000)
+        }
+        await self.kv.put(key, json.dumps(data, separators=(',', ':')))
+        return 200, {'success': True, 'timestamp': body['timestamp']}
+
+async def replay(raw_bodies, concurrency, kv_latency):
+    """
+    Send every body through a fresh stand-in, `concurrency` at a time, in order
+
+    Returns:
+        Dict of results for the level
+    """
+    kv = InMemoryKV(kv_latency)
+    worker = SyncWorkerStandIn(kv)
+    statuses = {}
+    latencies = []
+    pending = iter(raw_bodies)
+
+    async def client():
+        for raw_body in pending:
+            started = time.perf_counter()
+            status, response = await worker.post_sync(raw_body)
+            # The worker serializes its response; so does the stand-in, for comparable cost
+            json.dumps(response)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(min(concurrency, len(raw_bodies)))))
+    elapsed = time.perf_counter() - started
+    requests = len(latencies)
+    # 413s and 400s never reach the conflict check, so they do not count towards the 409 rate
+    checked = statuses.get(200, 0) + statuses.get(409, 0)
+    return {
+        'concurrency': concurrency,
+        'requests': requests,
+        'elapsedSeconds': round(elapsed, 3),
+        'requestsPerSecond': round(requests / elapsed, 1) if elapsed > 0 else None,
+        'p50Ms': _round_ms(percentile(latencies, 0.50)),
+        'p95Ms': _round_ms(percentile(latencies, 0.95)),
+        'p99Ms': _round_ms(percentile(latencies, 0.99)),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'conflictRate': round(statuses.get(409, 0) / checked, 4) if checked else None,
+        'staleOverwrites': kv.stale_overwrites,
+        'kvReads': kv.reads,
+        'kvWrites': kv.writes,
+        'kvKeys': len(kv.values),
+        'kvBytes': kv.stored_bytes()
+    }
+
+def _round_ms(seconds):
+    return round(seconds * 1000, 3) if seconds is not None else None
+
+def size_distribution(raw_bodies):
+    """Request body sizes in bytes: percentiles, max and how many exceed the worker's limit"""
+    sizes = [len(raw_body) for raw_body in raw_bodies]
+    return {
+        'count': len(sizes),
+        'minBytes': min(sizes) if sizes else None,
+        'p50Bytes': percentile(sizes, 0.50),
+        'p95Bytes': percentile(sizes, 0.95),
+        'p99Bytes': percentile(sizes, 0.99),
+        'maxBytes': max(sizes) if sizes else None,
+        'overLimit': sum(1 for size in sizes if size > MAX_PAYLOAD_SIZE),
+        'limitBytes': MAX_PAYLOAD_SIZE
+    }
+
+def format_value(value, spec=',.1f'):
+    return format(value, spec) if value is not None else '-'
+
+def print_sizes(sizes):
+    print(f"Payload sizes: min {format_value(sizes['minBytes'], ',')} B, p50 {format_value(sizes['p50Bytes'], ',')} B, "
+          f"p95 {format_value(sizes['p95Bytes'], ',')} B, p99 {format_value(sizes['p99Bytes'], ',')} B, "
+          f"max {format_value(sizes['maxBytes'], ',')} B")
+    if sizes['overLimit']:
+        print(f"  {sizes['overLimit']:,} of {sizes['count']:,} exceed the worker's {MAX_PAYLOAD_SIZE:,} B limit (413)")
+    if sizes['overLimit'] * 2 > sizes['count']:
+        print(f"Warning: most uploads are rejected with 413 before the conflict check, so the 409 rate only covers "
+              f"{sizes['count'] - sizes['overLimit']:,} of them. Lower --max-goals or use a smaller --profile", file=sys.stderr)
+
+def print_levels(levels):
+    print(f"\n{'concurrency':>11} {'req/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'200':>7} {'409':>7} {'413':>7} {'400':>7} {'409 rate':>9} {'stale':>6}")
+    for level in levels:
+        statuses = level['statuses']
+        conflict_rate = f"{level['conflictRate'] * 100:.1f}%" if level['conflictRate'] is not None else '-'
+        print(f"{level['concurrency']:>11,} {format_value(level['requestsPerSecond']):>10} "
+              f"{format_value(level['p50Ms'], ',.3f'):>8} {format_value(level['p95Ms'], ',.3f'):>8} "
+              f"{format_value(level['p99Ms'], ',.3f'):>8} "
+              + ' '.join(f"{statuses.get(status, 0):>7,}" for status in ('200', '409', '413', '400'))
+              + f" {conflict_rate:>9}"
+              f" {level['staleOverwrites']:>6,}")
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Generate bulk sync uploads and replay them against an in-memory sync worker')
+    parser.add_argument('--profile', default='realistic',
+                        help='Scale profile whose goals size each user\'s config: built-in name or JSON file (default: realistic)')
+    parser.add_argument('--users', type=int, default=200, help='Number of users (default: 200)')
+    parser.add_argument('--devices', type=int, default=2, help='Devices per user (default: 2)')
+    parser.add_argument('--syncs', type=int, default=5, help='Uploads per device (default: 5)')
+    parser.add_argument('--max-goals', type=int, default=DEFAULT_MAX_GOALS,
+                        help=f'Most goals one user tracks, whatever the profile size; 0 for no cap (default: {DEFAULT_MAX_GOALS})')
+    parser.add_argument('--fixed-rate', type=float, default=0.1,
+                        help='Fraction of goals marked fixed, which drops their target (default: 0.1)')
+    parser.add_argument('--interval-ms', type=float, default=DEFAULT_SYNC_INTERVAL_MS,
+                        help=f'Time between a device\'s uploads (default: {DEFAULT_SYNC_INTERVAL_MS})')
+    parser.add_argument('--race-window-ms', type=float, default=DEFAULT_RACE_WINDOW_MS,
+                        help=f'Mean delay between collecting a config and the upload arriving; 0 replays in timestamp order (default: {DEFAULT_RACE_WINDOW_MS})')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible payloads')
+    parser.add_argument('--payloads', default=None, metavar='PATH',
+                        help='Replay request bodies from a JSON lines file instead of generating them')
+    parser.add_argument('--write', default=None, metavar='PATH',
+                        help='Save the generated request bodies as JSON lines to PATH')
+    parser.add_argument('--concurrency', type=parse_int_list, default=DEFAULT_CONCURRENCY,
+                        help=f"Comma separated numbers of uploads in flight, each replayed against a fresh KV (default: {','.join(map(str, DEFAULT_CONCURRENCY))})")
+    parser.add_argument('--kv-latency-ms', type=float, default=0,
+                        help='Latency added to every KV get and put (default: 0)')
+    parser.add_argument('--output', default=None, metavar='PATH',
+                        help='Also write results as JSON to PATH')
+    args = parser.parse_args(argv)
+    for name in ('users', 'devices', 'syncs'):
+        if getattr(args, name) < 1:
+            parser.error(f'--{name} must be at least 1')
+    if args.max_goals < 0:
+        parser.error('--max-goals must not be negative')
+    if not 0 <= args.fixed_rate <= 1:
+        parser.error('--fixed-rate must be between 0 and 1')
+    if args.interval_ms <= 0:
+        parser.error('--interval-ms must be positive')
+    if args.race_window_ms < 0 or args.kv_latency_ms < 0:
+        parser.error('--race-window-ms and --kv-latency-ms must not be negative')
+    return args
+
+def main(argv=None):
+    """Generate or load the uploads, then replay them at each concurrency level"""
+    args = parse_args(argv)
+    if args.payloads:
+        try:
+            raw_bodies = load_payloads(args.payloads)
+        except OSError as e:
+            print(f"Error: failed to read payloads from {args.payloads}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Loaded {len(raw_bodies):,} uploads from {args.payloads}")
+    else:
+        generator = load_generator()
+        try:
+            profile_name, profile = generator.load_profile(args.profile)
+            goals = profile_goals(generator, profile)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        started = time.perf_counter()
+        payloads = generate_payloads(goals, args.users, args.devices, args.syncs, seed=args.seed,
+                                     fixed_rate=args.fixed_rate, interval_ms=args.interval_ms,
+                                     race_window_ms=args.race_window_ms, max_goals=args.max_goals)
+        raw_bodies = [json.dumps(body, separators=(',', ':')).encode('utf-8') for body in payloads]
+        print(f"Generated {len(raw_bodies):,} uploads ({args.users:,} users x {args.devices} devices x {args.syncs} syncs, "
+              f"profile '{profile_name}' with {len(goals):,} goals) in {time.perf_counter() - started:.2f}s")
+        if args.write:
+            write_payloads(payloads, args.write)
+            print(f"Payloads saved to {args.write}")
+    if not raw_bodies:
+        print("Error: no uploads to replay", file=sys.stderr)
+        sys.exit(1)
+
+    sizes = size_distribution(raw_bodies)
+    print_sizes(sizes)
+    levels = []
+    for concurrency in args.concurrency:
+        try:
+            levels.append(asyncio.run(replay(raw_bodies, concurrency, args.kv_latency_ms / 1000)))
+        except KeyboardInterrupt:
+            break
+    if levels:
+        print_levels(levels)
+        if any(level['staleOverwrites'] for level in levels):
+            print("\nstale = accepted uploads that replaced a newer timestamp (get/put race in handleSync)")
+
+    if args.output:
+        report = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'payloads': args.payloads,
+                'profile': None if args.payloads else args.profile,
+                'users': None if args.payloads else args.users,
+                'devices': None if args.payloads else args.devices,
+                'syncs': None if args.payloads else args.syncs,
+                'maxGoals': None if args.payloads else args.max_goals,
+                'seed': args.seed,
+                'raceWindowMs': None if args.payloads else args.race_window_ms,
+                'kvLatencyMs': args.kv_latency_ms
+            },
+            'payloadSizes': sizes,
+            'levels': levels
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
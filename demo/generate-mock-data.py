@@ -4,286 +4,2527 @@ Mock Data Generator for Goal Portfolio Viewer Demo
 Generates realistic portfolio data with time-series performance charts
 """
 
+import argparse
+import bisect
+import cProfile
+import functools
+import hashlib
 import json
+import marshal
+import mmap
+import operator
 import os
+import pstats
 import random
-from datetime import datetime, timedelta
+import re
+import shutil
+import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from itertools import accumulate
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the loop engine only needs the stdlib
+    np = None
 
-def generate_bumpy_time_series(initial_investment, target_final_amount, annual_return_rate, days, goal_name):
+
+class TimeSeriesColumns:
+    """
+    Compact goal time series: amount and invested columns plus computed dates
+    
+    Points are held as two array('d') columns (16 bytes a point) instead of a
+    dict and date string each. Dates follow from a start ordinal for daily
+    series, or from an int32 ordinal column otherwise. The object reads like
+    the list of API point dicts it replaces (len, indexing and iteration give
+    {'date', 'amount', 'cumulativeNetInvestmentAmount'} dicts), but those
+    dicts are only built on access, normally while serializing. Series
+    generated on a TradingCalendar keep a reference to it and take their date
+    strings from its index.
+    """
+    
+    __slots__ = ('start_ordinal', 'amounts', 'invested', 'ordinals', 'calendar')
+    
+    def __init__(self, start_ordinal, amounts, invested, ordinals=None, calendar=None):
+        self.start_ordinal = start_ordinal
+        self.amounts = amounts
+        self.invested = invested
+        self.ordinals = ordinals
+        self.calendar = calendar
+    
+    @classmethod
+    def from_points(cls, points):
+        """Build from a list of API point dicts"""
+        ordinals = array('i', (date.fromisoformat(point['date']).toordinal() for point in points))
+        start_ordinal = ordinals[0] if ordinals else 0
+        daily = ordinals[-1] - start_ordinal == len(ordinals) - 1 if ordinals else True
+        return cls(
+            start_ordinal,
+            array('d', (point['amount'] for point in points)),
+            array('d', (point['cumulativeNetInvestmentAmount'] for point in points)),
+            None if daily else ordinals
+        )
+    
+    def __len__(self):
+        return len(self.amounts)
+    
+    def ordinal(self, index):
+        """Date ordinal of the point at index (negative indexes allowed)"""
+        if self.ordinals is not None:
+            return self.ordinals[index]
+        return self.start_ordinal + (index if index >= 0 else len(self.amounts) + index)
+    
+    def ordinal_range(self):
+        """All date ordinals (a range for daily series)"""
+        if self.ordinals is not None:
+            return self.ordinals
+        return range(self.start_ordinal, self.start_ordinal + len(self.amounts))
+    
+    def dates(self):
+        """All dates as YYYY-MM-DD strings"""
+        if self.calendar is not None and len(self.amounts):
+            position = self.calendar.position_on_or_before(self.start_ordinal)
+            return self.calendar.dates[position:position + len(self.amounts)]
+        return [date.fromordinal(ordinal).isoformat() for ordinal in self.ordinal_range()]
+    
+    def __getitem__(self, index):
+        return {
+            'date': date.fromordinal(self.ordinal(index)).isoformat(),
+            'amount': self.amounts[index],
+            'cumulativeNetInvestmentAmount': self.invested[index]
+        }
+    
+    def __iter__(self):
+        return iter(self.to_points())
+    
+    def to_points(self):
+        """Expand into the API shape: a list of point dicts"""
+        return [
+            {'date': day, 'amount': amount, 'cumulativeNetInvestmentAmount': invested_amount}
+            for day, amount, invested_amount in zip(self.dates(), self.amounts, self.invested)
+        ]
+    
+    def to_json(self, indent=None, depth=0):
+        """
+        Serialize as json.dumps would serialize to_points(), without building the dicts
+        
+        Args:
+            indent: JSON indent, or None for compact output
+            depth: Nesting depth of the array (for indented output)
+        """
+        if not len(self.amounts):
+            return '[]'
+        rows = zip(self.dates(), map(float.__repr__, self.amounts), map(float.__repr__, self.invested))
+        if indent is None:
+            return '[' + ','.join(
+                f'{{"date":"{day}","amount":{amount},"cumulativeNetInvestmentAmount":{invested_amount}}}'
+                for day, amount, invested_amount in rows
+            ) + ']'
+        item_pad = '\n' + ' ' * (indent * (depth + 1))
+        key_pad = '\n' + ' ' * (indent * (depth + 2))
+        return '[' + ','.join(
+            f'{item_pad}{{{key_pad}"date": "{day}",{key_pad}"amount": {amount},'
+            f'{key_pad}"cumulativeNetInvestmentAmount": {invested_amount}{item_pad}}}'
+            for day, amount, invested_amount in rows
+        ) + '\n' + ' ' * (indent * depth) + ']'
+    
+    def to_state(self):
+        """Plain tuple (bytes columns) for marshal-based caching"""
+        return (self.start_ordinal, self.amounts.tobytes(), self.invested.tobytes(),
+                self.ordinals.tobytes() if self.ordinals is not None else None)
+    
+    @classmethod
+    def from_state(cls, state, calendar=None):
+        start_ordinal, amounts, invested, ordinals = state
+        columns = [array('d'), array('d'), array('i') if ordinals is not None else None]
+        for column, data in zip(columns, (amounts, invested, ordinals)):
+            if column is not None:
+                column.frombytes(data)
+        return cls(start_ordinal, *columns, calendar=calendar)
+
+class GoalRecord:
+    """One generated goal: identity, targets, series columns and derived figures"""
+    
+    __slots__ = ('goal_id', 'goal_name', 'goal_bucket', 'goal_type', 'target_amount', 'target_allocation',
+                 'series', 'contribution_date', 'annual_return_rate',
+                 'ending_balance', 'cumulative_invested', 'total_cumulative_return', 'simple_rate_of_return_percent')
+    
+    def __init__(self, goal_id, goal_name, goal_bucket, goal_type, target_amount, target_allocation,
+                 series, contribution_date, annual_return_rate):
+        self.goal_id = goal_id
+        self.goal_name = goal_name
+        self.goal_bucket = goal_bucket
+        self.goal_type = goal_type
+        self.target_amount = target_amount
+        self.target_allocation = target_allocation
+        self.series = series
+        self.contribution_date = contribution_date
+        self.annual_return_rate = annual_return_rate
+        # Actual returns from the series
+        returns = calculate_series_returns(series)
+        self.ending_balance = returns['endingBalance']
+        self.cumulative_invested = returns['cumulativeInvested']
+        self.total_cumulative_return = returns['totalCumulativeReturn']
+        self.simple_rate_of_return_percent = returns['simpleRateOfReturnPercent']
+    
+    def to_state(self):
+        """Plain tuple for marshal-based caching (see GenerationCache)"""
+        return (self.goal_id, self.goal_name, self.goal_bucket, self.goal_type, self.target_amount,
+                self.target_allocation, self.series.to_state(), self.contribution_date, self.annual_return_rate)
+    
+    @classmethod
+    def from_state(cls, state, calendar=None):
+        fields = list(state)
+        fields[6] = TimeSeriesColumns.from_state(fields[6], calendar=calendar)
+        return cls(*fields)
+
+def expand_series_entry(time_series):
+    """performanceTimeSeries entry with compact series columns expanded into point dicts"""
+    data = time_series['timeSeries']['data']
+    if isinstance(data, TimeSeriesColumns):
+        return dict(time_series, timeSeries={'data': data.to_points()})
+    return time_series
+
+class TradingCalendar:
+    """
+    Shared index of the trading days before an as-of date
+    
+    Built once per run (see trading_calendar) and shared by every goal, so
+    series generation, window lookups and serialization use index arithmetic
+    instead of per-point datetime work. Position i is the i-th trading day;
+    a goal with a horizon of `days` covers the positions from
+    window_start(days) to the end.
+    
+    Attributes:
+        ordinals: array('i') of trading day ordinals, ascending
+        dates: YYYY-MM-DD string per position
+        weekdays: Real weekday per position (bytes, Monday=0)
+        gaps: Calendar days since the previous trading day per position (bytes, 1 when daily)
+        is_daily: True when every calendar day is a trading day
+    """
+    
+    def __init__(self, end_ordinal, span_days, skip_weekends=False, holidays=()):
+        self.end_ordinal = end_ordinal
+        self.span_days = span_days
+        self.skip_weekends = skip_weekends
+        self.holidays = tuple(sorted(set(holidays)))
+        self.is_daily = not skip_weekends and not self.holidays
+        self.first_ordinal = end_ordinal - span_days
+        
+        skipped = {date.fromisoformat(day).toordinal() for day in self.holidays}
+        self.ordinals = array('i')
+        self.dates = []
+        weekdays = bytearray()
+        gaps = bytearray()
+        # Position of the last trading day on or before each calendar day (-1 before the first)
+        self._on_or_before = array('i')
+        previous = self.first_ordinal - 1
+        for ordinal in range(self.first_ordinal, end_ordinal):
+            day = date.fromordinal(ordinal)
+            weekday = day.weekday()
+            if not (skip_weekends and weekday >= 5) and ordinal not in skipped:
+                self.ordinals.append(ordinal)
+                self.dates.append(day.isoformat())
+                weekdays.append(weekday)
+                gaps.append(min(ordinal - previous, 255))
+                previous = ordinal
+            self._on_or_before.append(len(self.ordinals) - 1)
+        self.weekdays = bytes(weekdays)
+        self.gaps = bytes(gaps)
+    
+    def __reduce__(self):
+        # Processes rebuild (or reuse) their own copy instead of unpickling the index
+        return trading_calendar, (self.end_ordinal, self.span_days, self.skip_weekends, self.holidays)
+    
+    def options(self):
+        """Weekend/holiday rules as a JSON-serializable dict (for cache keys and lazySeries)"""
+        return {'skipWeekends': self.skip_weekends, 'holidays': list(self.holidays)}
+    
+    def for_span(self, days):
+        """This calendar when it covers `days` before its end, else a wider one with the same rules"""
+        if days <= self.span_days:
+            return self
+        return trading_calendar(self.end_ordinal, days, self.skip_weekends, self.holidays)
+    
+    def position_on_or_before(self, ordinal):
+        """Position of the last trading day on or before a date ordinal (-1 when before the index)"""
+        if ordinal >= self.end_ordinal:
+            return len(self.ordinals) - 1
+        if ordinal < self.first_ordinal:
+            return -1
+        return self._on_or_before[ordinal - self.first_ordinal]
+    
+    def position_on_or_after(self, ordinal):
+        """Position of the first trading day on or after a date ordinal (len(ordinals) when none)"""
+        position = self.position_on_or_before(ordinal)
+        if position >= 0 and self.ordinals[position] == ordinal:
+            return position
+        return position + 1
+    
+    def window_start(self, days):
+        """First position of the trading days within `days` calendar days of the end"""
+        if days > self.span_days:
+            raise ValueError(f'Calendar covers {self.span_days} days, not {days}')
+        return self.position_on_or_after(self.end_ordinal - days)
+    
+    def series(self, start, amounts, invested):
+        """TimeSeriesColumns for columns that cover the positions from start to the end"""
+        ordinals = None if self.is_daily else self.ordinals[start:]
+        return TimeSeriesColumns(self.ordinals[start], amounts, invested, ordinals, calendar=self)
+
+def _as_ordinal(day):
+    return day if isinstance(day, int) else day.toordinal()
+
+@functools.lru_cache(maxsize=32)
+def _cached_trading_calendar(end_ordinal, span_days, skip_weekends, holidays):
+    return TradingCalendar(end_ordinal, span_days, skip_weekends, holidays)
+
+def trading_calendar(as_of=None, span_days=0, skip_weekends=False, holidays=()):
+    """
+    Shared TradingCalendar of the span_days before as_of (a date, datetime or ordinal; defaults to now)
+    
+    Calendars are cached by their arguments, so every goal (and every worker
+    process) of a run shares one index.
+    
+    Args:
+        as_of: Day after the last calendar day (series end the day before)
+        span_days: Calendar days covered
+        skip_weekends: Leave Saturdays and Sundays out of the index
+        holidays: YYYY-MM-DD dates left out of the index
+    """
+    end_ordinal = _as_ordinal(as_of if as_of is not None else datetime.now())
+    return _cached_trading_calendar(end_ordinal, span_days, bool(skip_weekends), tuple(sorted(set(holidays))))
+
+def buckets_span_days(buckets):
+    """Longest horizon across bucket definitions (the calendar span a run needs)"""
+    return max((time_horizon_days for _, time_horizon_days, _ in buckets), default=0)
+
+def generate_bumpy_time_series(initial_investment, target_final_amount, annual_return_rate, days, goal_name, rng=random, as_of=None, calendar=None):
+    """
+    Generate realistic time-series data with market volatility and a contribution event
+    
+    Args:
+        initial_investment: Starting investment amount (should be target * 0.6 to allow for growth + 25% contribution)
+        target_final_amount: Desired ending amount (after growth and contribution)
+        annual_return_rate: Expected annual return rate (decimal)
+        days: Number of days to generate (365 for House Purchase, 730 for Retirement)
+        goal_name: Name of the goal for debugging
+        rng: Random source (a per-goal random.Random; defaults to the global random module)
+        as_of: Date the series ends on (defaults to now)
+        calendar: TradingCalendar ending at as_of (defaults to every calendar day)
+    
+    Returns:
+        Tuple of (TimeSeriesColumns of the trading days before as_of, contribution date)
+    """
+    calendar = (calendar or trading_calendar(as_of, days)).for_span(days)
+    start = calendar.window_start(days)
+    weekdays = calendar.weekdays
+    gaps = calendar.gaps
+    # Events are placed by trading day (every day unless the calendar skips some)
+    days = len(calendar.ordinals) - start
+    
+    amounts = array('d')
+    invested = array('d')
+    current_amount = initial_investment
+    cumulative_investment = initial_investment
+    contribution_made = False
+    contribution_date = None
+    
+    # Calculate contribution timing (random day in final 90 days)
+    contribution_day = days - rng.randint(30, 90)
+    
+    # Calculate when contribution will happen - we need to plan our growth
+    # Target: current_amount_at_contribution * 1.25 * (1 + remaining_growth) ≈ target_final_amount
+    days_after_contribution = days - contribution_day
+    
+    # Pre-generate volatility events for realism
+    # Market corrections: 1-2 drawdowns that recover
+    num_corrections = 1 if days < 500 else 2
+    correction_days = rng.sample(range(days//4, max(days - 100, days//4 + num_corrections)), k=num_corrections)
+    
+    # High volatility days (about 5% of days)
+    high_volatility_days = set(rng.sample(range(days), k=int(days * 0.05)))
+    
+    for day in range(days):
+        # Baseline growth since the previous trading day, compounded daily over a longer gap (as the numpy engine does)
+        daily_growth_rate = annual_return_rate / 365
+        gap = gaps[start + day]
+        daily_growth = current_amount * (daily_growth_rate if gap == 1 else (1 + daily_growth_rate) ** gap - 1)
+        
+        # Weekly pattern (markets tend to dip mid-week)
+        week_day = weekdays[start + day]
+        if week_day in [2, 3]:  # Wednesday, Thursday
+            weekly_factor = rng.uniform(0.997, 0.999)
+        elif week_day in [0, 4]:  # Monday, Friday
+            weekly_factor = rng.uniform(1.001, 1.003)
+        else:
+            weekly_factor = 1.0
+        
+        # Normal daily volatility
+        if day in high_volatility_days:
+            daily_volatility = rng.uniform(-0.02, 0.02)  # ±2%
+        else:
+            daily_volatility = rng.uniform(-0.006, 0.006)  # ±0.6%
+        
+        # Market corrections (gradual drawdown and recovery)
+        correction_impact = 0.0  # Additive impact on growth
+        for correction_start in correction_days:
+            if correction_start <= day < correction_start + 40:
+                days_since = day - correction_start
+                if days_since < 7:
+                    # Drawdown phase: lose up to 7% total over 7 days
+                    correction_impact -= 0.01  # -1% per day for 7 days = -7% total
+                else:
+                    # Recovery phase: gradually recover over 33 days
+                    recovery_days = days_since - 7
+                    daily_recovery = 0.07 / 33  # Recover the 7% loss over 33 days
+                    correction_impact += daily_recovery
+        
+        # Apply growth and volatility
+        current_amount += daily_growth
+        current_amount *= (1 + daily_volatility + correction_impact) * weekly_factor
+        
+        # Contribution event (25% addition in final 90 days)
+        if day == contribution_day and not contribution_made:
+            contribution_amount = current_amount * 0.25
+            current_amount += contribution_amount
+            cumulative_investment += contribution_amount
+            contribution_made = True
+            contribution_date = calendar.dates[start + day]
+        
+        # Ensure non-negative
+        current_amount = max(current_amount, 0)
+        
+        # Store data point (its date comes from the calendar)
+        amounts.append(round(current_amount, 2))
+        invested.append(round(cumulative_investment, 2))
+    
+    return calendar.series(start, amounts, invested), contribution_date
+
+def generate_bumpy_time_series_numpy(initial_investment, target_final_amount, annual_return_rate, days, goal_name, rng=random, as_of=None, calendar=None):
+    """
+    Vectorized equivalent of generate_bumpy_time_series built on NumPy arrays
+    
+    Draws the whole path at once (volatility, weekday factors, correction mask)
+    and turns it into balances with a single cumulative product, so large
+    fixtures no longer pay for a Python loop per day. Event placement
+    (contribution day, corrections, high-volatility days) is drawn from `rng`
+    exactly like the loop engine, so both engines produce the same schema and
+    statistical shape.
+    
+    Args:
+        Same as generate_bumpy_time_series
+    
+    Returns:
+        Tuple of (TimeSeriesColumns, contribution date) as generate_bumpy_time_series
+    """
+    if np is None:
+        raise RuntimeError('The numpy engine requires numpy (pip install numpy) - use --engine loop instead')
+    
+    calendar = (calendar or trading_calendar(as_of, days)).for_span(days)
+    start = calendar.window_start(days)
+    days = len(calendar.ordinals) - start
+    
+    # Same event draws as the loop engine
+    contribution_day = days - rng.randint(30, 90)
+    num_corrections = 1 if days < 500 else 2
+    correction_days = rng.sample(range(days//4, max(days - 100, days//4 + num_corrections)), k=num_corrections)
+    high_volatility_days = rng.sample(range(days), k=int(days * 0.05))
+    
+    # Per-day draws come from a NumPy generator seeded off the goal's stream
+    np_rng = np.random.default_rng(rng.getrandbits(64))
+    
+    # Weekly pattern (markets tend to dip mid-week)
+    week_day = np.frombuffer(calendar.weekdays, dtype=np.uint8, offset=start)
+    weekly_factor = np.ones(days)
+    dip_mask = (week_day == 2) | (week_day == 3)  # Wednesday, Thursday
+    lift_mask = (week_day == 0) | (week_day == 4)  # Monday, Friday
+    weekly_factor[dip_mask] = np_rng.uniform(0.997, 0.999, size=int(dip_mask.sum()))
+    weekly_factor[lift_mask] = np_rng.uniform(1.001, 1.003, size=int(lift_mask.sum()))
+    
+    # Normal daily volatility, widened to ±2% on high volatility days
+    daily_volatility = np_rng.uniform(-0.006, 0.006, size=days)
+    if high_volatility_days:
+        daily_volatility[high_volatility_days] = np_rng.uniform(-0.02, 0.02, size=len(high_volatility_days))
+    
+    # Market corrections: -1%/day for 7 days, then recover 7% over 33 days
+    correction_impact = np.zeros(days)
+    for correction_start in correction_days:
+        correction_impact[correction_start:correction_start + 7] -= 0.01
+        correction_impact[correction_start + 7:correction_start + 40] += 0.07 / 33
+    
+    # Growth path: each trading day compounds baseline growth since the previous one, volatility and weekday effect
+    gaps = np.frombuffer(calendar.gaps, dtype=np.uint8, offset=start)
+    growth = (1 + annual_return_rate / 365) if calendar.is_daily else (1 + annual_return_rate / 365) ** gaps
+    daily_factor = growth * (1 + daily_volatility + correction_impact) * weekly_factor
+    amounts = initial_investment * np.cumprod(daily_factor)
+    invested = np.full(days, float(initial_investment))
+    
+    # Contribution event (25% addition in final 90 days)
+    contribution_date = None
+    if 0 <= contribution_day < days:
+        contribution_amount = amounts[contribution_day] * 0.25
+        amounts[contribution_day:] *= 1.25
+        invested[contribution_day:] += contribution_amount
+        contribution_date = calendar.dates[start + contribution_day]
+    
+    # Ensure non-negative
+    amounts = np.maximum(amounts, 0)
+    
+    amounts_column = array('d')
+    amounts_column.frombytes(np.round(amounts, 2).tobytes())
+    invested_column = array('d')
+    invested_column.frombytes(np.round(invested, 2).tobytes())
+    
+    return calendar.series(start, amounts_column, invested_column), contribution_date
+
+# Time-series engines selectable with --engine
+SERIES_ENGINES = {
+    'loop': generate_bumpy_time_series,
+    'numpy': generate_bumpy_time_series_numpy
+}
+
+def resolve_engine_name(engine='auto'):
+    """Return the concrete engine name for an engine option ('auto' prefers numpy when installed)"""
+    if engine == 'auto':
+        engine = 'numpy' if np is not None else 'loop'
+    if engine not in SERIES_ENGINES:
+        raise ValueError(f"Unknown engine '{engine}' (expected one of: auto, {', '.join(SERIES_ENGINES)})")
+    if engine == 'numpy' and np is None:
+        raise RuntimeError('The numpy engine requires numpy (pip install numpy) - use --engine loop instead')
+    return engine
+
+def resolve_series_engine(engine='auto'):
+    """Return the time-series function for an engine name ('auto' prefers numpy when installed)"""
+    return SERIES_ENGINES[resolve_engine_name(engine)]
+
+class StageTimer:
+    """
+    Opt-in wall-clock timer for generator stages (--timings or GPV_MOCK_TIMINGS=1)
+    
+    Stages are accumulated by name across calls. When disabled every hook is a
+    no-op, so the instrumentation can stay in the hot paths.
+    """
+    
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.stages = {}
+    
+    def _add(self, name, seconds, points=0, output_bytes=None):
+        stage = self.stages.setdefault(name, {'seconds': 0.0, 'calls': 0, 'points': 0, 'outputBytes': None})
+        stage['seconds'] += seconds
+        stage['calls'] += 1
+        stage['points'] += points
+        if output_bytes is not None:
+            stage['outputBytes'] = output_bytes
+    
+    @contextmanager
+    def stage(self, name, points=0):
+        """Time the enclosed block as one call of stage `name`"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, time.perf_counter() - started, points)
+    
+    def timed_iter(self, name, iterable, count_points=None):
+        """
+        Yield from iterable, timing each step as one call of stage `name`
+        
+        Used for goal generation so the time spent waiting on worker processes
+        is attributed to the series stage as well.
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self._add(name, time.perf_counter() - started, count_points(item) if count_points else 0)
+            yield item
+    
+    def set_output_bytes(self, name, output_bytes):
+        """Attach the size of the file a stage wrote"""
+        if self.enabled and name in self.stages:
+            self.stages[name]['outputBytes'] = output_bytes
+    
+    def report(self):
+        """Per-stage breakdown as printable lines"""
+        total = sum(stage['seconds'] for stage in self.stages.values())
+        lines = ['Stage timings:']
+        for name, stage in self.stages.items():
+            share = stage['seconds'] / total * 100 if total > 0 else 0
+            details = [f"{stage['calls']:,} call(s)"]
+            if stage['points']:
+                rate = stage['points'] / stage['seconds'] if stage['seconds'] > 0 else 0
+                details.append(f"{stage['points']:,} points, {rate:,.0f} points/s")
+            if stage['outputBytes'] is not None:
+                details.append(format_bytes(stage['outputBytes']))
+            lines.append(f"  {name:<16} {stage['seconds']:>9.3f}s {share:>5.1f}%  ({', '.join(details)})")
+        lines.append(f"  {'total':<16} {total:>9.3f}s")
+        return lines
+
+# Shared timer used by the generation and output stages
+STAGE_TIMER = StageTimer(enabled=os.environ.get('GPV_MOCK_TIMINGS', '') not in ('', '0'))
+
+# Demo buckets: (bucket name, time horizon in days, goal definitions)
+DEMO_BUCKETS = [
+    # House Purchase bucket goals (~200k SGD, 1 year time horizon)
+    # Target Allocation: 70% Core-Balanced, 10% Megatrends, 10% Tech, 10% China
+    ('House Purchase', 365, [
+        {'name': 'Core - Balanced', 'targetAmount': 140000, 'targetAllocation': 70, 'minReturn': 0.05, 'maxReturn': 0.12},
+        {'name': 'Megatrends', 'targetAmount': 20000, 'targetAllocation': 10, 'minReturn': 0.03, 'maxReturn': 0.15},
+        {'name': 'Tech', 'targetAmount': 20000, 'targetAllocation': 10, 'minReturn': -0.02, 'maxReturn': 0.20},
+        {'name': 'China', 'targetAmount': 20000, 'targetAllocation': 10, 'minReturn': -0.08, 'maxReturn': 0.18}
+    ]),
+    # Retirement bucket goals (~60k SGD, 2 year time horizon)
+    # Target Allocation: 55% Core-Aggressive, 15% Megatrends, 15% Tech, 15% China
+    ('Retirement', 730, [
+        {'name': 'Core - Aggressive', 'targetAmount': 33000, 'targetAllocation': 55, 'minReturn': 0.06, 'maxReturn': 0.14},
+        {'name': 'Megatrends', 'targetAmount': 9000, 'targetAllocation': 15, 'minReturn': 0.03, 'maxReturn': 0.15},
+        {'name': 'Tech', 'targetAmount': 9000, 'targetAllocation': 15, 'minReturn': -0.02, 'maxReturn': 0.20},
+        {'name': 'China', 'targetAmount': 9000, 'targetAllocation': 15, 'minReturn': -0.08, 'maxReturn': 0.18}
+    ])
+]
+
+# Goal templates used to fill synthetic buckets in scale profiles
+PROFILE_GOAL_TEMPLATES = [
+    {'name': 'Core - Balanced', 'minReturn': 0.05, 'maxReturn': 0.12},
+    {'name': 'Megatrends', 'minReturn': 0.03, 'maxReturn': 0.15},
+    {'name': 'Tech', 'minReturn': -0.02, 'maxReturn': 0.20},
+    {'name': 'China', 'minReturn': -0.08, 'maxReturn': 0.18}
+]
+
+PROFILE_BUCKET_NAMES = [
+    'House Purchase', 'Retirement', 'Education', 'Emergency Fund',
+    'Travel', 'Wedding', 'Car', 'Renovation', 'Sabbatical', 'Legacy'
+]
+
+# Built-in scale profiles (see expand_profile for the synthetic bucket format)
+SCALE_PROFILES = {
+    'demo': {
+        'description': 'The two demo buckets used for screenshots (8 goals, 1-2 years)',
+        'buckets': DEMO_BUCKETS
+    },
+    'small': {
+        'description': '2 buckets x 2 goals, 6 months to 1 year',
+        'bucketCount': 2,
+        'goalsPerBucket': 2,
+        'horizonDays': [180, 365]
+    },
+    'realistic': {
+        'description': '5 buckets x 6 goals, 1 to 5 years',
+        'bucketCount': 5,
+        'goalsPerBucket': 6,
+        'horizonDays': [365, 730, 1095, 1825]
+    },
+    'large': {
+        'description': '20 buckets x 50 goals (1,000 goals), 3 to 5 years',
+        'bucketCount': 20,
+        'goalsPerBucket': 50,
+        'horizonDays': [1095, 1825]
+    },
+    'whale': {
+        'description': '10 buckets x 50 goals (500 goals), 10 years',
+        'bucketCount': 10,
+        'goalsPerBucket': 50,
+        'horizonDays': [3650]
+    }
+}
+
+def make_bucket_name(index):
+    """Name of the index-th (0-based) synthetic bucket"""
+    base = PROFILE_BUCKET_NAMES[index % len(PROFILE_BUCKET_NAMES)]
+    cycle = index // len(PROFILE_BUCKET_NAMES)
+    return base if cycle == 0 else f'{base} {cycle + 1}'
+
+def expand_profile(profile):
+    """
+    Expand a scale profile into bucket definitions (same shape as DEMO_BUCKETS)
+    
+    A profile either lists its buckets explicitly under 'buckets' (as
+    DEMO_BUCKETS does, or as dicts with name/horizonDays/goals) or describes a
+    synthetic N x M matrix:
+    
+        bucketCount: Number of buckets (N)
+        goalsPerBucket: Goals per bucket (M)
+        horizonDays: Horizon in days, or a list cycled across buckets
+        bucketTarget: Target amount per bucket (default 100000)
+    
+    Synthetic goals cycle through PROFILE_GOAL_TEMPLATES and split the bucket
+    target and allocation evenly. Expansion is deterministic so profiles can
+    be combined with --seed.
+    """
+    if 'buckets' in profile:
+        buckets = []
+        for bucket in profile['buckets']:
+            if isinstance(bucket, dict):
+                bucket = (bucket['name'], bucket['horizonDays'], bucket['goals'])
+            buckets.append(bucket)
+    else:
+        bucket_count = profile['bucketCount']
+        goals_per_bucket = profile['goalsPerBucket']
+        horizons = profile['horizonDays']
+        if not isinstance(horizons, list):
+            horizons = [horizons]
+        bucket_target = profile.get('bucketTarget', 100000)
+        
+        buckets = []
+        for bucket_index in range(bucket_count):
+            # Equal allocations, with the rounding remainder on the first goal
+            allocation = 100 // goals_per_bucket
+            goal_types = []
+            for goal_index in range(goals_per_bucket):
+                template = PROFILE_GOAL_TEMPLATES[goal_index % len(PROFILE_GOAL_TEMPLATES)]
+                cycle = goal_index // len(PROFILE_GOAL_TEMPLATES)
+                target_allocation = allocation + (100 - allocation * goals_per_bucket if goal_index == 0 else 0)
+                goal_types.append({
+                    'name': template['name'] if cycle == 0 else f"{template['name']} {cycle + 1}",
+                    'targetAmount': round(bucket_target * target_allocation / 100, 2),
+                    'targetAllocation': target_allocation,
+                    'minReturn': template['minReturn'],
+                    'maxReturn': template['maxReturn']
+                })
+            buckets.append((make_bucket_name(bucket_index), horizons[bucket_index % len(horizons)], goal_types))
+    
+    for bucket_name, time_horizon_days, goal_types in buckets:
+        if time_horizon_days < 1:
+            raise ValueError(f"Bucket '{bucket_name}' needs a time horizon of at least 1 day")
+        if not goal_types:
+            raise ValueError(f"Bucket '{bucket_name}' has no goals")
+    return buckets
+
+def load_profile(name_or_path):
+    """
+    Resolve --profile: a built-in profile name or a JSON file
+    
+    A JSON file may hold a single profile or a {"profiles": {name: profile}}
+    map, in which case the first profile is used.
+    
+    Returns:
+        Tuple of (profile name, profile dict)
+    """
+    if name_or_path in SCALE_PROFILES:
+        return name_or_path, SCALE_PROFILES[name_or_path]
+    if not os.path.isfile(name_or_path):
+        raise ValueError(f"Unknown profile '{name_or_path}' (built-in: {', '.join(SCALE_PROFILES)}; or pass a JSON file)")
+    with open(name_or_path) as f:
+        profile = json.load(f)
+    if 'profiles' in profile:
+        name, profile = next(iter(profile['profiles'].items()))
+        return name, profile
+    return profile.get('name', os.path.splitext(os.path.basename(name_or_path))[0]), profile
+
+def bucket_slug(bucket_name):
+    """Lower-case, hyphenated form of a bucket name used in IDs and file names"""
+    return bucket_name.lower().replace(' ', '-')
+
+def make_goal_id(bucket_name, index):
+    """Goal ID for the index-th (1-based) goal of a bucket"""
+    return f"mock-goal-{bucket_slug(bucket_name)}-{index}"
+
+def goal_rng(seed, goal_id):
+    """
+    Independent random stream for one goal
+    
+    The stream depends only on (seed, goalId), so a goal's data is the same
+    whichever process generates it and in whatever order.
+    """
+    digest = hashlib.sha256(f'{seed}:{goal_id}'.encode('utf-8')).digest()
+    return random.Random(int.from_bytes(digest[:8], 'big'))
+
+def create_goal(bucket_name, index, goal_type, time_horizon_days, rng=random, series_engine=generate_bumpy_time_series, as_of=None, calendar=None):
+    """
+    Create a single goal with time-series data
+    
+    Args:
+        bucket_name: Bucket prefix used in goal names and IDs
+        index: 1-based position of the goal within its bucket
+        goal_type: Goal definition (name, targetAmount, targetAllocation, minReturn, maxReturn)
+        time_horizon_days: Number of days of history
+        rng: Random source for this goal (see goal_rng)
+        series_engine: Time-series function (see SERIES_ENGINES)
+        as_of: Date the series ends on (defaults to now)
+        calendar: Shared TradingCalendar ending at as_of (defaults to every calendar day)
+    
+    Returns:
+        GoalRecord including its series columns
+    """
+    target_amount = goal_type['targetAmount']
+    # Add random variation from targets
+    # Range provides -8% to +10% variation for demo realism
+    variation = rng.uniform(0.92, 1.10)
+    final_investment = round(target_amount * variation, 2)
+    
+    # Calculate initial investment (before 25% contribution)
+    # We want: initial * (1 + growth_for_period) + 0.25 * amount_at_contribution ≈ target
+    # Simplified: Start with ~60-70% of target, grow it, then add 25% contribution
+    initial_investment = target_amount * rng.uniform(0.60, 0.70)
+    
+    # Generate return rate
+    min_return = goal_type.get('minReturn', -0.05)
+    max_return = goal_type.get('maxReturn', 0.15)
+    annual_return_rate = min_return + rng.random() * (max_return - min_return)
+    
+    # Generate time-series data with bumpy performance
+    goal_name = f"{bucket_name} - {goal_type['name']}"
+    series, contribution_date = series_engine(
+        initial_investment=initial_investment,
+        target_final_amount=final_investment,
+        annual_return_rate=annual_return_rate,
+        days=time_horizon_days,
+        goal_name=goal_name,
+        rng=rng,
+        as_of=as_of,
+        calendar=calendar
+    )
+    
+    return GoalRecord(
+        make_goal_id(bucket_name, index),
+        goal_name,
+        bucket_name,
+        'GENERAL_WEALTH_ACCUMULATION',
+        target_amount,
+        goal_type['targetAllocation'],
+        series,
+        contribution_date,
+        annual_return_rate
+    )
+
+def calculate_series_returns(series):
+    """
+    Ending balance, invested amount and simple return of a time series
+    
+    Args:
+        series: TimeSeriesColumns
+    
+    Returns:
+        Dict with endingBalance, cumulativeInvested, totalCumulativeReturn and simpleRateOfReturnPercent
+    """
+    ending_balance = series.amounts[-1]
+    cumulative_invested = series.invested[-1]
+    actual_return = ending_balance - cumulative_invested
+    return_percentage = actual_return / cumulative_invested if cumulative_invested > 0 else 0
+    return {
+        'endingBalance': ending_balance,  # Final balance including returns
+        'cumulativeInvested': cumulative_invested,  # Total amount invested
+        'totalCumulativeReturn': actual_return,
+        'simpleRateOfReturnPercent': return_percentage
+    }
+
+def iter_goal_specs(buckets=DEMO_BUCKETS):
+    """Yield (bucket name, index, goal definition, time horizon) for every goal, in output order"""
+    for bucket_name, time_horizon_days, goal_types in buckets:
+        for index, goal_type in enumerate(goal_types, 1):
+            yield bucket_name, index, goal_type, time_horizon_days
+
+def _create_goal_from_spec(spec, seed, engine, as_of, calendar=None):
+    """Process-pool task: build one goal from its spec with its own seeded stream"""
+    bucket_name, index, goal_type, time_horizon_days = spec
+    return create_goal(
+        bucket_name, index, goal_type, time_horizon_days,
+        rng=goal_rng(seed, make_goal_id(bucket_name, index)),
+        series_engine=resolve_series_engine(engine),
+        as_of=as_of,
+        calendar=calendar
+    )
+
+def iter_goals(engine='auto', seed=None, workers=1, as_of=None, buckets=DEMO_BUCKETS, cache=None, calendar=None):
+    """
+    Yield every goal (demo buckets by default) with its time-series data
+    
+    Every goal draws from its own stream derived from (seed, goalId), so the
+    output is identical whatever the worker count. Goals are yielded in spec
+    order even when generated in parallel.
+    
+    Args:
+        engine: Time-series engine name ('auto', 'numpy' or 'loop')
+        seed: Base seed (a random one is chosen when None)
+        workers: Number of worker processes (1 generates in-process)
+        as_of: Date every series ends on (defaults to now)
+        buckets: Bucket definitions (DEMO_BUCKETS or expand_profile output)
+        cache: Optional GenerationCache to load unchanged goals from
+        calendar: TradingCalendar ending at as_of (defaults to every calendar day)
+    """
+    resolve_series_engine(engine)  # Fail fast on a bad engine before starting workers
+    if seed is None:
+        seed = random.randrange(2**63)
+    as_of = as_of or datetime.now()
+    # One calendar for the whole run (workers rebuild it once, see TradingCalendar.__reduce__)
+    calendar = (calendar or trading_calendar(as_of)).for_span(buckets_span_days(buckets))
+    task = functools.partial(cache.goal if cache else _create_goal_from_spec, seed=seed, engine=engine, as_of=as_of,
+                             calendar=calendar)
+    specs = iter_goal_specs(buckets)
+    
+    count_points = lambda goal: len(goal.series)
+    unwrap = cache.unwrap if cache else iter
+    
+    if workers <= 1:
+        yield from STAGE_TIMER.timed_iter('series', unwrap(map(task, specs)), count_points)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from STAGE_TIMER.timed_iter('series', unwrap(executor.map(task, specs, chunksize=4)), count_points)
+
+# returnsTable.twr windows: (key, months back from the latest point, or 'ytd')
+RETURN_WINDOWS = [
+    ('oneMonthValue', 1),
+    ('threeMonthValue', 3),
+    ('sixMonthValue', 6),
+    ('ytdValue', 'ytd'),
+    ('oneYearValue', 12),
+    ('threeYearValue', 36)
+]
+
+def shift_months(day, months):
+    """Date `months` calendar months before `day`, clamped to the end of shorter months"""
+    month_index = day.year * 12 + day.month - 1 - months
+    year, month = divmod(month_index, 12)
+    month += 1
+    next_month = date(year + (month == 12), month % 12 + 1, 1)
+    return date(year, month, min(day.day, (next_month - timedelta(days=1)).day))
+
+def growth_prefix_products(amounts, invested):
+    """
+    Prefix products of contribution-adjusted daily growth factors
+    
+    Day i's factor is (amount_i - net flow_i) / amount_{i-1}, with the first
+    day measured against the initial investment, so prefix[e] / prefix[s] is
+    the time-weighted return over (s, e] and prefix[-1] the all-time TWR.
+    """
+    if np is not None:
+        amounts = np.asarray(amounts, dtype=float)
+        invested = np.asarray(invested, dtype=float)
+        factors = np.ones(len(amounts))
+        factors[0] = amounts[0] / invested[0] if invested[0] > 0 else 1.0
+        previous = amounts[:-1]
+        adjusted = amounts[1:] - np.diff(invested)
+        factors[1:] = np.divide(adjusted, previous, out=np.ones(len(previous)), where=previous > 0)
+        return np.cumprod(factors).tolist()
+    
+    factors = [amounts[0] / invested[0] if invested[0] > 0 else 1.0]
+    for i in range(1, len(amounts)):
+        previous = amounts[i - 1]
+        flow = invested[i] - invested[i - 1]
+        factors.append((amounts[i] - flow) / previous if previous > 0 else 1.0)
+    return list(accumulate(factors, operator.mul))
+
+def annualised_irr(cash_flows):
+    """
+    Annualised money-weighted return for (ordinal, amount) cash flows
+    
+    Outflows (investments) are negative and the final balance positive.
+    Solved by bisection, which is cheap because a goal only has a handful
+    of flows. Returns None when no rate balances the flows.
+    """
+    start = cash_flows[0][0]
+    flows = [((ordinal - start) / 365, amount) for ordinal, amount in cash_flows]
+    
+    def npv(rate):
+        return sum(amount / (1 + rate) ** years for years, amount in flows)
+    
+    low, high = -0.9999, 100.0
+    npv_low, npv_high = npv(low), npv(high)
+    if npv_low * npv_high > 0:
+        return None
+    for _ in range(200):
+        mid = (low + high) / 2
+        npv_mid = npv(mid)
+        if abs(npv_mid) < 1e-9 or high - low < 1e-12:
+            break
+        if (npv_mid > 0) == (npv_low > 0):
+            low, npv_low = mid, npv_mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+def compute_returns_table(series):
+    """
+    Compute returnsTable (TWR windows and annualised IRR) from a goal's series
+    
+    Growth factors are chained into prefix products once, and window starts
+    are located with O(1) lookups in the series' TradingCalendar (ordinal
+    arithmetic on other daily series, bisection otherwise), so each window
+    costs a lookup and a division rather than a rescan of the series.
+    Window semantics follow the userscript's getWindowStartDate: calendar
+    months/years back from the latest point (YTD: 1 January of its year),
+    starting at the last point on or before that date. Windows longer than
+    the history fall back to since-inception.
+    
+    Args:
+        series: TimeSeriesColumns
+    
+    Returns:
+        Dict with 'twr' window values and 'annualisedIrr' (decimal fractions)
+    """
+    amounts = series.amounts
+    invested = series.invested
+    prefix = growth_prefix_products(amounts, invested)
+    count = len(prefix)
+    
+    ordinals = series.ordinal_range()
+    first_ordinal = ordinals[0]
+    last_date = date.fromordinal(ordinals[-1])
+    calendar = series.calendar
+    
+    def position_on_or_before(ordinal):
+        if calendar is not None:
+            return min(calendar.position_on_or_before(ordinal) - calendar.position_on_or_before(first_ordinal), count - 1)
+        if isinstance(ordinals, range):
+            # Daily series: a date's position is its offset from the first point
+            return min(ordinal - first_ordinal, count - 1)
+        return bisect.bisect_right(ordinals, ordinal) - 1
+    
+    all_time = prefix[-1] - 1
+    twr = {'allTimeValue': all_time}
+    for key, months in RETURN_WINDOWS:
+        start_date = date(last_date.year, 1, 1) if months == 'ytd' else shift_months(last_date, months)
+        position = position_on_or_before(start_date.toordinal())
+        twr[key] = prefix[-1] / prefix[position] - 1 if position >= 0 else all_time
+    
+    # Money-weighted flows: initial investment, each contribution, final balance
+    cash_flows = [(first_ordinal, -invested[0])]
+    for position in range(1, count):
+        flow = invested[position] - invested[position - 1]
+        if flow:
+            cash_flows.append((ordinals[position], -flow))
+    cash_flows.append((last_date.toordinal(), amounts[-1]))
+    irr = annualised_irr(cash_flows) if invested[0] > 0 and last_date.toordinal() > first_ordinal else None
+    
+    return {
+        'twr': twr,
+        'annualisedIrr': {
+            'allTimeValue': irr if irr is not None else all_time
+        }
+    }
+
+def build_goal_responses(goal):
+    """
+    Build the API response records for a single goal
+    
+    Args:
+        goal: GoalRecord from create_goal
+    
+    Returns:
+        Tuple of (performance, investible, summary, performanceTimeSeries entry).
+        The entry's timeSeries.data is the goal's TimeSeriesColumns; it is
+        expanded into point dicts when serialized.
+    """
+    # Basic performance data
+    performance = {
+        'goalId': goal.goal_id,
+        'totalCumulativeReturn': {'amount': goal.total_cumulative_return},
+        'simpleRateOfReturnPercent': goal.simple_rate_of_return_percent,
+        'totalInvestmentValue': {'amount': goal.ending_balance}
+    }
+    
+    # Investible data with target information
+    # Note: totalInvestmentAmount in API is misnamed - it's actually ending balance
+    investible = {
+        'goalId': goal.goal_id,
+        'goalName': goal.goal_name,
+        'investmentGoalType': goal.goal_type,
+        'totalInvestmentAmount': {
+            'display': {'amount': goal.ending_balance}
+        },
+        'targetAmount': goal.target_amount,
+        'targetAllocation': goal.target_allocation
+    }
+    
+    # Summary data
+    summary = {
+        'goalId': goal.goal_id,
+        'goalName': goal.goal_name,
+        'investmentGoalType': goal.goal_type
+    }
+    
+    # Time-series performance data (for charts)
+    # TWR windows and annualised IRR are computed from the generated series
+    returns_table = compute_returns_table(goal.series)
+    
+    # Calculate fees (small percentage of investment for realism)
+    access_fee = goal.cumulative_invested * 0.005  # 0.5% access fee
+    trailer_fee_rebate = goal.cumulative_invested * 0.002  # 0.2% trailer fee rebate
+    
+    time_series = {
+        'timeSeries': {
+            'data': goal.series
+        },
+        'returnsTable': returns_table,
+        'gainOrLossTable': {
+            'netInvestment': {
+                'allTimeValue': goal.cumulative_invested
+            },
+            'accessFeeCharged': {
+                'allTimeValue': access_fee
+            },
+            'trailerFeeRebates': {
+                'allTimeValue': trailer_fee_rebate
+            }
+        },
+        'totalCumulativeReturnPercent': goal.simple_rate_of_return_percent,
+        'totalCumulativeReturnAmount': goal.total_cumulative_return,
+        'contributionDate': goal.contribution_date,
+        'annualReturnRate': goal.annual_return_rate,
+        'cumulativeInvested': goal.cumulative_invested
+    }
+    
+    return performance, investible, summary, time_series
+
+def generate_mock_data(engine='auto', seed=None, workers=1, as_of=None, buckets=DEMO_BUCKETS, cache=None, calendar=None):
+    """Generate mock API data (House Purchase and Retirement buckets by default)
+    
+    Args:
+        engine: Time-series engine name ('auto', 'numpy' or 'loop')
+        seed: Base seed for the per-goal random streams (random when None)
+        workers: Number of worker processes generating goals
+        as_of: Date every series ends on (defaults to now)
+        buckets: Bucket definitions (DEMO_BUCKETS or expand_profile output)
+        cache: Optional GenerationCache to load unchanged goals from
+        calendar: TradingCalendar ending at as_of (defaults to every calendar day)
+    """
+    as_of = as_of or datetime.now()
+    # Create API response structures matching the expected format
+    performance_data = []
+    investible_data = []
+    summary_data = []
+    performance_time_series = {}  # NEW: Per-goal time-series data
+    
+    for goal in iter_goals(engine, seed=seed, workers=workers, as_of=as_of, buckets=buckets, cache=cache, calendar=calendar):
+        with STAGE_TIMER.stage('assemble'):
+            performance, investible, summary, time_series = build_goal_responses(goal)
+        performance_data.append(performance)
+        investible_data.append(investible)
+        summary_data.append(summary)
+        performance_time_series[goal.goal_id] = time_series
+    
+    return {
+        'performance': performance_data,
+        'investible': investible_data,
+        'summary': summary_data,
+        'performanceTimeSeries': performance_time_series
+    }
+
+def summarize_time_series(time_series):
+    """
+    Return (start date, end date, point count) for a performanceTimeSeries entry
+    
+    Entries returned by write_mock_data_streaming no longer hold their points,
+    so the bounds recorded while streaming are used instead.
+    """
+    bounds = time_series.get('timeSeriesBounds')
+    if bounds:
+        return bounds['startDate'], bounds['endDate'], bounds['numPoints']
+    ts_data = time_series.get('timeSeries', {}).get('data', [])
+    start_date = ts_data[0]['date'] if ts_data else 'N/A'
+    end_date = ts_data[-1]['date'] if ts_data else 'N/A'
+    return start_date, end_date, len(ts_data)
+
+# Stand-in for compact series while the rest of a value is encoded (see _json_dumps)
+SERIES_PLACEHOLDER = re.compile(r'^( *)(.*?)"\\u0000series:(\d+)"', re.MULTILINE)
+
+def _json_dumps(value, indent, level=0):
+    """
+    Serialize a value as it would appear `level` containers deep inside json.dump output
+    
+    TimeSeriesColumns are encoded as placeholders and then swapped for their
+    own (much faster) to_json rendering, so no point dicts are built.
+    """
+    series = []
+    
+    def placeholder(obj):
+        if not isinstance(obj, TimeSeriesColumns):
+            raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+        series.append(obj)
+        return f'\x00series:{len(series) - 1}'
+    
+    if indent is None:
+        text = json.dumps(value, separators=(',', ':'), default=placeholder)
+    else:
+        text = json.dumps(value, indent=indent, default=placeholder).replace('\n', '\n' + ' ' * (indent * level))
+    if not series:
+        return text
+    
+    def render(match):
+        depth = len(match.group(1)) // indent if indent else 0
+        return match.group(1) + match.group(2) + series[int(match.group(3))].to_json(indent, depth)
+    
+    return SERIES_PLACEHOLDER.sub(render, text)
+
+def generator_metadata(profile_name, engine, seed, as_of, calendar=None):
+    """
+    The 'generator' record of a mock data document: what is needed to write it again
+    
+    The engine is resolved ('auto' becomes numpy or loop) because the engines
+    draw differently: a seed only identifies a fixture together with its engine.
+    """
+    metadata = {
+        'profile': profile_name,
+        'engine': resolve_engine_name(engine),
+        'seed': seed,
+        'asOf': as_of.isoformat()
+    }
+    if calendar is not None and not calendar.is_daily:
+        metadata['calendar'] = calendar.options()
+    return metadata
+
+def append_metadata(seed, as_of, calendar=None):
+    """An entry of the 'generator' record's appends list (one per --append run)"""
+    record = {'seed': seed, 'asOf': as_of.isoformat()}
+    if calendar is not None and not calendar.is_daily:
+        record['calendar'] = calendar.options()
+    return record
+
+def generator_command(metadata):
+    """
+    Command line options that rewrite a document from its 'generator' record
+    
+    Holidays are only recorded as dates, so --holidays names where in the
+    record its file's dates are kept.
+    """
+    def calendar_options(record, where):
+        calendar = record.get('calendar') or {}
+        options = ' --skip-weekends' if calendar.get('skipWeekends') else ''
+        if calendar.get('holidays'):
+            options += f" --holidays <the {len(calendar['holidays'])} dates in {where}.calendar.holidays>"
+        return options
+    
+    command = f"--engine {metadata['engine']} --seed {metadata['seed']} --as-of {metadata['asOf'][:10]}"
+    command += calendar_options(metadata, 'generator')
+    for index, append in enumerate(metadata.get('appends', [])):
+        command += f", then --append --seed {append['seed']} --as-of {append['asOf'][:10]}"
+        command += calendar_options(append, f'generator.appends[{index}]')
+    return command
+
+def write_mock_data(mock_data, output_file, indent=2):
+    """
+    Write a fully built mock data document (indent=None writes compact JSON)
+    
+    Output matches json.dump; performanceTimeSeries is written goal by goal
+    so compact series are only rendered one at a time.
+    """
+    newline = '' if indent is None else '\n'
+    pad = '' if indent is None else ' ' * indent
+    key_sep = ':' if indent is None else ': '
+    with open(output_file, 'w') as f:
+        f.write('{')
+        for position, (key, value) in enumerate(mock_data.items()):
+            f.write((',' if position else '') + newline + pad + json.dumps(key) + key_sep)
+            if key != 'performanceTimeSeries' or not value:
+                f.write(_json_dumps(value, indent, level=1))
+                continue
+            f.write('{')
+            for index, (goal_id, time_series) in enumerate(value.items()):
+                f.write((',' if index else '') + newline + pad * 2 + json.dumps(goal_id) + key_sep)
+                f.write(_json_dumps(time_series, indent, level=2))
+            f.write(newline + pad + '}')
+        f.write((newline if mock_data else '') + '}')
+
+def strip_series_points(time_series):
+    """Drop a performanceTimeSeries entry's points in place, recording their bounds in timeSeriesBounds"""
+    start_date, end_date, num_points = summarize_time_series(time_series)
+    time_series['timeSeries'] = {'data': []}
+    time_series['timeSeriesBounds'] = {'startDate': start_date, 'endDate': end_date, 'numPoints': num_points}
+    return time_series
+
+def write_mock_data_streaming(goals, output_file, indent=2, columnar_writer=None, metadata=None):
+    """
+    Stream goals into a mock data JSON file as they are generated
+    
+    Each goal's timeSeries.data array is written as soon as the goal is
+    generated and then dropped, so peak memory is bounded by one goal rather
+    than the whole portfolio. Because performance/investible/summary need the
+    final balances, performanceTimeSeries is written first and the (small)
+    goal lists follow it; JSON consumers are unaffected by the key order.
+    
+    Args:
+        goals: Iterable of GoalRecords (see iter_goals)
+        output_file: Destination path
+        indent: JSON indent, or None for compact output
+        columnar_writer: Optional ColumnarTimeSeriesWriter that also receives each goal
+        metadata: Optional 'generator' record (see generator_metadata), written first
+    
+    Returns:
+        Mock data dict without series points (timeSeries.data is replaced by
+        timeSeriesBounds) for summaries and the bucket configuration doc
+    """
+    newline = '' if indent is None else '\n'
+    pad = '' if indent is None else ' ' * indent
+    key_sep = ':' if indent is None else ': '
+    
+    performance_data = []
+    investible_data = []
+    summary_data = []
+    performance_time_series = {}
+    
+    with open(output_file, 'w') as f:
+        f.write('{')
+        if metadata is not None:
+            f.write(newline + pad + '"generator"' + key_sep + _json_dumps(metadata, indent, level=1) + ',')
+        f.write(newline + pad + '"performanceTimeSeries"' + key_sep + '{')
+        for index, goal in enumerate(goals):
+            with STAGE_TIMER.stage('assemble'):
+                performance, investible, summary, time_series = build_goal_responses(goal)
+            performance_data.append(performance)
+            investible_data.append(investible)
+            summary_data.append(summary)
+            
+            with STAGE_TIMER.stage('json_write'):
+                f.write((',' if index else '') + newline + pad * 2)
+                f.write(json.dumps(goal.goal_id) + key_sep + _json_dumps(time_series, indent, level=2))
+            if columnar_writer:
+                with STAGE_TIMER.stage('columnar_write'):
+                    columnar_writer.add(goal.goal_id, time_series)
+            
+            # Keep everything except the points themselves
+            performance_time_series[goal.goal_id] = strip_series_points(time_series)
+        
+        with STAGE_TIMER.stage('json_write'):
+            f.write((newline + pad if performance_time_series else '') + '}')
+            for key, records in (('performance', performance_data), ('investible', investible_data), ('summary', summary_data)):
+                f.write(',' + newline + pad + json.dumps(key) + key_sep + _json_dumps(records, indent, level=1))
+            f.write(newline + '}')
+    
+    return {
+        'performance': performance_data,
+        'investible': investible_data,
+        'summary': summary_data,
+        'performanceTimeSeries': performance_time_series
+    }
+
+class LRUCache:
+    """
+    Least-recently-used cache bounded by total size, with hit/miss counters
+    
+    size_of gives the size of a value (1 by default, so max_size bounds the
+    entry count). Least recently used entries are evicted until the total is
+    within max_size again; a value larger than max_size is not retained.
+    """
+    
+    def __init__(self, max_size, size_of=None):
+        self.max_size = max_size
+        self.size_of = size_of or (lambda value: 1)
+        self.entries = OrderedDict()  # key -> (value, size)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __contains__(self, key):
+        return key in self.entries
+    
+    def get_or_create(self, key, factory):
+        """Cached value for key, calling factory() and caching its result on a miss"""
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return cached[0]
+        self.misses += 1
+        value = factory()
+        self.put(key, value)
+        return value
+    
+    def put(self, key, value):
+        """Insert or replace key as the most recently used entry"""
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous[1]
+        size = self.size_of(value)
+        self.entries[key] = (value, size)
+        self.size += size
+        while self.size > self.max_size and self.entries:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+    
+    def format_stats(self, unit='entries'):
+        """One-line hit/miss summary"""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups * 100 if lookups else 0
+        return (f"{self.hits:,} hits, {self.misses:,} misses ({hit_rate:.1f}% hit rate), "
+                f"{self.evictions:,} evictions, {len(self.entries):,} cached ({self.size:,} {unit})")
+
+# Points held by a LazyTimeSeries cache unless told otherwise
+DEFAULT_SERIES_CACHE_POINTS = 2_000_000
+
+class LazyTimeSeries:
+    """
+    performanceTimeSeries entries regenerated on demand from (seed, goalId, profile)
+    
+    Every goal draws from goal_rng(seed, goalId), so regenerating one goal
+    reproduces exactly the entry a full run with the same profile, seed,
+    engine and as-of date writes. Regenerated entries are held in an LRUCache
+    bounded by total points, so memory follows the working set rather than
+    the size of the portfolio.
+    
+    Mock data written with --lazy-series records what is needed under
+    'lazySeries'; use LazyTimeSeries.from_source(mock_data['lazySeries']).
+    """
+    
+    def __init__(self, profile, seed, engine='auto', as_of=None, max_points=DEFAULT_SERIES_CACHE_POINTS, profile_name=None,
+                 calendar=None):
+        self.profile = profile
+        self.profile_name = profile_name
+        self.seed = seed
+        self.engine = resolve_engine_name(engine)
+        self.as_of = as_of or datetime.now()
+        buckets = expand_profile(profile)
+        self.calendar = (calendar or trading_calendar(self.as_of)).for_span(buckets_span_days(buckets))
+        self.specs = {make_goal_id(spec[0], spec[1]): spec for spec in iter_goal_specs(buckets)}
+        self.cache = LRUCache(max_points, size_of=lambda entry: len(entry['timeSeries']['data']))
+    
+    @classmethod
+    def from_source(cls, source, max_points=DEFAULT_SERIES_CACHE_POINTS):
+        """Build from the 'lazySeries' record of a mock data document"""
+        as_of = datetime.fromisoformat(source['asOf'])
+        calendar_options = source.get('calendar') or {}
+        calendar = trading_calendar(as_of, skip_weekends=calendar_options.get('skipWeekends', False),
+                                    holidays=calendar_options.get('holidays', ()))
+        return cls(source['definition'], source['seed'], engine=source['engine'], as_of=as_of,
+                   max_points=max_points, profile_name=source.get('profile'), calendar=calendar)
+    
+    def source(self):
+        """The 'lazySeries' record that recreates this instance"""
+        source = {
+            'profile': self.profile_name,
+            'definition': self.profile,
+            'seed': self.seed,
+            'engine': self.engine,
+            'asOf': self.as_of.isoformat()
+        }
+        if not self.calendar.is_daily:
+            source['calendar'] = self.calendar.options()
+        return source
+    
+    def __len__(self):
+        return len(self.specs)
+    
+    def __contains__(self, goal_id):
+        return goal_id in self.specs
+    
+    def goal_ids(self):
+        return list(self.specs)
+    
+    def get(self, goal_id):
+        """
+        performanceTimeSeries entry for a goal, regenerated on a cache miss
+        
+        Raises:
+            KeyError: goal_id is not part of the profile
+        """
+        spec = self.specs[goal_id]
+        # Entries are cached with compact columns and expanded per request
+        return expand_series_entry(self.cache.get_or_create(goal_id, lambda: self._generate(spec)))
+    
+    def _generate(self, spec):
+        goal = _create_goal_from_spec(spec, self.seed, self.engine, self.as_of, self.calendar)
+        return build_goal_responses(goal)[3]
+
+def generate_lazy_mock_data(profile, engine='auto', seed=None, workers=1, as_of=None, profile_name=None, cache=None, calendar=None):
+    """
+    Generate goal metadata only, leaving every series to be regenerated on demand
+    
+    Series are generated once to derive balances and returns, then dropped:
+    performanceTimeSeries entries keep their figures and timeSeriesBounds,
+    and the document gains a 'lazySeries' record for LazyTimeSeries.
+    
+    Args:
+        profile: Scale profile definition (see expand_profile)
+        engine: Time-series engine name ('auto', 'numpy' or 'loop')
+        seed: Base seed (a random one is chosen and recorded when None)
+        workers: Number of worker processes generating goals
+        as_of: Date every series ends on (defaults to now)
+        profile_name: Profile name recorded with the source
+        cache: Optional GenerationCache to load unchanged goals from
+        calendar: TradingCalendar ending at as_of (defaults to every calendar day)
+    """
+    lazy_series = LazyTimeSeries(profile, seed if seed is not None else random.randrange(2**63),
+                                 engine=engine, as_of=as_of, max_points=0, profile_name=profile_name,
+                                 calendar=calendar)
+    mock_data = {
+        'performance': [],
+        'investible': [],
+        'summary': [],
+        'performanceTimeSeries': {}
+    }
+    goals = iter_goals(lazy_series.engine, seed=lazy_series.seed, workers=workers,
+                       as_of=lazy_series.as_of, buckets=expand_profile(profile), cache=cache,
+                       calendar=lazy_series.calendar)
+    for goal in goals:
+        with STAGE_TIMER.stage('assemble'):
+            performance, investible, summary, time_series = build_goal_responses(goal)
+        mock_data['performance'].append(performance)
+        mock_data['investible'].append(investible)
+        mock_data['summary'].append(summary)
+        mock_data['performanceTimeSeries'][goal.goal_id] = strip_series_points(time_series)
+    mock_data['lazySeries'] = lazy_series.source()
+    return mock_data
+
+def extend_time_series(data, annual_return_rate, as_of, rng=random, calendar=None):
+    """
+    Append the trading days missing between a series' last point and as_of
+    
+    Continues the same model as generate_bumpy_time_series (baseline growth,
+    weekday pattern, normal and occasional high volatility) from the last
+    stored balance. No contribution or correction events are added, and
+    cumulative investment carries forward unchanged.
+    
+    Args:
+        data: Existing time-series points (modified in place)
+        annual_return_rate: Goal's expected annual return rate (decimal)
+        as_of: Date the extended series should end before (its last point is the previous day, as in generation)
+        rng: Random source for the new days
+        calendar: TradingCalendar ending at as_of whose rules pick the new days (defaults to every calendar day)
+    
+    Returns:
+        Number of points appended
+    """
+    if not data:
+        return 0
+    end_ordinal = _as_ordinal(as_of or datetime.now())
+    first_new_ordinal = date.fromisoformat(data[-1]['date']).toordinal() + 1
+    if first_new_ordinal >= end_ordinal:
+        return 0
+    calendar = (calendar or trading_calendar(end_ordinal)).for_span(end_ordinal - first_new_ordinal)
+    current_amount = data[-1]['amount']
+    cumulative_investment = data[-1]['cumulativeNetInvestmentAmount']
+    daily_growth_rate = annual_return_rate / 365
+    
+    appended = 0
+    previous_ordinal = first_new_ordinal - 1
+    for position in range(calendar.position_on_or_after(first_new_ordinal), len(calendar.ordinals)):
+        week_day = calendar.weekdays[position]
+        if week_day in [2, 3]:  # Wednesday, Thursday
+            weekly_factor = rng.uniform(0.997, 0.999)
+        elif week_day in [0, 4]:  # Monday, Friday
+            weekly_factor = rng.uniform(1.001, 1.003)
+        else:
+            weekly_factor = 1.0
+        
+        # About 5% of days are high volatility, as in the generator
+        if rng.random() < 0.05:
+            daily_volatility = rng.uniform(-0.02, 0.02)
+        else:
+            daily_volatility = rng.uniform(-0.006, 0.006)
+        
+        # Growth since the previous point (the stored one for the first new day)
+        ordinal = calendar.ordinals[position]
+        gap = ordinal - previous_ordinal
+        current_amount += current_amount * (daily_growth_rate if gap == 1 else (1 + daily_growth_rate) ** gap - 1)
+        current_amount = max(current_amount * (1 + daily_volatility) * weekly_factor, 0)
+        data.append({
+            'date': calendar.dates[position],
+            'amount': round(current_amount, 2),
+            'cumulativeNetInvestmentAmount': cumulative_investment
+        })
+        appended += 1
+        previous_ordinal = ordinal
+    return appended
+
+def goal_from_records(entry):
+    """Rebuild a create_goal-style GoalRecord from a build_goal_index entry"""
+    investible = entry['investible']
+    perf_ts = entry['timeSeries']
+    return GoalRecord(
+        investible['goalId'],
+        investible['goalName'],
+        investible['goalName'].split(' - ')[0],
+        investible['investmentGoalType'],
+        investible.get('targetAmount', 0),
+        investible.get('targetAllocation', 0),
+        TimeSeriesColumns.from_points(perf_ts['timeSeries']['data']),
+        perf_ts.get('contributionDate'),
+        perf_ts.get('annualReturnRate', 0.0)
+    )
+
+def append_mock_data(mock_data, as_of=None, seed=None, calendar=None):
     """
-    Generate realistic time-series data with market volatility and a contribution event
+    Extend every goal in existing mock data up to as_of and refresh its figures
+    
+    Only the missing days are generated; endingBalance, returns and the
+    returnsTable/gainOrLossTable figures are then recomputed from the extended
+    series. Records are updated in place.
     
     Args:
-        initial_investment: Starting investment amount (should be target * 0.6 to allow for growth + 25% contribution)
-        target_final_amount: Desired ending amount (after growth and contribution)
-        annual_return_rate: Expected annual return rate (decimal)
-        days: Number of days to generate (365 for House Purchase, 730 for Retirement)
-        goal_name: Name of the goal for debugging
+        mock_data: Loaded mock data (full timeSeries.data required)
+        as_of: Date the series should end on (defaults to now)
+        seed: Base seed; new days for a goal draw from (seed, goalId, last date)
+        calendar: TradingCalendar ending at as_of (defaults to every calendar day)
     
     Returns:
-        List of data points with date, amount, and cumulativeNetInvestmentAmount
+        Total number of points appended
     """
-    data = []
-    current_amount = initial_investment
-    cumulative_investment = initial_investment
-    contribution_made = False
-    contribution_date = None
+    as_of = as_of or datetime.now()
+    if seed is None:
+        seed = random.randrange(2**63)
+    calendar = calendar or trading_calendar(as_of)
     
-    # Calculate contribution timing (random day in final 90 days)
-    contribution_day = days - random.randint(30, 90)
+    appended = 0
+    for goal_id, entry in build_goal_index(mock_data).items():
+        if not entry['performance'] or not entry['timeSeries'].get('timeSeries', {}).get('data'):
+            continue
+        data = entry['timeSeries']['timeSeries']['data']
+        rng = goal_rng(seed, f"{goal_id}@{data[-1]['date']}")
+        with STAGE_TIMER.stage('series'):
+            added = extend_time_series(data, entry['timeSeries'].get('annualReturnRate', 0.0), as_of, rng=rng, calendar=calendar)
+        if not added:
+            continue
+        appended += added
+        
+        with STAGE_TIMER.stage('assemble', points=added):
+            performance, investible, summary, time_series = build_goal_responses(goal_from_records(entry))
+            entry['performance'].update(performance)
+            entry['investible'].update(investible)
+            entry['timeSeries'].update(time_series)
+    return appended
+
+# Columnar time-series file (.gpvts)
+#
+# Layout (little-endian):
+#   header    <4sHHQQ: magic b'GPVT', version, flags, manifest offset, manifest length
+#   columns   per goal: amount float64[n], cumulativeNetInvestmentAmount float64[n],
+#             then int32[n] date ordinals (padded to 8 bytes) only when dates are not a fixed daily step
+#   manifest  UTF-8 JSON: {"goals": [{goalId, startDate, stepDays, numPoints, offset, datesOffset, entry}]}
+#             where entry is the performanceTimeSeries entry without timeSeries.data
+#
+# Columns are 8-byte aligned so a reader can mmap the file and view them in place.
+COLUMNAR_MAGIC = b'GPVT'
+COLUMNAR_VERSION = 1
+COLUMNAR_HEADER = struct.Struct('<4sHHQQ')
+
+def _le_bytes(values, typecode):
+    """Pack values into little-endian bytes"""
+    packed = array(typecode, values)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed.tobytes()
+
+class ColumnarTimeSeriesWriter:
+    """
+    Write performanceTimeSeries entries to a columnar .gpvts file goal by goal
     
-    # Calculate when contribution will happen - we need to plan our growth
-    # Target: current_amount_at_contribution * 1.25 * (1 + remaining_growth) ≈ target_final_amount
-    days_after_contribution = days - contribution_day
+    Usage:
+        with ColumnarTimeSeriesWriter(path) as writer:
+            writer.add(goal_id, time_series_entry)
+    """
     
-    # Pre-generate volatility events for realism
-    # Market corrections: 1-2 drawdowns that recover
-    num_corrections = 1 if days < 500 else 2
-    correction_days = random.sample(range(days//4, days - 100), k=num_corrections)
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.goals = []
+        self._file = open(output_file, 'wb')
+        self._file.write(COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, 0, 0, 0))
     
-    # High volatility days (about 5% of days)
-    high_volatility_days = set(random.sample(range(days), k=int(days * 0.05)))
+    def __enter__(self):
+        return self
     
-    start_date = datetime.now() - timedelta(days=days)
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
     
-    for day in range(days):
-        current_date = start_date + timedelta(days=day)
+    def add(self, goal_id, time_series):
+        """Append one goal's columns; timeSeries.data is read but not modified"""
+        data = time_series['timeSeries']['data']
+        if not isinstance(data, TimeSeriesColumns):
+            data = TimeSeriesColumns.from_points(data)
+        ordinals = data.ordinal_range()
+        # A fixed step lets readers rebuild dates from the start date alone
+        step_days = ordinals[1] - ordinals[0] if len(ordinals) > 1 else 1
+        fixed_step = data.ordinals is None or all(b - a == step_days for a, b in zip(ordinals, ordinals[1:]))
         
-        # Baseline daily growth
-        daily_growth_rate = annual_return_rate / 365
-        daily_growth = current_amount * daily_growth_rate
+        offset = self._file.tell()
+        self._file.write(_le_bytes(data.amounts, 'd'))
+        self._file.write(_le_bytes(data.invested, 'd'))
+        dates_offset = None
+        if not fixed_step:
+            dates_offset = self._file.tell()
+            self._file.write(_le_bytes(ordinals, 'i'))
+            if len(ordinals) % 2:
+                self._file.write(b'\0' * 4)
         
-        # Weekly pattern (markets tend to dip mid-week)
-        week_day = day % 7
-        if week_day in [2, 3]:  # Wednesday, Thursday
-            weekly_factor = random.uniform(0.997, 0.999)
-        elif week_day in [0, 4]:  # Monday, Friday
-            weekly_factor = random.uniform(1.001, 1.003)
-        else:
-            weekly_factor = 1.0
+        entry = {key: value for key, value in time_series.items() if key not in ('timeSeries', 'timeSeriesBounds')}
+        self.goals.append({
+            'goalId': goal_id,
+            'startDate': date.fromordinal(ordinals[0]).isoformat() if len(data) else None,
+            'stepDays': step_days if fixed_step else None,
+            'numPoints': len(data),
+            'offset': offset,
+            'datesOffset': dates_offset,
+            'entry': entry
+        })
+    
+    def close(self):
+        """Write the manifest and patch the header"""
+        if self._file.closed:
+            return
+        manifest = json.dumps({'goals': self.goals}, separators=(',', ':')).encode('utf-8')
+        manifest_offset = self._file.tell()
+        self._file.write(manifest)
+        self._file.seek(0)
+        self._file.write(COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, 0, manifest_offset, len(manifest)))
+        self._file.close()
+
+def write_columnar_time_series(performance_time_series, output_file):
+    """Write a performanceTimeSeries dict to a columnar .gpvts file"""
+    with ColumnarTimeSeriesWriter(output_file) as writer:
+        for goal_id, time_series in performance_time_series.items():
+            writer.add(goal_id, time_series)
+
+class ColumnarTimeSeries:
+    """
+    Memory-mapped reader for .gpvts files
+    
+    Opening a file only parses the (small) manifest; a goal's columns are
+    viewed in place and expanded into the JSON shape only when requested.
+    
+    Usage:
+        with ColumnarTimeSeries(path) as series:
+            entry = series.get('mock-goal-retirement-1')  # same shape as performanceTimeSeries[goalId]
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _flags, manifest_offset, manifest_length = COLUMNAR_HEADER.unpack_from(self._mmap, 0)
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError(f'{path} is not a columnar time-series file')
+        if version != COLUMNAR_VERSION:
+            raise ValueError(f'{path} has unsupported version {version} (expected {COLUMNAR_VERSION})')
+        manifest = json.loads(self._mmap[manifest_offset:manifest_offset + manifest_length])
+        self._goals = {goal['goalId']: goal for goal in manifest['goals']}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def __len__(self):
+        return len(self._goals)
+    
+    def __contains__(self, goal_id):
+        return goal_id in self._goals
+    
+    def goal_ids(self):
+        """Goal IDs in file order"""
+        return list(self._goals)
+    
+    def _column(self, offset, count, typecode):
+        values = memoryview(self._mmap)[offset:offset + count * array(typecode).itemsize].cast(typecode)
+        if sys.byteorder != 'little':
+            swapped = array(typecode, values)
+            swapped.byteswap()
+            return swapped
+        return values
+    
+    def columns(self, goal_id):
+        """
+        Return (dates, amounts, invested) for a goal
         
-        # Normal daily volatility
-        if day in high_volatility_days:
-            daily_volatility = random.uniform(-0.02, 0.02)  # ±2%
+        amounts and invested are zero-copy float64 views into the file;
+        dates is a list of YYYY-MM-DD strings.
+        """
+        goal = self._goals[goal_id]
+        count = goal['numPoints']
+        amounts = self._column(goal['offset'], count, 'd')
+        invested = self._column(goal['offset'] + count * 8, count, 'd')
+        if goal['datesOffset'] is None:
+            start = date.fromisoformat(goal['startDate']).toordinal() if count else 0
+            ordinals = range(start, start + count * goal['stepDays'], goal['stepDays'])
         else:
-            daily_volatility = random.uniform(-0.006, 0.006)  # ±0.6%
-        
-        # Market corrections (gradual drawdown and recovery)
-        correction_impact = 0.0  # Additive impact on growth
-        for correction_start in correction_days:
-            if correction_start <= day < correction_start + 40:
-                days_since = day - correction_start
-                if days_since < 7:
-                    # Drawdown phase: lose up to 7% total over 7 days
-                    correction_impact -= 0.01  # -1% per day for 7 days = -7% total
-                else:
-                    # Recovery phase: gradually recover over 33 days
-                    recovery_days = days_since - 7
-                    daily_recovery = 0.07 / 33  # Recover the 7% loss over 33 days
-                    correction_impact += daily_recovery
-        
-        # Apply growth and volatility
-        current_amount += daily_growth
-        current_amount *= (1 + daily_volatility + correction_impact) * weekly_factor
-        
-        # Contribution event (25% addition in final 90 days)
-        if day == contribution_day and not contribution_made:
-            contribution_amount = current_amount * 0.25
-            current_amount += contribution_amount
-            cumulative_investment += contribution_amount
-            contribution_made = True
-            contribution_date = current_date.strftime('%Y-%m-%d')
-        
-        # Ensure non-negative
-        current_amount = max(current_amount, 0)
-        
-        # Store data point
-        data.append({
-            'date': current_date.strftime('%Y-%m-%d'),
-            'amount': round(current_amount, 2),
-            'cumulativeNetInvestmentAmount': round(cumulative_investment, 2)
+            ordinals = self._column(goal['datesOffset'], count, 'i')
+        dates = [date.fromordinal(ordinal).isoformat() for ordinal in ordinals]
+        return dates, amounts, invested
+    
+    def entry(self, goal_id):
+        """A goal's performanceTimeSeries entry without timeSeries (returnsTable and figures only)"""
+        return dict(self._goals[goal_id]['entry'])
+    
+    def get(self, goal_id):
+        """Expand one goal back into its performanceTimeSeries entry"""
+        dates, amounts, invested = self.columns(goal_id)
+        entry = self.entry(goal_id)
+        entry['timeSeries'] = {
+            'data': [
+                {'date': day, 'amount': amount, 'cumulativeNetInvestmentAmount': invested_amount}
+                for day, amount, invested_amount in zip(dates, amounts.tolist(), invested.tolist())
+            ]
+        }
+        return entry
+    
+    def to_dict(self):
+        """Expand every goal into a performanceTimeSeries dict"""
+        return {goal_id: self.get(goal_id) for goal_id in self._goals}
+    
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+# Sharded output layout (--shards DIR)
+#
+#   DIR/manifest.json   performance/investible/summary arrays, the shard list and a goal index:
+#                       {"format", "version", "shardBy", "performance", "investible", "summary",
+#                        "shards": [{file, bytes, goalCount}],
+#                        "goals": {goalId: {shard, offset, length, startDate, endDate, numPoints}}}
+#   DIR/series/*.json   one shard per bucket (or per goal): a JSON object of goalId -> performanceTimeSeries entry
+#
+# offset/length give the byte range of a goal's entry inside its shard, so a
+# reader can parse one goal without reading the rest of the shard.
+SHARD_FORMAT = 'gpv-mock-shards'
+SHARD_FORMAT_VERSION = 1
+SHARD_MANIFEST = 'manifest.json'
+SHARD_SERIES_DIR = 'series'
+
+def iter_shards(buckets, shard_by='bucket'):
+    """Yield (shard file name, goal specs) with one shard per bucket or per goal, in output order"""
+    if shard_by not in ('bucket', 'goal'):
+        raise ValueError(f"Unknown shard layout '{shard_by}' (expected 'bucket' or 'goal')")
+    for bucket_name, time_horizon_days, goal_types in buckets:
+        specs = [(bucket_name, index, goal_type, time_horizon_days) for index, goal_type in enumerate(goal_types, 1)]
+        if shard_by == 'bucket':
+            yield f'{SHARD_SERIES_DIR}/{bucket_slug(bucket_name)}.json', specs
+        else:
+            for spec in specs:
+                yield f'{SHARD_SERIES_DIR}/{make_goal_id(spec[0], spec[1])}.json', [spec]
+
+def _write_shard(shard, output_dir, seed, engine, as_of, indent, cache=None, calendar=None):
+    """
+    Process-pool task: generate one shard's goals and write its file
+    
+    Returns:
+        Dict with the shard's file, byte size, per-goal records (responses,
+        series summary and the entry's byte range in the file) and, with a
+        cache, each goal's seconds saved for GenerationCache.record
+    """
+    shard_file, specs = shard
+    newline = b'' if indent is None else b'\n'
+    pad = b'' if indent is None else b' ' * indent
+    key_sep = b':' if indent is None else b': '
+    
+    goals = []
+    cache_saved = []
+    offset = 1
+    chunks = [b'{']
+    for position, spec in enumerate(specs):
+        if cache is None:
+            goal = _create_goal_from_spec(spec, seed, engine, as_of, calendar)
+        else:
+            goal, seconds_saved = cache.goal(spec, seed, engine, as_of, calendar)
+            cache_saved.append(seconds_saved)
+        performance, investible, summary, time_series = build_goal_responses(goal)
+        prefix = (b',' if position else b'') + newline + pad + json.dumps(goal.goal_id).encode('utf-8') + key_sep
+        body = _json_dumps(time_series, indent, level=1).encode('utf-8')
+        chunks.append(prefix)
+        chunks.append(body)
+        offset += len(prefix)
+        goals.append({
+            'goalId': goal.goal_id,
+            'performance': performance,
+            'investible': investible,
+            'summary': summary,
+            'timeSeries': strip_series_points(time_series),
+            'offset': offset,
+            'length': len(body)
         })
+        offset += len(body)
+    chunks.append(newline + b'}')
     
-    return data, contribution_date
+    with open(os.path.join(output_dir, shard_file), 'wb') as f:
+        f.write(b''.join(chunks))
+    return {'file': shard_file, 'bytes': offset + len(chunks[-1]), 'goals': goals, 'cacheSaved': cache_saved}
 
-def generate_mock_data():
-    """Generate mock API data for House Purchase and Retirement buckets"""
+def write_sharded_mock_data(output_dir, buckets=DEMO_BUCKETS, engine='auto', seed=None, workers=1, as_of=None, shard_by='bucket', indent=2, cache=None,
+                            calendar=None, metadata=None):
+    """
+    Generate goals into a sharded layout: a manifest plus per-bucket or per-goal series shards
     
-    def create_goals(bucket_name, goal_types, time_horizon_days):
-        """Create goals for a bucket with time-series data"""
-        goals = []
-        for i, goal_type in enumerate(goal_types, 1):
-            target_amount = goal_type['targetAmount']
-            # Add random variation from targets
-            # Range provides -8% to +10% variation for demo realism
-            variation = random.uniform(0.92, 1.10)
-            final_investment = round(target_amount * variation, 2)
-            
-            # Calculate initial investment (before 25% contribution)
-            # We want: initial * (1 + growth_for_period) + 0.25 * amount_at_contribution ≈ target
-            # Simplified: Start with ~60-70% of target, grow it, then add 25% contribution
-            initial_investment = target_amount * random.uniform(0.60, 0.70)
-            
-            # Generate return rate
-            min_return = goal_type.get('minReturn', -0.05)
-            max_return = goal_type.get('maxReturn', 0.15)
-            annual_return_rate = min_return + random.random() * (max_return - min_return)
-            
-            # Generate time-series data with bumpy performance
-            goal_name = f"{bucket_name} - {goal_type['name']}"
-            time_series_data, contribution_date = generate_bumpy_time_series(
-                initial_investment=initial_investment,
-                target_final_amount=final_investment,
-                annual_return_rate=annual_return_rate,
-                days=time_horizon_days,
-                goal_name=goal_name
-            )
+    Shards are generated and written by worker processes in parallel (each
+    goal still draws from its own (seed, goalId) stream, so the files do not
+    depend on the worker count); the manifest is written last.
+    
+    Args:
+        output_dir: Directory for manifest.json and series/ (created if missing)
+        buckets: Bucket definitions (DEMO_BUCKETS or expand_profile output)
+        engine: Time-series engine name ('auto', 'numpy' or 'loop')
+        seed: Base seed (a random one is chosen when None)
+        workers: Number of worker processes writing shards
+        as_of: Date every series ends on (defaults to now)
+        shard_by: 'bucket' for one shard per bucket, 'goal' for one per goal
+        indent: JSON indent, or None for compact output
+        cache: Optional GenerationCache to load unchanged goals from
+        calendar: TradingCalendar ending at as_of (defaults to every calendar day)
+        metadata: Optional 'generator' record (see generator_metadata) for the manifest
+    
+    Returns:
+        Mock data dict without series points (as write_mock_data_streaming)
+    """
+    resolve_series_engine(engine)  # Fail fast on a bad engine before starting workers
+    if seed is None:
+        seed = random.randrange(2**63)
+    as_of = as_of or datetime.now()
+    calendar = (calendar or trading_calendar(as_of)).for_span(buckets_span_days(buckets))
+    os.makedirs(os.path.join(output_dir, SHARD_SERIES_DIR), exist_ok=True)
+    task = functools.partial(_write_shard, output_dir=output_dir, seed=seed, engine=engine, as_of=as_of, indent=indent, cache=cache,
+                             calendar=calendar)
+    shards = iter_shards(buckets, shard_by)
+    count_points = lambda shard: sum(goal['timeSeries']['timeSeriesBounds']['numPoints'] for goal in shard['goals'])
+    
+    mock_data = {'performance': [], 'investible': [], 'summary': [], 'performanceTimeSeries': {}}
+    manifest = {
+        'format': SHARD_FORMAT,
+        'version': SHARD_FORMAT_VERSION,
+        'shardBy': shard_by,
+        **({'generator': metadata} if metadata is not None else {}),
+        'performance': mock_data['performance'],
+        'investible': mock_data['investible'],
+        'summary': mock_data['summary'],
+        'shards': [],
+        'goals': {}
+    }
+    
+    def collect(results):
+        for shard in STAGE_TIMER.timed_iter('shard_write', results, count_points):
+            shard_index = len(manifest['shards'])
+            manifest['shards'].append({'file': shard['file'], 'bytes': shard['bytes'], 'goalCount': len(shard['goals'])})
+            for seconds_saved in shard['cacheSaved']:
+                cache.record(seconds_saved)
+            for goal in shard['goals']:
+                mock_data['performance'].append(goal['performance'])
+                mock_data['investible'].append(goal['investible'])
+                mock_data['summary'].append(goal['summary'])
+                mock_data['performanceTimeSeries'][goal['goalId']] = goal['timeSeries']
+                manifest['goals'][goal['goalId']] = dict(
+                    shard=shard_index, offset=goal['offset'], length=goal['length'],
+                    **goal['timeSeries']['timeSeriesBounds']
+                )
+    
+    if workers <= 1:
+        collect(map(task, shards))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            collect(executor.map(task, shards))
+    
+    with STAGE_TIMER.stage('json_write'):
+        write_mock_data(manifest, os.path.join(output_dir, SHARD_MANIFEST), indent=indent)
+    return mock_data
+
+class ShardedTimeSeries:
+    """
+    Reader for a sharded layout written by write_sharded_mock_data
+    
+    Opening it only parses the manifest; get() reads the byte range of one
+    goal's entry from its shard. No file stays open between calls, so there
+    is nothing to close.
+    
+    Usage:
+        series = ShardedTimeSeries('demo/mock-data-shards')
+        entry = series.get('mock-goal-retirement-1')  # same shape as performanceTimeSeries[goalId]
+    """
+    
+    def __init__(self, path):
+        self.manifest_path = os.path.join(path, SHARD_MANIFEST) if os.path.isdir(path) else path
+        self.base_dir = os.path.dirname(self.manifest_path)
+        with open(self.manifest_path) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format') != SHARD_FORMAT:
+            raise ValueError(f'{self.manifest_path} is not a sharded mock data manifest')
+        if self.manifest.get('version') != SHARD_FORMAT_VERSION:
+            raise ValueError(f"{self.manifest_path} has unsupported version {self.manifest.get('version')} (expected {SHARD_FORMAT_VERSION})")
+        self._goals = self.manifest['goals']
+    
+    def __len__(self):
+        return len(self._goals)
+    
+    def __contains__(self, goal_id):
+        return goal_id in self._goals
+    
+    def goal_ids(self):
+        """Goal IDs in manifest order"""
+        return list(self._goals)
+    
+    def shard_path(self, goal_id):
+        """Path of the shard holding a goal"""
+        return os.path.join(self.base_dir, self.manifest['shards'][self._goals[goal_id]['shard']]['file'])
+    
+    def get(self, goal_id):
+        """Read one goal's performanceTimeSeries entry from its shard"""
+        goal = self._goals[goal_id]
+        with open(self.shard_path(goal_id), 'rb') as f:
+            f.seek(goal['offset'])
+            return json.loads(f.read(goal['length']))
+    
+    def to_dict(self):
+        """Read every goal into a performanceTimeSeries dict"""
+        return {goal_id: self.get(goal_id) for goal_id in self._goals}
+    
+    def mock_data(self, goal_ids=None):
+        """
+        Mock data document with series for goal_ids only (every goal when None)
+        """
+        goal_ids = self.goal_ids() if goal_ids is None else goal_ids
+        return {
+            'performance': self.manifest['performance'],
+            'investible': self.manifest['investible'],
+            'summary': self.manifest['summary'],
+            'performanceTimeSeries': {goal_id: self.get(goal_id) for goal_id in goal_ids}
+        }
+
+# Scenario batches (--scenarios K)
+#
+#   DIR/index.json          {"format", "version", "profile", "seed", "asOf", "calendar", "regimes",
+#                            "scenarios": [{id, file, regime, buckets: {name: {endingBalance, invested, simpleReturn}}}],
+#                            "summary": {bucket: {endingBalance: {p5..p95}, simpleReturn: {p5..p95}, regimes?}}}
+#   DIR/scenario-NNN.json   one scenario as a full mock data document (same format as --output)
+#
+# Every scenario holds the same goals (target, initial investment, return
+# rate and contribution day are drawn from goal_rng(seed, goalId) as in a
+# single run) on a different market path. A scenario's path depends only on
+# (seed, scenario number, regime), so adding scenarios leaves earlier files unchanged.
+SCENARIO_FORMAT = 'gpv-mock-scenarios'
+SCENARIO_FORMAT_VERSION = 1
+SCENARIO_INDEX = 'index.json'
+SCENARIO_PERCENTILES = (5, 25, 50, 75, 95)
+# Share of the daily volatility variance common to every goal of a scenario
+SCENARIO_MARKET_SHARE = 0.5
+# Scenario x goal x day cells computed in one batch (bounds peak memory)
+SCENARIO_BATCH_CELLS = 2_000_000
+
+# Market regimes selectable with --regimes (cycled across scenarios)
+SCENARIO_REGIMES = {
+    'base': {
+        'description': "Each goal's own return rate, usual volatility and 1-2 corrections (as a single run)",
+        'returnShift': 0.0,
+        'volatilityScale': 1.0,
+        'corrections': None
+    },
+    'bull': {
+        'description': 'Returns 6 points higher, calmer markets, no corrections',
+        'returnShift': 0.06,
+        'volatilityScale': 0.8,
+        'corrections': 0
+    },
+    'bear': {
+        'description': 'Returns 15 points lower, 1.5x volatility, one correction',
+        'returnShift': -0.15,
+        'volatilityScale': 1.5,
+        'corrections': 1
+    },
+    'correction': {
+        'description': "Each goal's own return rate, 1.2x volatility, 5 corrections",
+        'returnShift': 0.0,
+        'volatilityScale': 1.2,
+        'corrections': 5
+    }
+}
+
+def scenario_goal_parameters(spec, seed, calendar):
+    """
+    A goal's own draws for scenario batches, identical to create_goal's
+    
+    Returns:
+        Dict with goal identity, targets, initial investment, return rate,
+        first calendar position and contribution day (relative to that position)
+    """
+    bucket_name, index, goal_type, time_horizon_days = spec
+    goal_id = make_goal_id(bucket_name, index)
+    rng = goal_rng(seed, goal_id)
+    rng.uniform(0.92, 1.10)  # Final amount variation (not used by the series engines)
+    initial_investment = goal_type['targetAmount'] * rng.uniform(0.60, 0.70)
+    min_return = goal_type.get('minReturn', -0.05)
+    max_return = goal_type.get('maxReturn', 0.15)
+    annual_return_rate = min_return + rng.random() * (max_return - min_return)
+    start = calendar.window_start(time_horizon_days)
+    days = len(calendar.ordinals) - start
+    return {
+        'goalId': goal_id,
+        'goalName': f"{bucket_name} - {goal_type['name']}",
+        'bucket': bucket_name,
+        'targetAmount': goal_type['targetAmount'],
+        'targetAllocation': goal_type['targetAllocation'],
+        'initialInvestment': initial_investment,
+        'annualReturnRate': annual_return_rate,
+        'start': start,
+        'contributionDay': days - rng.randint(30, 90)
+    }
+
+def scenario_market_draws(seed, scenario, regime, weekdays, days):
+    """
+    Market-wide draws for one scenario: volatility, weekday factors and corrections
+    
+    Drawn from a NumPy stream keyed by (seed, scenario), and shared by every
+    goal of the scenario.
+    
+    Returns:
+        Tuple of (NumPy generator for the goals' own draws, volatility,
+        weekly factor, correction impact), each array of length days
+    """
+    np_rng = np.random.default_rng([seed, scenario])
+    high_volatility = np_rng.random(days) < 0.05
+    volatility = np.where(high_volatility, np_rng.uniform(-0.02, 0.02, days), np_rng.uniform(-0.006, 0.006, days))
+    
+    weekly_factor = np.ones(days)
+    dip_mask = (weekdays == 2) | (weekdays == 3)  # Wednesday, Thursday
+    lift_mask = (weekdays == 0) | (weekdays == 4)  # Monday, Friday
+    weekly_factor[dip_mask] = np_rng.uniform(0.997, 0.999, size=int(dip_mask.sum()))
+    weekly_factor[lift_mask] = np_rng.uniform(1.001, 1.003, size=int(lift_mask.sum()))
+    
+    # Corrections: -1%/day for 7 days, then recover 7% over 33 days
+    correction_impact = np.zeros(days)
+    num_corrections = regime['corrections']
+    if num_corrections is None:
+        num_corrections = 1 if days < 500 else 2
+    candidates = np.arange(days // 4, max(days - 100, days // 4 + num_corrections))
+    for correction_start in np_rng.choice(candidates, size=min(num_corrections, len(candidates)), replace=False):
+        correction_impact[correction_start:correction_start + 7] -= 0.01
+        correction_impact[correction_start + 7:correction_start + 40] += 0.07 / 33
+    return np_rng, volatility, weekly_factor, correction_impact
+
+def iter_scenarios(buckets=DEMO_BUCKETS, scenarios=1, regimes=('base',), seed=None, as_of=None, calendar=None):
+    """
+    Generate every goal under `scenarios` market paths, batched into K x G x D arrays
+    
+    Goals share one trading calendar, so a batch of K scenarios of G goals
+    over the D trading days of the longest horizon is computed together:
+    daily factors (growth since the previous trading day, the scenario's
+    market volatility blended with each goal's own, weekday effect and
+    corrections), one cumulative product along the day axis, then the
+    contributions. Days before a goal's own horizon have a factor of 1, so
+    each goal compounds from its first day. Batches are sized to
+    SCENARIO_BATCH_CELLS cells.
+    
+    Args:
+        buckets: Bucket definitions (DEMO_BUCKETS or expand_profile output)
+        scenarios: Number of scenarios (K)
+        regimes: SCENARIO_REGIMES names, cycled across scenarios
+        seed: Base seed (required; goal and market draws derive from it)
+        as_of: Date every series ends on (defaults to now)
+        calendar: TradingCalendar ending at as_of (defaults to every calendar day)
+    
+    Yields:
+        Tuple of (scenario number from 0, regime name, list of GoalRecords)
+    """
+    if np is None:
+        raise RuntimeError('Scenario batches require numpy (pip install numpy)')
+    unknown = [regime for regime in regimes if regime not in SCENARIO_REGIMES]
+    if unknown or not regimes:
+        raise ValueError(f"Unknown regime(s) {', '.join(unknown) or '(none)'} (expected: {', '.join(SCENARIO_REGIMES)})")
+    span = buckets_span_days(buckets)
+    calendar = (calendar or trading_calendar(as_of, span)).for_span(span)
+    base = calendar.window_start(span)
+    days = len(calendar.ordinals) - base
+    goals = [scenario_goal_parameters(spec, seed, calendar) for spec in iter_goal_specs(buckets)]
+    
+    # Per-goal and per-day inputs shared by every scenario
+    offsets = np.array([goal['start'] - base for goal in goals])
+    contribution_days = np.array([goal['contributionDay'] for goal in goals])
+    has_contribution = (contribution_days >= 0) & (offsets + contribution_days < days)
+    contribution_index = np.where(has_contribution, offsets + contribution_days, days - 1)
+    initial = np.array([goal['initialInvestment'] for goal in goals])[:, None]
+    rates = np.array([goal['annualReturnRate'] for goal in goals])
+    day_index = np.arange(days)
+    active = day_index >= offsets[:, None]
+    contributed = has_contribution[:, None] & (day_index >= contribution_index[:, None])
+    weekdays = np.frombuffer(calendar.weekdays, dtype=np.uint8, offset=base)
+    gaps = np.frombuffer(calendar.gaps, dtype=np.uint8, offset=base)
+    market_weight = SCENARIO_MARKET_SHARE ** 0.5
+    own_weight = (1 - SCENARIO_MARKET_SHARE) ** 0.5
+    
+    batch_size = max(1, SCENARIO_BATCH_CELLS // (len(goals) * days))
+    for batch_start in range(0, scenarios, batch_size):
+        batch = range(batch_start, min(batch_start + batch_size, scenarios))
+        batch_regimes = [regimes[scenario % len(regimes)] for scenario in batch]
+        with STAGE_TIMER.stage('scenario_paths', points=len(batch) * int(active.sum())):
+            volatility = np.empty((len(batch), len(goals), days))
+            weekly_factor = np.empty((len(batch), 1, days))
+            correction_impact = np.empty((len(batch), 1, days))
+            for position, scenario in enumerate(batch):
+                regime = SCENARIO_REGIMES[batch_regimes[position]]
+                np_rng, market, weekly_factor[position, 0], correction_impact[position, 0] = scenario_market_draws(
+                    seed, scenario, regime, weekdays, days)
+                volatility[position] = regime['volatilityScale'] * (
+                    market_weight * market + own_weight * np_rng.uniform(-0.006, 0.006, size=(len(goals), days)))
             
-            # Calculate actual returns from time-series
-            ending_balance = time_series_data[-1]['amount']
-            cumulative_invested = time_series_data[-1]['cumulativeNetInvestmentAmount']
-            actual_return = ending_balance - cumulative_invested
-            return_percentage = actual_return / cumulative_invested if cumulative_invested > 0 else 0
+            shifts = np.array([SCENARIO_REGIMES[regime]['returnShift'] for regime in batch_regimes])
+            scenario_rates = rates[None, :] + shifts[:, None]
+            growth = (1 + scenario_rates[:, :, None] / 365) ** gaps
+            daily_factor = np.where(active, growth * (1 + volatility + correction_impact) * weekly_factor, 1.0)
+            amounts = initial * np.cumprod(daily_factor, axis=2)
             
-            goal_id = f"mock-goal-{bucket_name.lower().replace(' ', '-')}-{i}"
-            goals.append({
-                'goalId': goal_id,
-                'goalName': goal_name,
-                'goalBucket': bucket_name,
-                'goalType': 'GENERAL_WEALTH_ACCUMULATION',
-                'endingBalance': ending_balance,  # Final balance including returns
-                'cumulativeInvested': cumulative_invested,  # Total amount invested
-                'totalCumulativeReturn': actual_return,
-                'simpleRateOfReturnPercent': return_percentage,
-                'targetAmount': target_amount,
-                'targetAllocation': goal_type['targetAllocation'],
-                'timeSeriesData': time_series_data,
-                'contributionDate': contribution_date,
-                'annualReturnRate': annual_return_rate
-            })
+            # Contribution event (25% addition in each goal's final 90 days)
+            contribution = np.take_along_axis(amounts, np.broadcast_to(contribution_index[None, :, None], (len(batch), len(goals), 1)), axis=2) * 0.25
+            contribution[:, ~has_contribution] = 0
+            amounts = np.where(contributed, amounts * 1.25, amounts)
+            invested = initial + contribution * contributed
+            amounts = np.round(np.maximum(amounts, 0), 2)
+            invested = np.round(invested, 2)
         
-        return goals
+        for position, scenario in enumerate(batch):
+            records = []
+            with STAGE_TIMER.stage('scenario_goals'):
+                for goal_position, goal in enumerate(goals):
+                    offset = offsets[goal_position]
+                    amounts_column = array('d')
+                    amounts_column.frombytes(amounts[position, goal_position, offset:].tobytes())
+                    invested_column = array('d')
+                    invested_column.frombytes(invested[position, goal_position, offset:].tobytes())
+                    contribution_date = (calendar.dates[base + contribution_index[goal_position]]
+                                         if has_contribution[goal_position] else None)
+                    records.append(GoalRecord(
+                        goal['goalId'],
+                        goal['goalName'],
+                        goal['bucket'],
+                        'GENERAL_WEALTH_ACCUMULATION',
+                        goal['targetAmount'],
+                        goal['targetAllocation'],
+                        calendar.series(goal['start'], amounts_column, invested_column),
+                        contribution_date,
+                        float(scenario_rates[position, goal_position])
+                    ))
+            yield scenario, batch_regimes[position], records
+
+def _percentile_summary(values):
+    """{'p5': ..., 'p95': ...} of values (rounded to the cent or basis point)"""
+    points = np.percentile(np.array(values), SCENARIO_PERCENTILES)
+    return {f'p{percentile}': round(float(value), 6) for percentile, value in zip(SCENARIO_PERCENTILES, points)}
+
+def write_scenario_fixtures(output_dir, buckets=DEMO_BUCKETS, scenarios=1, regimes=('base',), seed=None, as_of=None, indent=2,
+                            calendar=None, profile_name=None):
+    """
+    Generate a scenario batch and write one mock data file per scenario plus an index
     
-    # Define House Purchase bucket goals (~200k SGD, 1 year time horizon)
-    # Target Allocation: 70% Core-Balanced, 10% Megatrends, 10% Tech, 10% China
-    house_goals = create_goals('House Purchase', [
-        {'name': 'Core - Balanced', 'targetAmount': 140000, 'targetAllocation': 70, 'minReturn': 0.05, 'maxReturn': 0.12},
-        {'name': 'Megatrends', 'targetAmount': 20000, 'targetAllocation': 10, 'minReturn': 0.03, 'maxReturn': 0.15},
-        {'name': 'Tech', 'targetAmount': 20000, 'targetAllocation': 10, 'minReturn': -0.02, 'maxReturn': 0.20},
-        {'name': 'China', 'targetAmount': 20000, 'targetAllocation': 10, 'minReturn': -0.08, 'maxReturn': 0.18}
-    ], time_horizon_days=365)  # 1 year
+    Args:
+        output_dir: Directory for index.json and scenario-NNN.json (created if missing)
+        buckets: Bucket definitions (DEMO_BUCKETS or expand_profile output)
+        scenarios: Number of scenarios
+        regimes: SCENARIO_REGIMES names, cycled across scenarios
+        seed: Base seed (a random one is chosen when None)
+        as_of: Date every series ends on (defaults to now)
+        indent: JSON indent, or None for compact output
+        calendar: TradingCalendar ending at as_of (defaults to every calendar day)
+        profile_name: Profile name recorded in the index
     
-    # Define Retirement bucket goals (~60k SGD, 2 year time horizon)
-    # Target Allocation: 55% Core-Aggressive, 15% Megatrends, 15% Tech, 15% China
-    retirement_goals = create_goals('Retirement', [
-        {'name': 'Core - Aggressive', 'targetAmount': 33000, 'targetAllocation': 55, 'minReturn': 0.06, 'maxReturn': 0.14},
-        {'name': 'Megatrends', 'targetAmount': 9000, 'targetAllocation': 15, 'minReturn': 0.03, 'maxReturn': 0.15},
-        {'name': 'Tech', 'targetAmount': 9000, 'targetAllocation': 15, 'minReturn': -0.02, 'maxReturn': 0.20},
-        {'name': 'China', 'targetAmount': 9000, 'targetAllocation': 15, 'minReturn': -0.08, 'maxReturn': 0.18}
-    ], time_horizon_days=730)  # 2 years
+    Returns:
+        The index dict (also written to index.json)
+    """
+    if seed is None:
+        seed = random.randrange(2**63)
+    as_of = as_of or datetime.now()
+    calendar = calendar or trading_calendar(as_of)
+    os.makedirs(output_dir, exist_ok=True)
+    width = max(3, len(str(scenarios)))
+    index = {
+        'format': SCENARIO_FORMAT,
+        'version': SCENARIO_FORMAT_VERSION,
+        'profile': profile_name,
+        'seed': seed,
+        'asOf': as_of.date().isoformat(),
+        'calendar': calendar.options(),
+        'regimes': {regime: SCENARIO_REGIMES[regime] for regime in dict.fromkeys(regimes) if regime in SCENARIO_REGIMES},
+        'scenarios': [],
+        'summary': {}
+    }
     
-    all_goals = house_goals + retirement_goals
+    for scenario, regime, goals in iter_scenarios(buckets, scenarios, regimes, seed=seed, as_of=as_of, calendar=calendar):
+        mock_data = {'performance': [], 'investible': [], 'summary': [], 'performanceTimeSeries': {}}
+        bucket_totals = {}
+        with STAGE_TIMER.stage('assemble'):
+            for goal in goals:
+                performance, investible, summary, time_series = build_goal_responses(goal)
+                mock_data['performance'].append(performance)
+                mock_data['investible'].append(investible)
+                mock_data['summary'].append(summary)
+                mock_data['performanceTimeSeries'][goal.goal_id] = time_series
+                totals = bucket_totals.setdefault(goal.goal_bucket, [0.0, 0.0])
+                totals[0] += goal.ending_balance
+                totals[1] += goal.cumulative_invested
+        scenario_id = f'scenario-{scenario + 1:0{width}d}'
+        with STAGE_TIMER.stage('json_write'):
+            write_mock_data(mock_data, os.path.join(output_dir, f'{scenario_id}.json'), indent=indent)
+        index['scenarios'].append({
+            'id': scenario_id,
+            'file': f'{scenario_id}.json',
+            'regime': regime,
+            'buckets': {
+                bucket: {
+                    'endingBalance': round(ending_balance, 2),
+                    'invested': round(invested, 2),
+                    'simpleReturn': round((ending_balance - invested) / invested, 6) if invested > 0 else 0
+                }
+                for bucket, (ending_balance, invested) in bucket_totals.items()
+            }
+        })
     
-    # Create API response structures matching the expected format
-    performance_data = []
-    investible_data = []
-    summary_data = []
-    performance_time_series = {}  # NEW: Per-goal time-series data
+    # Ending balance and simple return percentiles per bucket (and per regime when mixed)
+    used_regimes = list(dict.fromkeys(entry['regime'] for entry in index['scenarios']))
+    for bucket in dict.fromkeys(bucket_name for bucket_name, _, _ in buckets):
+        def distribution(entries):
+            return {
+                metric: _percentile_summary([entry['buckets'][bucket][metric] for entry in entries])
+                for metric in ('endingBalance', 'simpleReturn')
+            }
+        index['summary'][bucket] = distribution(index['scenarios'])
+        if len(used_regimes) > 1:
+            index['summary'][bucket]['regimes'] = {
+                regime: distribution([entry for entry in index['scenarios'] if entry['regime'] == regime])
+                for regime in used_regimes
+            }
+    
+    with STAGE_TIMER.stage('json_write'):
+        write_mock_data(index, os.path.join(output_dir, SCENARIO_INDEX), indent=indent)
+    return index
+
+# Generation cache (--cache DIR)
+#
+#   DIR/runs/<run key>.json     artifacts of a previous run: [{role, sha256, bytes}], plus its timing and counts
+#   DIR/blobs/<sha256>          artifact contents, stored once per distinct content
+#   DIR/goals/<xx>/<goal key>   marshal-encoded GoalRecord state and the seconds it took to generate
+#
+# A run key hashes everything that determines the artifacts (profile
+# definition, seed, engine, as-of date, generator fingerprint and output
+# options). A goal key hashes only what that goal depends on, so when a run
+# misses, goals whose definitions did not change are loaded instead of generated.
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mock-cache')
+
+@functools.lru_cache(maxsize=None)
+def generator_fingerprint(engine):
+    """
+    Version of everything besides its inputs that a generated goal depends on
+    
+    Hashes this file's source, so any change to the generator invalidates
+    cached output, plus the marshal format and the numpy version for the
+    numpy engine.
+    """
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest = hashlib.sha256(f.read())
+    digest.update(f'marshal:{marshal.version}'.encode('utf-8'))
+    if engine == 'numpy':
+        digest.update(f'numpy:{np.__version__}'.encode('utf-8'))
+    return digest.hexdigest()
+
+def _hash_json(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _write_atomic(path, data):
+    """Write bytes via a temporary file so concurrent writers never expose partial files"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class GenerationCache:
+    """
+    Content-addressed cache of generated goals and run artifacts
+    
+    Instances are picklable so worker processes can load and store goals;
+    hit/miss counters are only kept by the parent process (see record).
+    """
     
-    for goal in all_goals:
-        # Basic performance data
-        performance_data.append({
-            'goalId': goal['goalId'],
-            'totalCumulativeReturn': {'amount': goal['totalCumulativeReturn']},
-            'simpleRateOfReturnPercent': goal['simpleRateOfReturnPercent'],
-            'totalInvestmentValue': {'amount': goal['endingBalance']}
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.goal_hits = 0
+        self.goal_misses = 0
+        self.seconds_saved = 0.0
+    
+    def run_key(self, profile, seed, engine, as_of, options):
+        """Key for a whole run: profile definition, seed, engine, as-of date, generator version and output options"""
+        engine = resolve_engine_name(engine)
+        return _hash_json({
+            'profile': profile,
+            'seed': seed,
+            'engine': engine,
+            'asOf': as_of.date().isoformat(),
+            'generator': generator_fingerprint(engine),
+            'options': options
         })
-        
-        # Investible data with target information
-        # Note: totalInvestmentAmount in API is misnamed - it's actually ending balance
-        investible_data.append({
-            'goalId': goal['goalId'],
-            'goalName': goal['goalName'],
-            'investmentGoalType': goal['goalType'],
-            'totalInvestmentAmount': {
-                'display': {'amount': goal['endingBalance']}
-            },
-            'targetAmount': goal['targetAmount'],
-            'targetAllocation': goal['targetAllocation']
+    
+    def goal_key(self, spec, seed, engine, as_of, calendar=None):
+        """Key for one goal: its spec, seed, engine, as-of date, calendar rules and generator version"""
+        return _hash_json({
+            'spec': list(spec),
+            'seed': seed,
+            'engine': engine,
+            'asOf': as_of.date().isoformat(),
+            'calendar': calendar.options() if calendar is not None else None,
+            'generator': generator_fingerprint(engine)
         })
+    
+    def _goal_path(self, key):
+        return os.path.join(self.cache_dir, 'goals', key[:2], key)
+    
+    def goal(self, spec, seed, engine, as_of, calendar=None):
+        """
+        Load a goal from the cache, or generate and store it
         
-        # Summary data
-        summary_data.append({
-            'goalId': goal['goalId'],
-            'goalName': goal['goalName'],
-            'investmentGoalType': goal['goalType']
-        })
+        Returns:
+            Tuple of (goal, seconds saved), where seconds saved is None when
+            the goal had to be generated
+        """
+        engine = resolve_engine_name(engine)
+        path = self._goal_path(self.goal_key(spec, seed, engine, as_of, calendar))
+        started = time.perf_counter()
+        try:
+            with open(path, 'rb') as f:
+                generated_seconds, state = marshal.loads(f.read())
+            return GoalRecord.from_state(state, calendar), generated_seconds - (time.perf_counter() - started)
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+        goal = _create_goal_from_spec(spec, seed, engine, as_of, calendar)
+        _write_atomic(path, marshal.dumps((time.perf_counter() - started, goal.to_state())))
+        return goal, None
+    
+    def record(self, seconds_saved):
+        """Count one goal lookup returned by goal()"""
+        if seconds_saved is None:
+            self.goal_misses += 1
+        else:
+            self.goal_hits += 1
+            self.seconds_saved += max(seconds_saved, 0.0)
+    
+    def unwrap(self, results):
+        """Yield the goals from an iterable of goal() results, counting hits and misses"""
+        for goal, seconds_saved in results:
+            self.record(seconds_saved)
+            yield goal
+    
+    def _run_path(self, key):
+        return os.path.join(self.cache_dir, 'runs', f'{key}.json')
+    
+    def _blob_path(self, sha256):
+        return os.path.join(self.cache_dir, 'blobs', sha256)
+    
+    @staticmethod
+    def _artifact_path(role, destinations):
+        """Destination of an artifact role ('shard:<file>' roles live under destinations['shards'])"""
+        if role.startswith('shard:'):
+            return os.path.join(destinations['shards'], role[len('shard:'):])
+        return destinations[role]
+    
+    def store_run(self, key, roles, destinations, details):
+        """
+        Store the files a run produced under its run key
         
-        # Time-series performance data (for charts)
-        # Calculate YTD return (assume start of current year)
-        current_date = datetime.now()
-        start_of_year = datetime(current_date.year, 1, 1)
-        days_since_start_of_year = (current_date - start_of_year).days
-        # Prorate the annual return to YTD
-        ytd_return = goal['simpleRateOfReturnPercent'] * (days_since_start_of_year / 365)
+        Args:
+            key: run_key() of the run
+            roles: Artifact roles to store (see _artifact_path)
+            destinations: Role -> path mapping the run wrote to
+            details: JSON-serializable run details kept with the record (counts, elapsedSeconds)
+        """
+        artifacts = []
+        for role in roles:
+            path = self._artifact_path(role, destinations)
+            sha256 = _file_sha256(path)
+            blob_path = self._blob_path(sha256)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = f'{blob_path}.{os.getpid()}.tmp'
+                shutil.copyfile(path, tmp_path)
+                os.replace(tmp_path, blob_path)
+            artifacts.append({'role': role, 'sha256': sha256, 'bytes': os.path.getsize(path)})
+        record = dict(details, artifacts=artifacts)
+        _write_atomic(self._run_path(key), json.dumps(record, indent=2).encode('utf-8'))
+    
+    def restore_run(self, key, destinations):
+        """
+        Put a cached run's artifacts in place
         
-        # Calculate annualised IRR (use a slightly different value for realism)
-        annualised_irr = goal['simpleRateOfReturnPercent'] * 0.95  # Slightly lower than TWR for realism
+        Destination files that already hold the cached content are left
+        untouched; the others are copied from the blob store.
         
-        # Calculate fees (small percentage of investment for realism)
-        access_fee = goal['cumulativeInvested'] * 0.005  # 0.5% access fee
-        trailer_fee_rebate = goal['cumulativeInvested'] * 0.002  # 0.2% trailer fee rebate
+        Returns:
+            Tuple of (run record, number of files rewritten), or None on a miss
+            (including a record whose blobs have gone missing)
+        """
+        try:
+            with open(self._run_path(key)) as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not all(os.path.exists(self._blob_path(artifact['sha256'])) for artifact in record['artifacts']):
+            return None
         
-        performance_time_series[goal['goalId']] = {
-            'timeSeries': {
-                'data': goal['timeSeriesData']
-            },
-            'returnsTable': {
-                'twr': {
-                    'allTimeValue': goal['simpleRateOfReturnPercent'],
-                    'oneYearValue': goal['simpleRateOfReturnPercent'],
-                    'sixMonthValue': goal['simpleRateOfReturnPercent'] * 0.5,
-                    'threeMonthValue': goal['simpleRateOfReturnPercent'] * 0.25,
-                    'oneMonthValue': goal['simpleRateOfReturnPercent'] * 0.083,
-                    'ytdValue': ytd_return,
-                    'threeYearValue': goal['simpleRateOfReturnPercent']  # Use same as allTime for demo
-                },
-                'annualisedIrr': {
-                    'allTimeValue': annualised_irr
-                }
-            },
-            'gainOrLossTable': {
-                'netInvestment': {
-                    'allTimeValue': goal['cumulativeInvested']
-                },
-                'accessFeeCharged': {
-                    'allTimeValue': access_fee
-                },
-                'trailerFeeRebates': {
-                    'allTimeValue': trailer_fee_rebate
-                }
-            },
-            'totalCumulativeReturnPercent': goal['simpleRateOfReturnPercent'],
-            'totalCumulativeReturnAmount': goal['totalCumulativeReturn'],
-            'contributionDate': goal['contributionDate'],
-            'annualReturnRate': goal['annualReturnRate'],
-            'cumulativeInvested': goal['cumulativeInvested']
-        }
+        rewritten = 0
+        for artifact in record['artifacts']:
+            path = self._artifact_path(artifact['role'], destinations)
+            if (os.path.isfile(path) and os.path.getsize(path) == artifact['bytes']
+                    and _file_sha256(path) == artifact['sha256']):
+                continue
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            shutil.copyfile(self._blob_path(artifact['sha256']), path)
+            rewritten += 1
+        return record, rewritten
     
-    return {
-        'performance': performance_data,
-        'investible': investible_data,
-        'summary': summary_data,
-        'performanceTimeSeries': performance_time_series
+    def format_goal_stats(self):
+        """One-line goal hit/miss summary"""
+        return f"goals {self.goal_hits:,} hits, {self.goal_misses:,} misses, {self.seconds_saved:.2f}s saved"
+
+def format_horizon(days):
+    """Human readable horizon, e.g. '1 year', '2 years', '0.5 years'"""
+    years = days / 365
+    if years == int(years):
+        return f"{int(years)} year{'s' if years != 1 else ''}"
+    return f'{years:.1f} years'
+
+def build_goal_index(mock_data):
+    """
+    Index every goal's records by goalId in a single pass over each endpoint
+    
+    Returns:
+        Dict of goalId -> {'investible', 'performance', 'timeSeries'}, in
+        investible order. Aggregations drive off this index instead of
+        searching the endpoint lists per goal, so they stay linear in the
+        number of goals.
+    """
+    goal_index = {
+        goal['goalId']: {'investible': goal, 'performance': None, 'timeSeries': {}}
+        for goal in mock_data['investible']
     }
+    for perf in mock_data['performance']:
+        if perf['goalId'] in goal_index:
+            goal_index[perf['goalId']]['performance'] = perf
+    for goal_id, perf_ts in mock_data['performanceTimeSeries'].items():
+        if goal_id in goal_index:
+            goal_index[goal_id]['timeSeries'] = perf_ts
+    return goal_index
 
-def generate_bucket_config_doc(mock_data, output_file):
-    """Generate markdown documentation for bucket configuration"""
+def generate_bucket_config_doc(mock_data, output_file, goal_index=None, metadata=None):
+    """Generate markdown documentation for bucket configuration
+    
+    Args:
+        mock_data: Generated mock data
+        output_file: Markdown output path
+        goal_index: Prebuilt build_goal_index(mock_data), built here when omitted
+        metadata: The data's 'generator' record (see generator_metadata), noted under the title
+    """
+    if goal_index is None:
+        goal_index = build_goal_index(mock_data)
     
     # Build bucket structure from mock data
     buckets = {}
-    for goal in mock_data['investible']:
+    for entry in goal_index.values():
+        goal = entry['investible']
         bucket = goal['goalName'].split(' - ')[0]
         if bucket not in buckets:
             buckets[bucket] = {
@@ -295,8 +2536,8 @@ def generate_bucket_config_doc(mock_data, output_file):
             }
         
         # Get performance data
-        perf = next(p for p in mock_data['performance'] if p['goalId'] == goal['goalId'])
-        perf_ts = mock_data['performanceTimeSeries'].get(goal['goalId'], {})
+        perf = entry['performance']
+        perf_ts = entry['timeSeries']
         
         goal_name = ' - '.join(goal['goalName'].split(' - ')[1:])
         actual = goal['totalInvestmentAmount']['display']['amount']
@@ -305,11 +2546,8 @@ def generate_bucket_config_doc(mock_data, output_file):
         target_allocation = goal.get('targetAllocation', 0)
         
         # Time-series metadata
-        ts_data = perf_ts.get('timeSeries', {}).get('data', [])
-        start_date = ts_data[0]['date'] if ts_data else 'N/A'
-        end_date = ts_data[-1]['date'] if ts_data else 'N/A'
+        start_date, end_date, num_days = summarize_time_series(perf_ts)
         contribution_date = perf_ts.get('contributionDate', 'N/A')
-        num_days = len(ts_data)
         
         buckets[bucket]['goals'].append({
             'name': goal_name,
@@ -333,6 +2571,8 @@ def generate_bucket_config_doc(mock_data, output_file):
     with open(output_file, 'w') as f:
         f.write('# Demo Bucket Configuration\n\n')
         f.write('*Generated on: ' + __import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S') + '*\n\n')
+        if metadata:
+            f.write(f'*Generator: `{generator_command(metadata)}`*\n\n')
         f.write('This document tracks the bucket and target configuration used in the demo.\n\n')
         f.write('---\n\n')
         
@@ -386,51 +2626,365 @@ def generate_bucket_config_doc(mock_data, output_file):
         f.write('- Returns are randomized within specified ranges per goal type\n')
         f.write('- Time-series data includes bumpy/realistic market volatility patterns\n')
         f.write('- Each goal has a 25% contribution event in the final 90 days\n')
-        f.write('- House Purchase bucket spans 1 year (365 days)\n')
-        f.write('- Retirement bucket spans 2 years (730 days)\n')
+        for bucket_name, bucket_data in buckets.items():
+            for time_horizon_days in bucket_data['time_horizons']:
+                f.write(f'- {bucket_name} bucket spans {format_horizon(time_horizon_days)} ({time_horizon_days} days)\n')
         f.write('- Regenerate this file whenever running `generate-mock-data.py`\n')
         f.write('- Use this configuration as reference for future demo updates\n')
 
-def main():
+def parse_as_of(value):
+    """argparse type for --as-of dates"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}' (expected YYYY-MM-DD)")
+
+def load_holidays(path):
+    """
+    Read holiday dates from a text file: one YYYY-MM-DD per line, '#' starts a comment
+    
+    Raises:
+        ValueError: A line is not a valid date
+    """
+    holidays = []
+    with open(path) as f:
+        for line_number, line in enumerate(f, 1):
+            value = line.split('#', 1)[0].strip()
+            if not value:
+                continue
+            try:
+                holidays.append(date.fromisoformat(value).isoformat())
+            except ValueError:
+                raise ValueError(f"{path}:{line_number}: invalid date '{value}' (expected YYYY-MM-DD)")
+    return holidays
+
+def parse_regimes(value):
+    """argparse type for a comma separated list of SCENARIO_REGIMES names"""
+    regimes = [item.strip() for item in value.split(',') if item.strip()]
+    unknown = [regime for regime in regimes if regime not in SCENARIO_REGIMES]
+    if not regimes or unknown:
+        raise argparse.ArgumentTypeError(f"invalid regimes '{value}' (expected comma separated names from: {', '.join(SCENARIO_REGIMES)})")
+    return regimes
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Generate mock data for the Goal Portfolio Viewer demo')
+    parser.add_argument('--engine', choices=['auto'] + list(SERIES_ENGINES), default=None,
+                        help="Time-series engine: 'auto' (numpy when installed, otherwise loop; default without --seed), "
+                             "'numpy' (vectorized) or 'loop' (original per-day loop). Required with --seed")
+    parser.add_argument('--profile', default='demo',
+                        help=f"Scale profile: built-in name ({', '.join(SCALE_PROFILES)}) or path to a JSON profile file (default: demo)")
+    parser.add_argument('--list-profiles', action='store_true',
+                        help='List built-in scale profiles and exit')
+    parser.add_argument('--output', default=None,
+                        help='Output JSON path (default: demo/mock-data.json, or demo/mock-data-<profile>.json for other profiles)')
+    parser.add_argument('--doc', default=None,
+                        help='Bucket configuration markdown path (default: demo/BUCKET_CONFIGURATION.md for the demo profile, skipped otherwise)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write each goal as it is generated so memory is bounded by one goal')
+    parser.add_argument('--compact', action='store_true',
+                        help='Write JSON without indentation or whitespace')
+    parser.add_argument('--append', action='store_true',
+                        help='Extend the existing output file up to --as-of instead of regenerating it')
+    parser.add_argument('--columnar', default=None, metavar='PATH',
+                        help='Also write time series to a columnar binary file (.gpvts) readable with ColumnarTimeSeries')
+    parser.add_argument('--shards', default=None, metavar='DIR',
+                        help='Write a sharded layout to DIR (manifest.json plus per-bucket or per-goal series shards) instead of one JSON file')
+    parser.add_argument('--shard-by', choices=['bucket', 'goal'], default='bucket',
+                        help='Shard granularity for --shards (default: bucket)')
+    parser.add_argument('--lazy-series', action='store_true',
+                        help='Write goal metadata only; series are regenerated on demand from (seed, goalId, profile) with LazyTimeSeries')
+    parser.add_argument('--scenarios', type=int, default=None, metavar='K',
+                        help='Generate K market scenarios of the profile in one batch, one mock data file each plus index.json (requires numpy)')
+    parser.add_argument('--regimes', type=parse_regimes, default=['base'], metavar='LIST',
+                        help=f"Comma separated market regimes cycled across --scenarios ({', '.join(SCENARIO_REGIMES)}; default: base)")
+    parser.add_argument('--scenarios-dir', default=None, metavar='DIR',
+                        help='Output directory for --scenarios (default: demo/mock-data-<profile>-scenarios)')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_DIR, default=None, metavar='DIR',
+                        help='Reuse previous output when profile, seed, engine, as-of date and generator are unchanged, '
+                             'and cached goals otherwise (default DIR: demo/.mock-cache; requires --seed)')
+    parser.add_argument('--timings', action='store_true',
+                        help='Print a per-stage timing breakdown (also enabled by GPV_MOCK_TIMINGS=1)')
+    parser.add_argument('--cprofile', default=os.environ.get('GPV_MOCK_CPROFILE'), metavar='PATH',
+                        help='Run under cProfile, save stats to PATH and print the top functions (or set GPV_MOCK_CPROFILE)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Base seed; each goal derives its own random stream from (seed, goalId)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of worker processes used to generate goals (output does not depend on it)')
+    parser.add_argument('--as-of', type=parse_as_of, default=None,
+                        help='Date (YYYY-MM-DD) the series end on, for reproducible fixtures (default: now)')
+    parser.add_argument('--skip-weekends', action='store_true',
+                        help='Only generate points for Monday to Friday (growth still accrues over weekends)')
+    parser.add_argument('--holidays', default=None, metavar='PATH',
+                        help='Text file of YYYY-MM-DD dates (one per line) to leave out of the series')
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    # The engines draw differently, so a seed only pins the fixture together with the engine
+    # (--append and --scenarios do not use the engine)
+    uses_engine = not (args.append or args.scenarios is not None)
+    if args.seed is not None and uses_engine and args.engine in (None, 'auto'):
+        parser.error("--seed needs --engine numpy or loop ('auto' depends on whether numpy is installed)")
+    if args.engine is None:
+        args.engine = 'auto'
+    if args.append and args.stream:
+        parser.error('--append rewrites the existing file and cannot be combined with --stream')
+    if args.lazy_series and (args.append or args.stream or args.columnar):
+        parser.error('--lazy-series writes no series and cannot be combined with --append, --stream or --columnar')
+    if args.shards and (args.append or args.stream or args.columnar or args.lazy_series or args.output):
+        parser.error('--shards cannot be combined with --output, --append, --stream, --columnar or --lazy-series')
+    if args.scenarios is not None:
+        if args.scenarios < 1:
+            parser.error('--scenarios must be at least 1')
+        if args.append or args.stream or args.columnar or args.shards or args.lazy_series or args.output or args.cache:
+            parser.error('--scenarios cannot be combined with --output, --append, --stream, --columnar, --shards, --lazy-series or --cache')
+    return args
+
+def format_bytes(num_bytes):
+    """Human readable byte count"""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if num_bytes < 1024 or unit == 'GB':
+            return f'{num_bytes:,.0f} {unit}' if unit == 'B' else f'{num_bytes:,.1f} {unit}'
+        num_bytes /= 1024
+
+def main(argv=None):
     """Generate mock data and save to JSON file"""
-    mock_data = generate_mock_data()
+    args = parse_args(argv)
+    if args.timings:
+        STAGE_TIMER.enabled = True
+    if not args.cprofile:
+        run(args)
+        return
     
-    # Save to file
-    output_file = os.path.join(os.path.dirname(__file__), 'mock-data.json')
-    with open(output_file, 'w') as f:
-        json.dump(mock_data, f, indent=2)
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, args)
+    finally:
+        profiler.dump_stats(args.cprofile)
+        print(f"\ncProfile stats saved to {args.cprofile} (top functions by cumulative time):")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+
+def run_scenarios(args, profile_name, buckets, as_of, calendar, indent):
+    """Generate a --scenarios batch and print its per-bucket distribution"""
+    output_dir = args.scenarios_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), f'mock-data-{profile_name}-scenarios')
+    started = time.perf_counter()
+    try:
+        index = write_scenario_fixtures(output_dir, buckets=buckets, scenarios=args.scenarios, regimes=args.regimes, seed=args.seed,
+                                        as_of=as_of, indent=indent, calendar=calendar, profile_name=profile_name)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    
+    num_goals = sum(len(goal_types) for _, _, goal_types in buckets)
+    output_bytes = sum(os.path.getsize(os.path.join(output_dir, entry['file'])) for entry in index['scenarios'])
+    STAGE_TIMER.set_output_bytes('json_write', output_bytes)
+    print(f"{args.scenarios:,} scenarios of {num_goals:,} goals ({', '.join(args.regimes)}) saved to {output_dir} in {elapsed:.2f}s, "
+          f"output {format_bytes(output_bytes)} (seed {index['seed']})")
+    print(f"Scenario index: {os.path.join(output_dir, SCENARIO_INDEX)}")
+    
+    print("\nEnding balance and simple return across scenarios (p5 / p50 / p95):")
+    for bucket, summary in index['summary'].items():
+        balance, simple_return = summary['endingBalance'], summary['simpleReturn']
+        print(f"  {bucket}: ${balance['p5']:,.2f} / ${balance['p50']:,.2f} / ${balance['p95']:,.2f}, "
+              f"{simple_return['p5'] * 100:+.2f}% / {simple_return['p50'] * 100:+.2f}% / {simple_return['p95'] * 100:+.2f}%")
+        for regime, regime_summary in summary.get('regimes', {}).items():
+            regime_return = regime_summary['simpleReturn']
+            print(f"    {regime}: {regime_return['p5'] * 100:+.2f}% / {regime_return['p50'] * 100:+.2f}% / {regime_return['p95'] * 100:+.2f}%")
+    
+    if STAGE_TIMER.enabled:
+        print()
+        print('\n'.join(STAGE_TIMER.report()))
+
+def run(args):
+    """Generate mock data for parsed command line options"""
+    demo_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    if args.list_profiles:
+        for name, profile in SCALE_PROFILES.items():
+            print(f"  {name}: {profile['description']}")
+        return
+    
+    try:
+        profile_name, profile = load_profile(args.profile)
+        buckets = expand_profile(profile)
+    except (KeyError, TypeError, ValueError) as e:
+        print(f"Error: invalid profile '{args.profile}': {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    is_demo = profile_name == 'demo'
+    output_file = args.output or os.path.join(demo_dir, 'mock-data.json' if is_demo else f'mock-data-{profile_name}.json')
+    if args.shards:
+        output_file = os.path.join(args.shards, SHARD_MANIFEST)
+    config_file = args.doc or (os.path.join(demo_dir, 'BUCKET_CONFIGURATION.md') if is_demo else None)
+    indent = None if args.compact else 2
+    as_of = args.as_of or datetime.now()
+    try:
+        holidays = load_holidays(args.holidays) if args.holidays else ()
+    except (OSError, ValueError) as e:
+        print(f"Error: invalid holidays file: {e}", file=sys.stderr)
+        sys.exit(1)
+    # One trading-day index shared by every goal of the run
+    calendar = trading_calendar(as_of, buckets_span_days(buckets), args.skip_weekends, holidays)
+    
+    if args.scenarios:
+        run_scenarios(args, profile_name, buckets, as_of, calendar, indent)
+        return
+    
+    # Resolve the seed here so unseeded output still records one that reproduces it
+    seed = args.seed if args.seed is not None else random.randrange(2**63)
+    try:
+        metadata = generator_metadata(profile_name, args.engine, seed, as_of, calendar)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    cache = None
+    if args.cache:
+        if args.seed is None or args.append:
+            print("Note: --cache needs a fixed --seed and does not apply to --append; generating without the cache", file=sys.stderr)
+        else:
+            cache = GenerationCache(args.cache)
+    destinations = {'output': output_file, 'doc': config_file, 'columnar': args.columnar, 'shards': args.shards}
     
+    started = time.perf_counter()
+    try:
+        if cache:
+            mode = 'shards' if args.shards else 'lazy' if args.lazy_series else 'stream' if args.stream else 'json'
+            run_key = cache.run_key(profile, args.seed, args.engine, as_of, {
+                'mode': mode,
+                'shardBy': args.shard_by if args.shards else None,
+                'compact': args.compact,
+                'columnar': bool(args.columnar),
+                'doc': bool(config_file),
+                'calendar': calendar.options()
+            })
+            with STAGE_TIMER.stage('cache_restore'):
+                restored = cache.restore_run(run_key, destinations)
+            if restored:
+                record, rewritten = restored
+                restore_seconds = time.perf_counter() - started
+                print(f"Mock data restored from cache to {output_file} ({rewritten} of {len(record['artifacts'])} file(s) rewritten)")
+                print(f"Profile '{profile_name}': {record['points']:,} points across {record['goals']:,} goals, output {format_bytes(os.path.getsize(output_file))}")
+                print(f"Generation cache: run hit ({run_key[:12]}), {max(record['elapsedSeconds'] - restore_seconds, 0):.2f}s saved")
+                if STAGE_TIMER.enabled:
+                    print()
+                    print('\n'.join(STAGE_TIMER.report()))
+                return
+        
+        if args.append:
+            if not os.path.isfile(output_file):
+                raise ValueError(f'--append needs an existing file at {output_file}')
+            with STAGE_TIMER.stage('json_load'):
+                with open(output_file) as f:
+                    mock_data = json.load(f)
+            appended = append_mock_data(mock_data, as_of=as_of, seed=seed, calendar=calendar)
+            if 'generator' in mock_data:
+                mock_data['generator'].setdefault('appends', []).append(append_metadata(seed, as_of, calendar))
+            metadata = mock_data.get('generator')
+            print(f"Appended {appended:,} points across {len(mock_data['performance'])} goals (series now end {calendar.dates[-1]})")
+            with STAGE_TIMER.stage('json_write'):
+                write_mock_data(mock_data, output_file, indent=indent)
+            if args.columnar:
+                with STAGE_TIMER.stage('columnar_write'):
+                    write_columnar_time_series(mock_data['performanceTimeSeries'], args.columnar)
+        elif args.shards:
+            mock_data = write_sharded_mock_data(args.shards, buckets=buckets, engine=args.engine, seed=seed,
+                                                workers=args.workers, as_of=as_of, shard_by=args.shard_by, indent=indent,
+                                                cache=cache, calendar=calendar, metadata=metadata)
+        elif args.lazy_series:
+            mock_data = generate_lazy_mock_data(profile, engine=args.engine, seed=seed, workers=args.workers,
+                                                as_of=as_of, profile_name=profile_name, cache=cache, calendar=calendar)
+            mock_data = {'generator': metadata, **mock_data}
+            with STAGE_TIMER.stage('json_write'):
+                write_mock_data(mock_data, output_file, indent=indent)
+        elif args.stream:
+            goals = iter_goals(args.engine, seed=seed, workers=args.workers, as_of=as_of, buckets=buckets, cache=cache,
+                               calendar=calendar)
+            columnar_writer = ColumnarTimeSeriesWriter(args.columnar) if args.columnar else None
+            try:
+                mock_data = write_mock_data_streaming(goals, output_file, indent=indent, columnar_writer=columnar_writer,
+                                                      metadata=metadata)
+            finally:
+                if columnar_writer:
+                    columnar_writer.close()
+        else:
+            mock_data = generate_mock_data(engine=args.engine, seed=seed, workers=args.workers, as_of=as_of,
+                                           buckets=buckets, cache=cache, calendar=calendar)
+            mock_data = {'generator': metadata, **mock_data}
+            # Save to file
+            with STAGE_TIMER.stage('json_write'):
+                write_mock_data(mock_data, output_file, indent=indent)
+            if args.columnar:
+                with STAGE_TIMER.stage('columnar_write'):
+                    write_columnar_time_series(mock_data['performanceTimeSeries'], args.columnar)
+    except (RuntimeError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+    STAGE_TIMER.set_output_bytes('json_write', os.path.getsize(output_file))
+    if args.columnar:
+        STAGE_TIMER.set_output_bytes('columnar_write', os.path.getsize(args.columnar))
+    
+    num_points = sum(summarize_time_series(ts)[2] for ts in mock_data['performanceTimeSeries'].values())
     print(f"Mock data generated and saved to {output_file}")
-    print(f"Generated {len(mock_data['performance'])} goals across House Purchase and Retirement buckets")
+    print(f"Generated {len(mock_data['performance'])} goals across {len(buckets)} buckets")
+    print(f"Profile '{profile_name}': {num_points:,} points in {elapsed:.2f}s, output {format_bytes(os.path.getsize(output_file))}")
+    if not args.append:
+        print(f"Engine '{metadata['engine']}', seed {seed}, as of {as_of.date().isoformat()} (recorded under 'generator')")
+    if args.columnar:
+        print(f"Columnar time series saved to {args.columnar} ({format_bytes(os.path.getsize(args.columnar))})")
+    shard_files = []
+    if args.shards:
+        with open(output_file) as f:
+            shards = json.load(f)['shards']
+        shard_files = [shard['file'] for shard in shards]
+        print(f"Series split into {len(shards):,} {args.shard_by} shard(s) under {os.path.join(args.shards, SHARD_SERIES_DIR)} ({format_bytes(sum(shard['bytes'] for shard in shards))})")
+    if args.lazy_series:
+        print(f"Series not stored: regenerate them on demand with LazyTimeSeries (seed {mock_data['lazySeries']['seed']})")
     
     # Print summary
     print("\nSummary:")
+    goal_index = build_goal_index(mock_data)
     buckets = {}
-    for goal in mock_data['investible']:
+    for entry in goal_index.values():
+        goal = entry['investible']
         bucket = goal['goalName'].split(' - ')[0]
         if bucket not in buckets:
             buckets[bucket] = {'count': 0, 'ending_balance': 0, 'invested': 0, 'returns': 0}
         buckets[bucket]['count'] += 1
         buckets[bucket]['ending_balance'] += goal['totalInvestmentAmount']['display']['amount']
-    
-    # Add returns and invested amounts
-    for goal in mock_data['performance']:
-        goal_name = next(g['goalName'] for g in mock_data['investible'] if g['goalId'] == goal['goalId'])
-        bucket = goal_name.split(' - ')[0]
-        buckets[bucket]['returns'] += goal['totalCumulativeReturn']['amount']
         
-        # Get invested from performance time series
-        perf_ts = mock_data['performanceTimeSeries'].get(goal['goalId'], {})
-        buckets[bucket]['invested'] += perf_ts.get('cumulativeInvested', 0)
+        # Add returns and invested amounts (invested comes from the performance time series)
+        if entry['performance']:
+            buckets[bucket]['returns'] += entry['performance']['totalCumulativeReturn']['amount']
+        buckets[bucket]['invested'] += entry['timeSeries'].get('cumulativeInvested', 0)
     
     for bucket, data in buckets.items():
         growth_pct = (data['returns'] / data['invested'] * 100) if data['invested'] > 0 else 0
         print(f"  {bucket}: {data['count']} goals, ${data['invested']:,.2f} invested, ${data['returns']:,.2f} returns ({growth_pct:+.2f}%), ${data['ending_balance']:,.2f} ending balance")
     
     # Generate bucket configuration documentation
-    config_file = os.path.join(os.path.dirname(__file__), 'BUCKET_CONFIGURATION.md')
-    generate_bucket_config_doc(mock_data, config_file)
-    print(f"\nBucket configuration saved to {config_file}")
+    if config_file:
+        with STAGE_TIMER.stage('doc_write'):
+            generate_bucket_config_doc(mock_data, config_file, goal_index=goal_index, metadata=metadata)
+        STAGE_TIMER.set_output_bytes('doc_write', os.path.getsize(config_file))
+        print(f"\nBucket configuration saved to {config_file}")
+    
+    if cache:
+        roles = ['output'] + [role for role in ('doc', 'columnar') if destinations[role]]
+        roles += [f'shard:{shard_file}' for shard_file in shard_files]
+        cache.store_run(run_key, roles, destinations, {
+            'profile': profile_name,
+            'goals': len(mock_data['performance']),
+            'points': num_points,
+            'elapsedSeconds': round(time.perf_counter() - started, 6)
+        })
+        print(f"\nGeneration cache: run miss ({run_key[:12]}), {cache.format_goal_stats()}")
+    
+    if STAGE_TIMER.enabled:
+        print()
+        print('\n'.join(STAGE_TIMER.report()))
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Async Python mock Endowus API server for the Goal Portfolio Viewer demo
+
+Python counterpart of mock-server.js for machines without Node. Serves the
+demo pages and the mock Endowus endpoints straight from the generator's
+output:
+
+    /v1/goals/performance      performance list
+    /v2/goals/investible       investible list
+    /v1/goals                  summary list
+    /v1/performance?goalId=ID  one goal's performanceTimeSeries entry
+
+Goals are indexed by goalId; a goal's series is only expanded (from a
+columnar .gpvts file when given, from its shard when --data is a sharded
+manifest, or regenerated from (seed, goalId, profile) for data written with
+--lazy-series) and serialized on its first request.
+Serialized bodies are kept in a size-bounded LRU cache together with a
+gzip-precompressed copy and an ETag, so repeat requests cost a dictionary
+lookup.
+
+Usage: python3 demo/mock-api-server.py [--data mock-data.json|SHARD_DIR] [--columnar mock-data.gpvts]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import signal
+import sys
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from mock_tools import DEMO_DIR, JsonStream, load_generator
+
+DEFAULT_PORT = 8765
+REPO_ROOT = os.path.dirname(DEMO_DIR)
+
+CONTENT_TYPES = {
+    '.html': 'text/html',
+    '.js': 'text/javascript',
+    '.json': 'application/json',
+    '.css': 'text/css',
+    '.png': 'image/png',
+    '.svg': 'image/svg+xml'
+}
+
+STATUS_TEXT = {
+    200: 'OK',
+    304: 'Not Modified',
+    400: 'Bad Request',
+    403: 'Forbidden',
+    404: 'Not Found',
+    405: 'Method Not Allowed'
+}
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 1024
+DEFAULT_CACHE_MB = 256
+LIST_KEYS = ('performance', 'investible', 'summary')
+
+class CachedResponse:
+    """A serialized response body with its gzip copy and ETag"""
+
+    __slots__ = ('body', 'gzip_body', 'etag', 'content_type')
+
+    def __init__(self, body, content_type='application/json'):
+        self.body = body
+        self.gzip_body = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self.content_type = content_type
+
+    def size(self):
+        return len(self.body) + (len(self.gzip_body) if self.gzip_body else 0)
+
+def read_mock_data(path, skip_series=False):
+    """
+    Read a mock data document one top-level member at a time
+
+    performanceTimeSeries is decoded entry by entry, so no single value has to
+    hold every series. With skip_series its entries are dropped as they are
+    read and reading stops once the goal lists are in: a fixture whose series
+    come from a columnar file costs its goal lists, not its series.
+    """
+    mock_data = {}
+    with JsonStream(path) as stream:
+        for key in stream.object():
+            if key == 'performanceTimeSeries':
+                series = {}
+                for goal_id in stream.object():
+                    entry = stream.value()
+                    if not skip_series:
+                        series[goal_id] = entry
+                mock_data[key] = series
+            else:
+                mock_data[key] = stream.value()
+            if skip_series and all(name in mock_data for name in LIST_KEYS):
+                break
+    return mock_data
+
+class MockApiData:
+    """
+    Mock Endowus API backed by generator output
+
+    The goal lists are serialized up front; per-goal performance bodies are
+    built on first request and held in an LRU cache bounded by cache_bytes.
+    data_path is a generator JSON file, or a sharded layout (its directory or
+    manifest.json).
+    """
+
+    def __init__(self, data_path, columnar_path=None, cache_bytes=DEFAULT_CACHE_MB * 1024 * 1024):
+        generator = load_generator()
+        if os.path.isdir(data_path):
+            data_path = os.path.join(data_path, generator.SHARD_MANIFEST)
+        # Series come from the columnar file, so only the goal lists are read
+        mock_data = read_mock_data(data_path, skip_series=bool(columnar_path))
+        self.lists = {
+            path: CachedResponse(json.dumps(records, separators=(',', ':')).encode('utf-8'))
+            for path, records in (('/v1/goals/performance', mock_data['performance']),
+                                  ('/v2/goals/investible', mock_data['investible']),
+                                  ('/v1/goals', mock_data['summary']))
+        }
+        # Reader that expands a goal's series on request (columnar file, shards or regeneration)
+        self.source = None
+        if columnar_path:
+            self.source = generator.ColumnarTimeSeries(columnar_path)
+        elif mock_data.get('format') == generator.SHARD_FORMAT:
+            self.source = generator.ShardedTimeSeries(data_path)
+        elif mock_data.get('lazySeries'):
+            # Series are regenerated per request; the response cache below is the only cache
+            self.source = generator.LazyTimeSeries.from_source(mock_data['lazySeries'], max_points=0)
+        # goalId -> performanceTimeSeries entry (None when the source expands it)
+        if self.source is not None:
+            self.series = dict.fromkeys(self.source.goal_ids())
+        else:
+            self.series = mock_data.get('performanceTimeSeries') or {}
+        self.responses = generator.LRUCache(cache_bytes, size_of=CachedResponse.size)
+
+    def goal_count(self):
+        return len(self.series)
+
+    def _goal_entry(self, goal_id):
+        entry = self.series[goal_id]
+        if entry is None:
+            return self.source.get(goal_id)
+        return entry
+
+    def _goal_response(self, goal_id):
+        payload = self._goal_entry(goal_id)
+        return CachedResponse(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+    def response(self, path, query):
+        """Cached response for an API path, or None when the path is not an API endpoint"""
+        if path in self.lists:
+            return self.lists[path]
+        if path != '/v1/performance':
+            return None
+        goal_id = (query.get('goalId') or [None])[0]
+        if not goal_id or goal_id not in self.series:
+            return None
+        return self.responses.get_or_create(goal_id, lambda: self._goal_response(goal_id))
+
+    def close(self):
+        # Only ColumnarTimeSeries holds a file open; the other sources have nothing to release
+        close_source = getattr(self.source, 'close', None)
+        if close_source is not None:
+            close_source()
+
+def resolve_static_file(request_path):
+    """Map a request path to a demo file (same routes as mock-server.js)"""
+    if request_path in ('/dashboard', '/dashboard/'):
+        return os.path.join(DEMO_DIR, 'dashboard', 'index.html')
+    if request_path == '/':
+        return os.path.join(DEMO_DIR, 'index.html')
+    if request_path.startswith('/tampermonkey/'):
+        return os.path.join(REPO_ROOT, request_path.lstrip('/'))
+    return os.path.join(DEMO_DIR, request_path.lstrip('/'))
+
+def is_safe_path(base_dir, target_path):
+    """True when target_path resolves inside base_dir"""
+    resolved = os.path.realpath(target_path)
+    return resolved == base_dir or resolved.startswith(base_dir + os.sep)
+
+class MockApiServer:
+    """HTTP/1.1 server on asyncio streams (keep-alive, GET/HEAD only)"""
+
+    def __init__(self, api, verbose=False):
+        self.api = api
+        self.verbose = verbose
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self.send(writer, 400, b'Bad request', 'text/plain', keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                if headers.get('content-length'):
+                    await reader.readexactly(int(headers['content-length']))
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+                await self.respond(writer, method, target, headers, keep_alive)
+                if self.verbose:
+                    print(f'{method} {target}')
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def respond(self, writer, method, target, headers, keep_alive):
+        if method not in ('GET', 'HEAD'):
+            return await self.send(writer, 405, b'Method not allowed', 'text/plain', keep_alive=keep_alive)
+        head_only = method == 'HEAD'
+        parsed = urlsplit(target)
+        path = unquote(parsed.path)
+
+        cached = self.api.response(path, parse_qs(parsed.query))
+        if cached is not None:
+            if headers.get('if-none-match') == cached.etag:
+                return await self.send(writer, 304, b'', None, keep_alive=keep_alive, etag=cached.etag)
+            accepts_gzip = 'gzip' in headers.get('accept-encoding', '')
+            if accepts_gzip and cached.gzip_body is not None:
+                return await self.send(writer, 200, cached.gzip_body, cached.content_type, keep_alive=keep_alive,
+                                       etag=cached.etag, encoding='gzip', head_only=head_only)
+            return await self.send(writer, 200, cached.body, cached.content_type, keep_alive=keep_alive,
+                                   etag=cached.etag, head_only=head_only)
+        if path == '/v1/performance':
+            return await self.send(writer, 404, b'Not found', 'text/plain', keep_alive=keep_alive)
+
+        file_path = resolve_static_file(path)
+        base_dir = REPO_ROOT if path.startswith('/tampermonkey/') else DEMO_DIR
+        if not is_safe_path(base_dir, file_path):
+            return await self.send(writer, 403, b'Forbidden', 'text/plain', keep_alive=keep_alive)
+        try:
+            with open(file_path, 'rb') as f:
+                body = f.read()
+        except OSError:
+            return await self.send(writer, 404, b'Not found', 'text/plain', keep_alive=keep_alive)
+        content_type = CONTENT_TYPES.get(os.path.splitext(file_path)[1], 'text/plain')
+        return await self.send(writer, 200, body, content_type, keep_alive=keep_alive, head_only=head_only)
+
+    async def send(self, writer, status, body, content_type, keep_alive=True, etag=None, encoding=None, head_only=False):
+        lines = [f'HTTP/1.1 {status} {STATUS_TEXT.get(status, "")}']
+        if content_type:
+            lines.append(f'Content-Type: {content_type}')
+        lines.append(f'Content-Length: {len(body)}')
+        if etag:
+            lines.append(f'ETag: {etag}')
+            lines.append('Cache-Control: no-cache')
+            lines.append('Vary: Accept-Encoding')
+        if encoding:
+            lines.append(f'Content-Encoding: {encoding}')
+        lines.append('Connection: ' + ('keep-alive' if keep_alive else 'close'))
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        if not head_only and status != 304:
+            writer.write(body)
+        await writer.drain()
+
+async def serve(api, host, port, verbose=False):
+    """Run the server until cancelled"""
+    server = MockApiServer(api, verbose=verbose)
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    bound_port = listener.sockets[0].getsockname()[1]
+    print(f"Serving {api.goal_count():,} goals")
+    print(f"Demo server running at http://localhost:{bound_port}/dashboard/")
+    async with listener:
+        await listener.serve_forever()
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Async mock Endowus API server for the demo')
+    parser.add_argument('--data', default=os.environ.get('GPV_MOCK_DATA') or os.path.join(DEMO_DIR, 'mock-data.json'),
+                        help='Generator output JSON, or a sharded layout directory or its manifest.json '
+                             '(default: $GPV_MOCK_DATA or demo/mock-data.json)')
+    parser.add_argument('--columnar', default=None, metavar='PATH',
+                        help='Columnar .gpvts file to expand goal series from on demand')
+    parser.add_argument('--cache-mb', type=float, default=DEFAULT_CACHE_MB,
+                        help=f'Memory for cached per-goal responses in MB (default: {DEFAULT_CACHE_MB})')
+    parser.add_argument('--host', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f'Port (default: {DEFAULT_PORT})')
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Start the mock API server"""
+    args = parse_args(argv)
+    try:
+        api = MockApiData(args.data, columnar_path=args.columnar, cache_bytes=int(args.cache_mb * 1024 * 1024))
+    except (OSError, ValueError, KeyError, RuntimeError) as e:
+        print(f"Error: failed to load mock data: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Stop cleanly (and print cache stats) on SIGTERM as well as Ctrl+C
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        asyncio.run(serve(api, args.host, args.port, verbose=args.verbose))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"\nGoal response cache: {api.responses.format_stats('bytes')}")
+        api.close()
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,10 @@
  * Demo server with mock Endowus endpoints for E2E testing.
  *
  * Usage: node mock-server.js
+ *
+ * Set GPV_MOCK_DATA to serve another generator output, e.g. the manifest.json
+ * of a sharded layout (generate-mock-data.py --shards DIR). Sharded goals are
+ * read from their shard on request instead of being loaded up front.
  */
 
 const fs = require('fs');
@@ -22,10 +26,37 @@ const CONTENT_TYPES = {
     '.svg': 'image/svg+xml'
 };
 
-function loadMockData(demoDir) {
-    const mockPath = path.join(demoDir, 'mock-data.json');
+const SHARD_FORMAT = 'gpv-mock-shards';
+
+function loadMockData(demoDir, dataPath) {
+    const mockPath = dataPath || path.join(demoDir, 'mock-data.json');
     const contents = fs.readFileSync(mockPath, 'utf-8');
-    return JSON.parse(contents);
+    const mockData = JSON.parse(contents);
+    if (mockData.format === SHARD_FORMAT) {
+        mockData.shardDir = path.dirname(mockPath);
+    }
+    return mockData;
+}
+
+// goalId comes from the query string: ignore inherited keys such as __proto__ or constructor
+function ownValue(object, key) {
+    return Object.prototype.hasOwnProperty.call(object, key) ? object[key] : null;
+}
+
+function readShardEntry(mockData, goalId) {
+    const goal = ownValue(mockData.goals, goalId);
+    if (!goal) {
+        return null;
+    }
+    const shardPath = path.join(mockData.shardDir, mockData.shards[goal.shard].file);
+    const buffer = Buffer.alloc(goal.length);
+    const fd = fs.openSync(shardPath, 'r');
+    try {
+        fs.readSync(fd, buffer, 0, goal.length, goal.offset);
+    } finally {
+        fs.closeSync(fd);
+    }
+    return JSON.parse(buffer.toString('utf-8'));
 }
 
 function sendJson(res, payload, statusCode = 200) {
@@ -39,10 +70,13 @@ function sendText(res, message, statusCode) {
 }
 
 function getPerformanceSeries(mockData, goalId) {
+    if (mockData.shardDir && goalId) {
+        return readShardEntry(mockData, goalId);
+    }
     if (!mockData.performanceTimeSeries || !goalId) {
         return null;
     }
-    return mockData.performanceTimeSeries[goalId] || null;
+    return ownValue(mockData.performanceTimeSeries, goalId);
 }
 
 function resolveStaticFile(demoDir, repoRoot, requestPath) {
@@ -70,9 +104,10 @@ function startDemoServer({
     demoDir = DEMO_DIR,
     repoRoot = REPO_ROOT,
     port = DEFAULT_PORT,
+    dataPath = process.env.GPV_MOCK_DATA,
     onRequest
 } = {}) {
-    const mockData = loadMockData(demoDir);
+    const mockData = loadMockData(demoDir, dataPath);
 
     const server = http.createServer((req, res) => {
         const parsed = url.parse(req.url, true);
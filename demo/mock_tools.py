@@ -0,0 +1,222 @@
+"""
+Helpers shared by the demo's Python tools
+
+The benchmark, server and validator scripts live next to this module and
+import it directly (a script's own directory is on sys.path):
+
+    from mock_tools import load_generator, parse_int_list
+"""
+
+import argparse
+import codecs
+import importlib.util
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+
+DEMO_DIR = os.path.dirname(os.path.abspath(__file__))
+GENERATOR_PATH = os.path.join(DEMO_DIR, 'generate-mock-data.py')
+
+# Goals per bucket in benchmark grid cells
+GOALS_PER_BUCKET = 50
+
+CHUNK_SIZE = 1 << 20
+# A single value (goal record, returnsTable, point) larger than this is reported rather than buffered
+MAX_VALUE_CHARS = 64 << 20
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+def load_generator():
+    """Import generate-mock-data.py (its file name is not a valid module name)"""
+    spec = importlib.util.spec_from_file_location('generate_mock_data', GENERATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so process-pool workers can pickle references to its functions
+    sys.modules['generate_mock_data'] = module
+    spec.loader.exec_module(module)
+    return module
+
+def git_revision():
+    """Short git revision of the working tree, or None outside a checkout"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=DEMO_DIR,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def grid_buckets(generator, goals, days):
+    """Bucket definitions for a grid cell: `goals` goals in buckets of up to GOALS_PER_BUCKET"""
+    goals_per_bucket = min(goals, GOALS_PER_BUCKET)
+    bucket_count = math.ceil(goals / goals_per_bucket)
+    buckets = generator.expand_profile({
+        'bucketCount': bucket_count,
+        'goalsPerBucket': goals_per_bucket,
+        'horizonDays': days
+    })
+    # Trim the last bucket so the cell has exactly `goals` goals
+    excess = bucket_count * goals_per_bucket - goals
+    if excess:
+        name, horizon, goal_types = buckets[-1]
+        buckets[-1] = (name, horizon, goal_types[:-excess])
+    return buckets
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+def parse_int_list(value):
+    """argparse type for comma separated positive integers"""
+    try:
+        values = [int(item) for item in value.split(',') if item.strip()]
+    except ValueError:
+        values = []
+    if not values or min(values) < 1:
+        raise argparse.ArgumentTypeError(f"invalid list '{value}' (expected comma separated positive integers)")
+    return values
+
+class JsonStream:
+    """
+    Incremental reader over a JSON file
+
+    Containers are walked with object() and array(), which yield as each
+    member starts; the caller must consume the member (value(), or a nested
+    object()/array()) before asking for the next. value() decodes one
+    complete value with the C decoder, reading more of the file as needed.
+
+    Usage:
+        with JsonStream(path) as stream:
+            for key in stream.object():
+                value = stream.value()
+    """
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        self._file = open(path, 'rb')
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def error(self, message):
+        return ValueError(f'{self.path}: {message} at character {self.offset + self.pos:,}')
+
+    def _fill(self):
+        chunk = self._file.read(self.chunk_size)
+        self.bytes_read += len(chunk)
+        self.eof = not chunk
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + self._decoder.decode(chunk, final=self.eof)
+        self.pos = 0
+
+    def peek(self):
+        """Next non-whitespace character, without consuming it ('' at the end of the file)"""
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self.error(f"expected '{char}'")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+                # A number that runs to the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise self.error(f'invalid JSON ({e.msg})') from None
+            if len(self.buffer) - self.pos > MAX_VALUE_CHARS:
+                raise self.error('value too large to decode (or malformed)')
+            self._fill()
+
+    def buffered_value(self):
+        """
+        Decode the next value if it ends within the buffer (after at most one
+        more read), else consume nothing and return (False, None)
+
+        Returns:
+            Tuple of (decoded, value)
+        """
+        self.peek()
+        for attempt in range(2):
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return True, value
+            except json.JSONDecodeError:
+                if self.eof:
+                    break
+            if attempt or len(self.buffer) - self.pos > self.chunk_size:
+                break
+            self._fill()
+        return False, None
+
+    def _members(self, close):
+        char = self.peek()
+        self.pos += 1
+        if char == close:
+            return False
+        if char != ',':
+            raise self.error(f"expected ',' or '{close}'")
+        return True
+
+    def object(self):
+        """Yield each key of an object; its value must be consumed before the next"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self.error('expected an object key')
+            key = self.value()
+            self.expect(':')
+            yield key
+            if not self._members('}'):
+                return
+
+    def array(self):
+        """Yield the index of each array item; the item must be consumed before the next"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if not self._members(']'):
+                return
+
+    def end(self):
+        """Check nothing but whitespace follows the document"""
+        if self.peek():
+            raise self.error('unexpected data after the document')
+
+    def close(self):
+        self._file.close()
@@ -23,6 +23,16 @@ echo "✓ Copied userscript to demo directory"
 cat "$USERSCRIPT_SRC" | sed 's/function shouldShowButton() {/function shouldShowButton() { if (window.__GPV_DEMO_MODE__) return true;/' > "$USERSCRIPT_DEMO"
 echo "✓ Created demo version with demo mode enabled"
 
+# The committed mock-data.json and BUCKET_CONFIGURATION.md come from:
+#   python3 demo/generate-mock-data.py --engine numpy --seed 1 --as-of 2026-10-01
+# (also recorded under "generator" in mock-data.json)
+
+# Optionally regenerate mock data (reuses cached output when nothing changed)
+if [ -n "$GPV_MOCK_SEED" ]; then
+    python3 "$DEMO_DIR/generate-mock-data.py" --cache --engine numpy --seed "$GPV_MOCK_SEED" ${GPV_MOCK_AS_OF:+--as-of "$GPV_MOCK_AS_OF"}
+    echo "✓ Mock data ready"
+fi
+
 echo ""
 echo "Demo files prepared successfully!"
 echo "You can now open demo-clean.html in a web server"
@@ -59,11 +59,10 @@ def main():
     print("\n" + "-"*70)
     print("MANUAL SCREENSHOT INSTRUCTIONS")
     print("-"*70)
-    print("\n1. Start a local web server:")
-    print("   cd demo")
-    print("   python3 -m http.server 8080")
+    print("\n1. Start the demo mock server:")
+    print("   python3 demo/mock-api-server.py")
     print("\n2. Open in browser:")
-    print("   http://localhost:8080/demo-clean.html")
+    print("   http://localhost:8765/demo-clean.html")
     print("\n3. Wait for page to load and click '📊 Portfolio Viewer' button")
     print("\n4. Take screenshots:")
     print("\n   a) Summary View:")
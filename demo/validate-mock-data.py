@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+"""
+Streaming validator for mock data fixtures
+
+Checks what tampermonkey/__tests__/mockData.test.js checks, plus series-level
+invariants, in one pass over the file:
+
+    - performance, investible, summary and performanceTimeSeries hold the same goalIds
+    - every record has the fields (and types) the userscript reads
+    - each series is non-empty, with YYYY-MM-DD dates in increasing order
+      and non-negative amounts and cumulative net investment
+    - endingBalance (performance totalInvestmentValue, investible
+      totalInvestmentAmount) equals the last point's amount, and the entry's
+      cumulativeInvested, totalCumulativeReturnAmount/Percent agree with it
+    - performance totalCumulativeReturn and simpleRateOfReturnPercent, and
+      returnsTable.twr.allTimeValue, match the series
+    - twr windows are finite (and, with --check-ranges, in the suite's
+      realistic ranges, which longer-horizon profiles can exceed)
+
+The demo-profile bucket checks of the suite are not repeated, so fixtures of
+any profile validate. The file is read in chunks and decoded one small value
+(a goal record, a series point) at a time, so memory does not grow with the
+length of the series. Nor does it grow with the number of goals: endpoints
+are checked against each other through order-independent digests of
+(goalId, figures) (GoalDigests), which say that some goal disagrees but not
+which. --by-goal keeps the figures per goal instead (GoalTable, about 700
+bytes a goal) to name the goals and report duplicates.
+
+Accepts a generator JSON file (indented, compact, --stream or --lazy-series
+output), a sharded layout (its directory or manifest.json; every shard is
+read and checked against the manifest's goal index) or a columnar .gpvts
+file (series and entry checks only, since it holds no goal lists):
+
+    python3 demo/validate-mock-data.py demo/mock-data.json
+    python3 demo/validate-mock-data.py demo/mock-data-large demo/mock-data-large.gpvts
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+
+from mock_tools import JsonStream, load_generator
+
+DEFAULT_MAX_ERRORS = 20
+DEFAULT_PROGRESS_INTERVAL = 2.0
+TWR_WINDOWS = ['allTimeValue', 'oneMonthValue', 'threeMonthValue', 'sixMonthValue', 'ytdValue', 'oneYearValue', 'threeYearValue']
+# Tolerances used by mockData.test.js
+RETURN_TOLERANCE = 0.001
+MAX_RETURN_AMOUNT = 1000000
+# Balances are compared to the cent
+BALANCE_TOLERANCE = 0.005
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}$')
+GOAL_NAME_PATTERN = re.compile(r'[^-]+ - ')
+NUMBER_TYPES = (int, float)
+# Which endpoints a goal has been seen in
+PERFORMANCE, INVESTIBLE, SUMMARY, SERIES = 1, 2, 4, 8
+ENDPOINT_NAMES = {PERFORMANCE: 'performance', INVESTIBLE: 'investible', SUMMARY: 'summary', SERIES: 'performanceTimeSeries'}
+# Figures matched across endpoints: name -> (what side 0 records, what side 1 records)
+MATCHES = {
+    'performance': ('performance totalInvestmentValue/totalCumulativeReturn', "the last point's amount/amount - invested"),
+    'investible': ('investible totalInvestmentAmount', "the last point's amount"),
+    'index': ('manifest goal index numPoints/startDate/endDate', 'the shard series')
+}
+DIGEST_MASK = (1 << 64) - 1
+
+def is_number(value):
+    return type(value) in NUMBER_TYPES
+
+def to_cent(value):
+    """Amount rounded to the cent (balances are compared to the cent), or None when not a number"""
+    return round(value, 2) if is_number(value) else None
+
+def get_path(record, *keys):
+    """record[key0][key1]... or None when any level is missing"""
+    for key in keys:
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+class Progress:
+    """Periodic progress lines (bytes, goals, points, throughput) on stderr"""
+
+    def __init__(self, total_bytes, interval=DEFAULT_PROGRESS_INTERVAL, out=sys.stderr):
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.out = out
+        self.started = time.perf_counter()
+        self.next_report = self.started + interval if interval > 0 else math.inf
+
+    def update(self, bytes_done, goals, points):
+        now = time.perf_counter()
+        if now < self.next_report:
+            return
+        self.next_report = now + self.interval
+        elapsed = now - self.started
+        rate = bytes_done / elapsed if elapsed > 0 else 0
+        line = f'  {bytes_done / 1024 / 1024:,.1f} MB'
+        if self.total_bytes:
+            line += f' / {self.total_bytes / 1024 / 1024:,.1f} MB ({bytes_done / self.total_bytes:.0%})'
+        line += f', {goals:,} goals, {points:,} points, {rate / 1024 / 1024:,.1f} MB/s'
+        if self.total_bytes and rate > 0:
+            line += f', ~{max(self.total_bytes - bytes_done, 0) / rate:,.0f}s left'
+        print(line, file=self.out, flush=True)
+
+class GoalDigests:
+    """
+    Constant-memory cross-endpoint checks
+
+    Each endpoint adds a hash of every goalId it holds to a running sum, and
+    each matched figure adds a hash of (goalId, values) to the sum of its side.
+    The sums are independent of order, so they agree exactly when both sides
+    hold the same goals with the same values; a mismatch cannot say which
+    goals differ (GoalTable can) and a goal listed twice in one endpoint is
+    only caught through the goal counts.
+    """
+
+    def __init__(self):
+        self.ids = {endpoint: 0 for endpoint in ENDPOINT_NAMES}
+        self.matches = {name: [0, 0] for name in MATCHES}
+
+    @staticmethod
+    def _hash(*values):
+        return int.from_bytes(hashlib.blake2b(repr(values).encode(), digest_size=8).digest(), 'little')
+
+    def add(self, endpoint, goal_id):
+        """Note that endpoint holds goal_id (duplicates cannot be told apart)"""
+        self.ids[endpoint] = (self.ids[endpoint] + self._hash(goal_id)) & DIGEST_MASK
+        return False
+
+    def match(self, name, side, goal_id, *values):
+        sums = self.matches[name]
+        sums[side] = (sums[side] + self._hash(goal_id, *values)) & DIGEST_MASK
+
+    def check(self, validator):
+        counts = validator.counts
+        ids_match = True
+        for endpoint in ENDPOINT_NAMES:
+            name = ENDPOINT_NAMES[endpoint]
+            if self.ids[endpoint] != self.ids[PERFORMANCE] and counts[name] == counts['performance']:
+                validator.error(f'{name} holds different goalIds from performance (rerun with --by-goal to list them)')
+            ids_match = ids_match and self.ids[endpoint] == self.ids[PERFORMANCE]
+        if not ids_match:
+            return  # Every figure check would fail as well
+        for name, (recorded, expected) in MATCHES.items():
+            if self.matches[name][0] != self.matches[name][1]:
+                validator.error(f'{recorded} != {expected} for some goal (rerun with --by-goal to list them)')
+
+class GoalTable:
+    """
+    Cross-endpoint checks that name the goals (--by-goal)
+
+    Keeps the endpoints each goal was seen in and its matched figures, so
+    memory grows with the number of goals (a few hundred bytes each).
+    """
+
+    def __init__(self):
+        self.goals = {}
+
+    def _goal(self, goal_id):
+        goal = self.goals.get(goal_id)
+        if goal is None:
+            goal = self.goals[goal_id] = [0, {}]
+        return goal
+
+    def add(self, endpoint, goal_id):
+        """Note that endpoint holds goal_id; True when it already did"""
+        goal = self._goal(goal_id)
+        duplicate = bool(goal[0] & endpoint)
+        goal[0] |= endpoint
+        return duplicate
+
+    def match(self, name, side, goal_id, *values):
+        self._goal(goal_id)[1].setdefault(name, [None, None])[side] = values
+
+    def check(self, validator):
+        for goal_id, (seen, matches) in self.goals.items():
+            missing = [name for endpoint, name in ENDPOINT_NAMES.items() if not seen & endpoint]
+            if missing:
+                validator.error(f"missing from {', '.join(missing)}", goal_id)
+                continue
+            for name, (recorded, expected) in MATCHES.items():
+                sides = matches.get(name)
+                if sides and None not in sides and sides[0] != sides[1]:
+                    validator.error(f"{recorded} {'/'.join(map(str, sides[0]))} != {expected} {'/'.join(map(str, sides[1]))}", goal_id)
+
+class FixtureValidator:
+    """
+    Single-pass validator for one fixture (JSON file, sharded layout or .gpvts)
+
+    Usage:
+        validator = FixtureValidator()
+        validator.validate('demo/mock-data.json')
+        print(validator.error_count, validator.errors)
+    """
+
+    def __init__(self, max_errors=DEFAULT_MAX_ERRORS, progress_interval=DEFAULT_PROGRESS_INTERVAL, check_ranges=False, by_goal=False):
+        self.max_errors = max_errors
+        self.check_ranges = check_ranges
+        self.progress_interval = progress_interval
+        self.errors = []
+        self.error_count = 0
+        # Cross-endpoint state: constant-size digests, or per-goal figures with by_goal
+        self.ledger = GoalTable() if by_goal else GoalDigests()
+        self.counts = {name: 0 for name in ENDPOINT_NAMES.values()}
+        self.points = 0
+        self.series_goals = 0
+        self.stripped_goals = 0
+        self.files = 0
+        self.bytes = 0
+        self.series_only = False
+        self.sharded = False
+        self.index_goals = 0
+        self.manifest = None
+        self._progress = None
+        self._bytes_before = 0
+        self._stream = None
+
+    def error(self, message, goal_id=None):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append(f'goal {goal_id}: {message}' if goal_id is not None else message)
+
+    def _tick(self, points=0):
+        if self._progress is not None:
+            done = self._bytes_before + (self._stream.bytes_read if self._stream else 0)
+            self._progress.update(done, self.series_goals + self.stripped_goals, self.points + points)
+
+    def validate(self, path):
+        """Validate the fixture at path; results accumulate in errors/error_count"""
+        if os.path.isdir(path):
+            path = os.path.join(path, 'manifest.json')
+        with open(path, 'rb') as f:
+            columnar = f.read(4) == b'GPVT'
+        self._progress = Progress(os.path.getsize(path), self.progress_interval)
+        if columnar:
+            self.validate_columnar(path)
+        else:
+            self.validate_document(path)
+            if self.sharded:
+                self._validate_shards(path)
+        if not self.series_only:
+            self._check_goals()
+
+    def _open(self, path):
+        self.files += 1
+        self._stream = JsonStream(path)
+        return self._stream
+
+    def _close(self, stream):
+        stream.close()
+        self._bytes_before += stream.bytes_read
+        self.bytes += stream.bytes_read
+        self._stream = None
+
+    def _goal(self, goal_id, endpoint):
+        """Note that goal_id was seen in endpoint (duplicates are reported with --by-goal)"""
+        if self.ledger.add(endpoint, goal_id):
+            self.error(f'appears more than once in {ENDPOINT_NAMES[endpoint]}', goal_id)
+        self.counts[ENDPOINT_NAMES[endpoint]] += 1
+
+    def validate_document(self, path):
+        """Stream a generator JSON file or a shard manifest"""
+        stream = self._open(path)
+        try:
+            if stream.peek() != '{':
+                raise stream.error('expected a JSON object')
+            seen = set()
+            manifest = {}
+            for key in stream.object():
+                seen.add(key)
+                if key in ('performance', 'investible', 'summary'):
+                    self._read_goal_list(stream, key)
+                elif key == 'performanceTimeSeries':
+                    self._read_series_map(stream, key)
+                elif key == 'goals':
+                    self.sharded = True
+                    for goal_id in stream.object():
+                        record = stream.value()
+                        self.ledger.match('index', 0, goal_id, *(get_path(record, field) for field in ('numPoints', 'startDate', 'endDate')))
+                        self.index_goals += 1
+                else:
+                    manifest[key] = stream.value()
+            stream.end()
+        finally:
+            self._close(stream)
+
+        is_manifest = manifest.get('format') == 'gpv-mock-shards'
+        required = ['performance', 'investible', 'summary'] + (['shards', 'goals'] if is_manifest else ['performanceTimeSeries'])
+        for key in required:
+            if key not in seen:
+                self.error(f"missing top-level key '{key}'")
+        if is_manifest:
+            self.manifest = manifest
+        elif self.sharded:
+            self.error("'goals' index found outside a shard manifest")
+            self.sharded = False
+
+    def _read_goal_list(self, stream, key):
+        if stream.peek() != '[':
+            self.error(f"'{key}' must be an array")
+            stream.value()
+            return
+        check = getattr(self, f'_check_{key}')
+        for _ in stream.array():
+            record = stream.value()
+            goal_id = record.get('goalId') if isinstance(record, dict) else None
+            if not isinstance(goal_id, str):
+                self.error(f'{key} record without a string goalId')
+                continue
+            check(goal_id, record)
+
+    def _check_performance(self, goal_id, record):
+        self._goal(goal_id, PERFORMANCE)
+        for field in (('totalCumulativeReturn', 'amount'), ('simpleRateOfReturnPercent',), ('totalInvestmentValue', 'amount')):
+            if not is_number(get_path(record, *field)):
+                self.error(f"performance {'.'.join(field)} must be a number", goal_id)
+        balance = get_path(record, 'totalInvestmentValue', 'amount')
+        returns = get_path(record, 'totalCumulativeReturn', 'amount')
+        self.ledger.match('performance', 0, goal_id, to_cent(balance), to_cent(returns))
+        # Checked against the record's own figures, which are matched to the series above
+        simple_return = record.get('simpleRateOfReturnPercent')
+        if is_number(simple_return) and is_number(balance) and is_number(returns) and balance - returns > 0:
+            if abs(simple_return - returns / (balance - returns)) >= RETURN_TOLERANCE:
+                self.error(f'simpleRateOfReturnPercent {simple_return} != totalCumulativeReturn / (totalInvestmentValue - totalCumulativeReturn)', goal_id)
+
+    def _check_investible(self, goal_id, record):
+        self._goal(goal_id, INVESTIBLE)
+        for field in ('goalName', 'investmentGoalType'):
+            if not isinstance(record.get(field), str):
+                self.error(f'investible {field} must be a string', goal_id)
+        if isinstance(record.get('goalName'), str) and not GOAL_NAME_PATTERN.match(record['goalName']):
+            self.error(f"investible goalName '{record['goalName']}' is not bucket-prefixed ('Bucket - Goal')", goal_id)
+        for field in (('totalInvestmentAmount', 'display', 'amount'), ('targetAmount',), ('targetAllocation',)):
+            if not is_number(get_path(record, *field)):
+                self.error(f"investible {'.'.join(field)} must be a number", goal_id)
+        self.ledger.match('investible', 0, goal_id, to_cent(get_path(record, 'totalInvestmentAmount', 'display', 'amount')))
+
+    def _check_summary(self, goal_id, record):
+        self._goal(goal_id, SUMMARY)
+        for field in ('goalName', 'investmentGoalType'):
+            if not isinstance(record.get(field), str):
+                self.error(f'summary {field} must be a string', goal_id)
+
+    def _read_series_map(self, stream, key):
+        if stream.peek() != '{':
+            self.error(f"'{key}' must be an object")
+            stream.value()
+            return
+        for goal_id in stream.object():
+            self._read_entry(stream, goal_id)
+            self._tick()
+
+    def _read_entry(self, stream, goal_id):
+        """Stream one performanceTimeSeries entry, checking its points as they are read"""
+        if stream.peek() != '{':
+            self.error('performanceTimeSeries entry must be an object', goal_id)
+            stream.value()
+            return
+        entry = {}
+        series = None
+        for key in stream.object():
+            if key == 'timeSeries' and stream.peek() == '{':
+                entry[key] = {}
+                for series_key in stream.object():
+                    if series_key == 'data' and stream.peek() == '[':
+                        series = self._check_series(goal_id, self._stream_points(stream, goal_id))
+                        entry[key]['data'] = None
+                    else:
+                        entry[key][series_key] = stream.value()
+            else:
+                entry[key] = stream.value()
+        self._check_entry(goal_id, entry, series)
+
+    def _stream_points(self, stream, goal_id):
+        """
+        (date, amount, invested) for each well-formed point of a data array
+
+        An array that fits in the read buffer is decoded in one call; longer
+        ones are decoded point by point.
+        """
+        decoded, points = stream.buffered_value()
+        reported = False
+        for point in points if decoded else (stream.value() for _ in stream.array()):
+            try:
+                day, amount, invested = point['date'], point['amount'], point['cumulativeNetInvestmentAmount']
+                if type(day) is str and DATE_PATTERN.match(day) and type(amount) in NUMBER_TYPES and type(invested) in NUMBER_TYPES:
+                    yield day, amount, invested
+                    continue
+            except (TypeError, KeyError):
+                pass
+            if not reported:
+                self.error(f'malformed point {json.dumps(point)[:120]} (needs a YYYY-MM-DD date and numeric amounts)', goal_id)
+                reported = True
+
+    def _check_series(self, goal_id, points):
+        """
+        Check series invariants over (date, amount, invested) points, consuming them once
+
+        Returns:
+            Tuple of (count, first date, last date, last amount, last invested,
+            chain-linked TWR growth or None)
+        """
+        count = 0
+        first_date = previous_date = ''
+        previous_amount = previous_invested = growth = None
+        reported = set()
+        for day, amount, invested in points:
+            if day <= previous_date and 'dates' not in reported:
+                self.error(f'dates not increasing at point {count} ({day} after {previous_date})', goal_id)
+                reported.add('dates')
+            if (amount < 0 or invested < 0) and 'negative' not in reported:
+                self.error(f'negative amount at point {count} ({day}: amount {amount}, invested {invested})', goal_id)
+                reported.add('negative')
+            if previous_amount is None:
+                first_date = day
+                growth = amount / invested if invested else None
+            elif growth is not None and previous_amount:
+                growth *= (amount - (invested - previous_invested)) / previous_amount
+            else:
+                growth = None
+            previous_date, previous_amount, previous_invested = day, amount, invested
+            count += 1
+            if not count & 0xFFFF:
+                self._tick(count)
+        self.points += count
+        return count, first_date, previous_date, previous_amount, previous_invested, growth
+
+    def _check_entry(self, goal_id, entry, series):
+        """Entry fields, and their agreement with the series summary from _check_series"""
+        self._goal(goal_id, SERIES)
+        for field in ('totalCumulativeReturnPercent', 'totalCumulativeReturnAmount', 'cumulativeInvested'):
+            if not is_number(entry.get(field)):
+                self.error(f'performanceTimeSeries {field} must be a number', goal_id)
+        return_amount = entry.get('totalCumulativeReturnAmount')
+        if self.check_ranges and is_number(return_amount) and abs(return_amount) >= MAX_RETURN_AMOUNT:
+            self.error(f'totalCumulativeReturnAmount {return_amount} is unrealistic', goal_id)
+        twr = get_path(entry, 'returnsTable', 'twr')
+        if not isinstance(twr, dict):
+            self.error('returnsTable.twr is missing', goal_id)
+            twr = {}
+        for window in TWR_WINDOWS:
+            value = twr.get(window)
+            if not is_number(value) or not math.isfinite(value):
+                self.error(f'returnsTable.twr.{window} must be a finite number', goal_id)
+            elif self.check_ranges and window in ('allTimeValue', 'oneMonthValue') and not -0.5 < value < 1.0:
+                self.error(f'returnsTable.twr.{window} {value} outside (-0.5, 1.0)', goal_id)
+
+        bounds = entry.get('timeSeriesBounds')
+        if series is None or (series[0] == 0 and isinstance(bounds, dict)):
+            if isinstance(bounds, dict):
+                # Points stripped (--lazy-series output): only the recorded bounds can be checked,
+                # and the entry's own figures stand in for the last point
+                self.stripped_goals += 1
+                if not is_number(bounds.get('numPoints')) or bounds['numPoints'] < 1:
+                    self.error('timeSeriesBounds.numPoints must be at least 1', goal_id)
+                elif not str(bounds.get('startDate')) <= str(bounds.get('endDate')):
+                    self.error('timeSeriesBounds startDate is after endDate', goal_id)
+                invested = entry.get('cumulativeInvested')
+                if is_number(invested) and is_number(return_amount):
+                    self._match_series(goal_id, invested + return_amount, invested)
+            else:
+                self.error('timeSeries.data must be an array', goal_id)
+            return
+        self.series_goals += 1
+        count, first_date, last_date, last_amount, last_invested, growth = series
+        if not count:
+            self.error('timeSeries.data is empty', goal_id)
+            return
+        self._match_series(goal_id, last_amount, last_invested)
+        if self.sharded:
+            self.ledger.match('index', 1, goal_id, count, first_date, last_date)
+
+        if is_number(entry.get('cumulativeInvested')) and not math.isclose(entry['cumulativeInvested'], last_invested, abs_tol=BALANCE_TOLERANCE):
+            self.error(f"cumulativeInvested {entry['cumulativeInvested']} != last point's {last_invested}", goal_id)
+        if is_number(return_amount) and not math.isclose(return_amount, last_amount - last_invested, abs_tol=BALANCE_TOLERANCE):
+            self.error(f'totalCumulativeReturnAmount {return_amount} != last point amount - invested ({last_amount - last_invested})', goal_id)
+        return_percent = entry.get('totalCumulativeReturnPercent')
+        if is_number(return_percent) and last_invested > 0 and abs(return_percent - (last_amount - last_invested) / last_invested) >= RETURN_TOLERANCE:
+            self.error(f'totalCumulativeReturnPercent {return_percent} does not match the last point', goal_id)
+        all_time = twr.get('allTimeValue')
+        if is_number(all_time) and growth is not None and abs(all_time - (growth - 1)) >= RETURN_TOLERANCE:
+            self.error(f'returnsTable.twr.allTimeValue {all_time} != chain-linked series return {growth - 1}', goal_id)
+
+    def _match_series(self, goal_id, last_amount, last_invested):
+        """Record the series side of the performance and investible matches"""
+        self.ledger.match('performance', 1, goal_id, to_cent(last_amount), to_cent(last_amount - last_invested))
+        self.ledger.match('investible', 1, goal_id, to_cent(last_amount))
+
+    def _validate_shards(self, manifest_path):
+        """Stream every shard of a manifest, checking each against the shard list and goal index"""
+        base_dir = os.path.dirname(manifest_path)
+        shards = self.manifest.get('shards')
+        if not isinstance(shards, list):
+            self.error("manifest 'shards' must be an array")
+            return
+        paths = []
+        for shard in shards:
+            path = os.path.join(base_dir, str(get_path(shard, 'file')))
+            if not os.path.isfile(path):
+                self.error(f'shard {path} is missing')
+                continue
+            if get_path(shard, 'bytes') != os.path.getsize(path):
+                self.error(f"shard {path} is {os.path.getsize(path):,} bytes, manifest says {get_path(shard, 'bytes')}")
+            paths.append((path, get_path(shard, 'goalCount')))
+        self._progress.total_bytes += sum(os.path.getsize(path) for path, _ in paths)
+        for path, goal_count in paths:
+            before = self.counts['performanceTimeSeries']
+            stream = self._open(path)
+            try:
+                for goal_id in stream.object():
+                    self._read_entry(stream, goal_id)
+                    self._tick()
+                stream.end()
+            finally:
+                self._close(stream)
+            if self.counts['performanceTimeSeries'] - before != goal_count:
+                self.error(f"shard {path} holds {self.counts['performanceTimeSeries'] - before} goals, manifest says {goal_count}")
+        if self.index_goals != self.counts['performanceTimeSeries']:
+            self.error(f"manifest goal index has {self.index_goals:,} goals, the shards hold {self.counts['performanceTimeSeries']:,}")
+
+    def validate_columnar(self, path):
+        """Check each goal of a .gpvts file from its column views (no goal lists to cross-check)"""
+        self.series_only = True
+        self.files += 1
+        generator = load_generator()
+        with generator.ColumnarTimeSeries(path) as columnar:
+            for goal_id in columnar.goal_ids():
+                self._check_columnar_goal(columnar, goal_id)
+        self.bytes += os.path.getsize(path)
+
+    def _check_columnar_goal(self, columnar, goal_id):
+        # The column views are released on return, before the file is unmapped
+        series = self._check_series(goal_id, zip(*columnar.columns(goal_id)))
+        self._check_entry(goal_id, columnar.entry(goal_id), series)
+        self._bytes_before += series[0] * 16
+        self._tick()
+
+    def _check_goals(self):
+        """Cross-endpoint checks once every record has been read"""
+        counts = self.counts
+        if not counts['performance']:
+            self.error('no goals in performance')
+        for name, count in counts.items():
+            if count != counts['performance']:
+                self.error(f"{name} has {count:,} goals, performance has {counts['performance']:,}")
+        self.ledger.check(self)
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Validate mock data fixtures in a single streaming pass')
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='Generator JSON file, sharded layout (directory or manifest.json) or columnar .gpvts file')
+    parser.add_argument('--max-errors', type=int, default=DEFAULT_MAX_ERRORS,
+                        help=f'Errors to print per fixture; all are counted (default: {DEFAULT_MAX_ERRORS})')
+    parser.add_argument('--progress-interval', type=float, default=DEFAULT_PROGRESS_INTERVAL,
+                        help=f'Seconds between progress lines on stderr; 0 turns them off (default: {DEFAULT_PROGRESS_INTERVAL:g})')
+    parser.add_argument('--by-goal', action='store_true',
+                        help='Keep a few figures per goal so cross-endpoint mismatches and duplicates name their goals '
+                             '(memory grows with the number of goals)')
+    parser.add_argument('--check-ranges', action='store_true',
+                        help="Also apply the suite's realistic-range checks (all-time and 1-month TWR in (-50%%, 100%%), "
+                             "|return amount| < 1,000,000), which hold for the demo profile")
+    args = parser.parse_args(argv)
+    if args.max_errors < 0:
+        parser.error('--max-errors must not be negative')
+    return args
+
+def main(argv=None):
+    """Validate each fixture and exit with status 1 if any check failed"""
+    args = parse_args(argv)
+    failed = False
+    for path in args.paths:
+        print(f"Validating {path}")
+        validator = FixtureValidator(args.max_errors, args.progress_interval, args.check_ranges, args.by_goal)
+        started = time.perf_counter()
+        try:
+            validator.validate(path)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            failed = True
+            continue
+        elapsed = time.perf_counter() - started
+        counts = validator.counts
+        print(f"  {validator.files:,} file(s), {validator.bytes / 1024 / 1024:,.1f} MB in {elapsed:.2f}s "
+              f"({validator.bytes / 1024 / 1024 / elapsed if elapsed > 0 else 0:,.1f} MB/s)")
+        if validator.series_only:
+            print(f"  {counts['performanceTimeSeries']:,} series (columnar: series and entry checks only)")
+        else:
+            print(f"  goals: {counts['performance']:,} performance, {counts['investible']:,} investible, "
+                  f"{counts['summary']:,} summary, {counts['performanceTimeSeries']:,} performanceTimeSeries")
+        print(f"  {validator.points:,} points in {validator.series_goals:,} series"
+              + (f"; {validator.stripped_goals:,} without points (bounds checked only)" if validator.stripped_goals else ''))
+        for message in validator.errors:
+            print(f"  - {message}")
+        if validator.error_count > len(validator.errors):
+            print(f"  ... and {validator.error_count - len(validator.errors):,} more")
+        if validator.error_count:
+            print(f"  FAILED: {validator.error_count:,} error(s)")
+            failed = True
+        else:
+            print("  OK")
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
@@ -235,10 +235,23 @@ describe('Demo Mock Data Structure', () => {
         test('should have consistent return values', () => {
             mockData.performance.forEach(perfGoal => {
                 const tsData = mockData.performanceTimeSeries[perfGoal.goalId];
+                const points = tsData.timeSeries.data;
+                const lastPoint = points[points.length - 1];
                 
-                // simpleRateOfReturnPercent should match twr.allTimeValue
-                expect(Math.abs(perfGoal.simpleRateOfReturnPercent - tsData.returnsTable.twr.allTimeValue))
+                // simpleRateOfReturnPercent should match the simple return on net investment
+                const simpleReturn = (lastPoint.amount - lastPoint.cumulativeNetInvestmentAmount)
+                    / lastPoint.cumulativeNetInvestmentAmount;
+                expect(Math.abs(perfGoal.simpleRateOfReturnPercent - simpleReturn))
                     .toBeLessThan(0.001); // Allow small floating point difference
+                
+                // twr.allTimeValue should chain-link the contribution-adjusted daily returns
+                let growth = points[0].amount / points[0].cumulativeNetInvestmentAmount;
+                for (let i = 1; i < points.length; i += 1) {
+                    const flow = points[i].cumulativeNetInvestmentAmount - points[i - 1].cumulativeNetInvestmentAmount;
+                    growth *= (points[i].amount - flow) / points[i - 1].amount;
+                }
+                expect(Math.abs(tsData.returnsTable.twr.allTimeValue - (growth - 1)))
+                    .toBeLessThan(0.001);
             });
         });
     });